@@ -1,98 +1,50 @@
 import math
-import copy
+import json
 import functools
 import numpy as np
 import pandas as pd
 import altair as alt
 import streamlit as st
 from exergy_dashboard.system import SYSTEM_CASE
-from exergy_dashboard.evaluation import evaluate_parameters_cooling
+from exergy_dashboard.evaluation import (
+    COOLING_TERMS,
+    evaluate_parameters_cooling,
+    evaluate_cooling_jacobian,
+)
+from exergy_dashboard.cache import LRUCache
+from exergy_dashboard.store import ParameterStore
+from exergy_dashboard.profiling import PhaseTimer
 from exergy_dashboard.chart import (
-    plot_waterfall_cooling_ashp,
-    plot_waterfall_cooling_gshp,
+    WaterfallView,
+    render_waterfall_grid,
+    plot_waterfall_cooling_altair,
+    plot_whatif_cooling,
+    create_dynamic_multiview,
+    plot_efficiency_uncertainty,
+    plot_sobol_indices,
+)
+from exergy_dashboard.sweep import local_values, sweep_cooling
+from exergy_dashboard.sensitivity import sensitivity_outputs, sobol_indices
+from exergy_dashboard.uncertainty import (
+    DISTRIBUTIONS,
+    DEFAULT_UNCERTAINTY,
+    propagate_cooling,
+)
+from exergy_dashboard.simulation import (
+    load_series,
+    simulate_cooling,
+    summarize_cooling,
 )
 
 LANG = 'EN'
-
-
-def create_dynamic_multiview(dataframes, cols=2):
-    """
-    다양한 길이의 데이터프레임 리스트로부터 동적 다중 뷰 플롯 생성
-    
-    Parameters:
-    - dataframes: 차트로 만들 데이터프레임 리스트
-    - cols: 열의 개수 (기본값 2)
-    """
-    colors = [
-        '#4c95d9',
-        '#a8d9ff',
-        '#ff6a6a',
-        '#ffc4c4',
-        '#69c7ba',
-        '#a4f3bd',
-        '#ffab4c',
-        '#ffde96',
-        '#9878d2',
-        '#e1e5ec',
-    ] * 50
-    # 각 데이터프레임에 대한 기본 차트 생성 함수
-    def create_base_chart(df, title, n):
-        # 데이터프레임의 숫자형 컬럼 찾기
-        numeric_cols = df.select_dtypes(include=[np.number]).columns
-        
-        if len(numeric_cols) == 1:
-            # 단일 숫자 컬럼인 경우 히스토그램
-            chart = alt.Chart(df).mark_bar(color=colors[n]).encode(
-                alt.X(f'{numeric_cols[0]}:Q', bin=True),
-                alt.Y('count()', stack=None)
-            )
-        elif len(numeric_cols) >= 2:
-            # 두 개 이상의 숫자 컬럼인 경우 산점도
-            chart = alt.Chart(df).mark_circle(color=colors[n]).encode(
-                x=f'{numeric_cols[0]}:Q',
-                y=f'{numeric_cols[1]}:Q',
-                # color=alt.value('steelblue')
-            )
-        else:
-            # 숫자 컬럼이 없는 경우 막대 그래프
-            categorical_cols = df.select_dtypes(include=['object', 'category']).columns
-            if len(categorical_cols) > 0:
-                chart = alt.Chart(df).mark_bar(color=colors[n]).encode(
-                    x=f'{categorical_cols[0]}:N',
-                    y='count()'
-                )
-            else:
-                raise ValueError("플롯할 적절한 컬럼이 없습니다.")
-        
-        chart.configure_mark(
-            color=colors[n],
-        )
-
-        return chart.properties(
-            title=title, 
-            width=250, 
-            height=200
-        )
-    
-    # 동적으로 차트 리스트 생성
-    charts = [
-        create_base_chart(df, df['system'].iloc[0], i) 
-        for i, df in enumerate(dataframes)
-    ]
-    
-    # 열 수에 맞춰 동적으로 레이아웃 생성
-    def chunk_charts(lst, chunk_size):
-        for i in range(0, len(lst), chunk_size):
-            yield lst[i:i + chunk_size]
-    
-    # 차트들을 chunk로 나누어 수평/수직 결합
-    chart_rows = [
-        alt.hconcat(*row_charts) 
-        for row_charts in chunk_charts(charts, cols)
-    ]
-    
-    # 최종 수직 결합
-    return alt.vconcat(*chart_rows)
+EVALUATION_CACHE_SIZE = 256
+FIGURE_CACHE_SIZE = 128
+FIGURE_CACHE_BYTES = 32 * 1024 * 1024
+SENSITIVITY_CACHE_SIZE = 16
+WATERFALL_RENDERERS = ['Altair (browser)', 'Matplotlib (image)']
+SWEEP_STEPS = 50
+UNCERTAINTY_SAMPLES = [10_000, 100_000, 1_000_000]
+SENSITIVITY_SAMPLES = [4096, 32768, 131072]
 
 
 st.set_page_config(
@@ -109,6 +61,7 @@ if 'mode' not in sss:
 
 def reset_systems():
     sss.systems = {}
+    sss.param_store = ParameterStore()
     sss.system_count = {
         k: 0 for k in SYSTEM_CASE[sss.mode.upper()].keys()
     }
@@ -117,297 +70,611 @@ def reset_systems():
 if 'systems' not in sss:
     sss.systems = {}
 
+if 'param_store' not in sss:
+    sss.param_store = ParameterStore()
+
+if 'evaluation_cache' not in sss:
+    sss.evaluation_cache = LRUCache(maxsize=EVALUATION_CACHE_SIZE)
+
+if 'sensitivity_cache' not in sss:
+    sss.sensitivity_cache = LRUCache(maxsize=SENSITIVITY_CACHE_SIZE)
+
+if 'figure_cache' not in sss:
+    sss.figure_cache = LRUCache(
+        maxsize=FIGURE_CACHE_SIZE, maxbytes=FIGURE_CACHE_BYTES,
+    )
+
+if 'waterfall_view' not in sss:
+    sss.waterfall_view = WaterfallView(cols=2)
+
 if 'system_count' not in sss:
     sss.system_count = {
         k: 0 for k in SYSTEM_CASE[sss.mode.upper()].keys()
     }
 
+if 'timer' not in sss:
+    sss.timer = PhaseTimer()
+
+if 'dirty_systems' not in sss:
+    sss.dirty_systems = set()
+
+if 'run_state' not in sss:
+    # st.stop이나 새 rerun 요청으로 중단된 뒤에는 session state에 쓸 수 없으므로
+    # (다시 예외가 난다) finally에서도 바꿀 수 있도록 dict에 둔다.
+    sss.run_state = {}
+
+timer = sss.timer
+timer.begin_rerun()
+
+# fragment만 다시 실행될 때는 이 줄이 실행되지 않는다.
+run_state = sss.run_state
+run_state['full_rerun'] = True
+sss.needs_app_rerun = False
+
+# 전체 실행이 중간에 실패하거나 중단되어도(예: 잘못된 시계열 파일) 이후 fragment만
+# 다시 실행될 때 전체 실행으로 취급되지 않도록 flag는 finally에서 지운다.
+try:
+    def create_system(mode, system_name):
+        """
+        mode: 'cooling' or 'heating' or 'hot_water' ?
+        system_name: 'ASHP' or 'GSHP' or 'Boiler' or 'Solar' or 'Battery' ?
+        """
+        mode = mode.upper()
+        system_name = system_name.upper()
+
+        sss.system_count[system_name] += 1
+
+        return sss.param_store.add(
+            f"{system_name} {sss.system_count[system_name]}",
+            system_name,
+            mode=mode,
+        )
 
-def create_system(mode, system_name):
-    """
-    mode: 'cooling' or 'heating' or 'hot_water' ?
-    system_name: 'ASHP' or 'GSHP' or 'Boiler' or 'Solar' or 'Battery' ?
-    """
-    mode = mode.upper()
-    system_name = system_name.upper()
-
-    sss.system_count[system_name] += 1
 
-    system = copy.deepcopy(SYSTEM_CASE[mode][system_name])
-    system['name'] = f"{system_name} {sss.system_count[system_name]}"
-    system['type'] = system_name
+    def add_system(type_):
+        system = create_system(mode=sss.mode, system_name=type_)
+        sss.systems[system.name] = system
+        sss.active_system = system.name
 
-    return system
 
+    with timer.phase('sidebar'), st.sidebar:
+        st.title('Options')
+        st.divider()
+        st.header('시스템 모드')
+        st.segmented_control(
+            'Mode',
+            default='Cooling',
+            options=['Cooling', 'Heating', 'Hot Water'],
+            key='mode',
+            selection_mode='single',
+            label_visibility='collapsed',
 
-def add_system(type_):
-    data = create_system(mode=sss.mode, system_name=type_)
-    sss.systems[data['name']] = data
+        )
+        st.header('시스템 추가')
+        if len(SYSTEM_CASE[sss.mode.upper()]) == 0:
+            st.write('No system available for the selected mode.')
+            st.stop()
+        else:
+            selected = st.selectbox(
+                'System type', SYSTEM_CASE[sss.mode.upper()].keys()
+            )
+            st.button(
+                'Add system',
+                use_container_width=True,
+                on_click=functools.partial(add_system, type_=selected),
+            )
+            st.header('입력 패널')
+            st.radio(
+                'Input panel',
+                options=['Selected system', 'All (tabs)'],
+                key='input_panel',
+                horizontal=True,
+                label_visibility='collapsed',
+                help='Selected system: 선택한 시스템의 입력만 그림 (시스템이 많을 때 빠름).',
+            )
 
+    # st.get_option('layout')
+    ml, mr = 0.0001, 0.0001
+    pad = 0.2
+    col_border = False
+    _, title_col, title_right_col = st.columns([ml, 4 + pad + 5, mr], border=col_border)
+    _, title_col1, _, title_col2, _ = st.columns([ml, 4, pad, 5, mr], border=col_border)
+    _, col1, _, col2, _ = st.columns([ml, 4, pad, 5, mr], border=col_border)
+
+
+    with title_col:
+        st.header('Exergy Analyzer  ', help='This is a help message.')
+
+
+    def remove_system(name):
+        sss.systems.pop(name)
+        for key in sss.param_store.widget_keys(name):
+            sss.pop(key, None)
+        sss.pop(name, None)
+        sss.param_store.remove(name)
+
+        if sss.get('active_system') == name:
+            sss.pop('active_system')
+
+        if 'selected_options' in sss:
+            sss.selected_options = [
+                option for option in sss.selected_options if option != name
+            ]
+
+        # 출력 패널의 시스템 목록이 바뀌므로 앱 전체를 다시 실행해야 한다.
+        sss.needs_app_rerun = True
+
+
+    def mark_dirty(name):
+        sss.dirty_systems.add(name)
+
+
+    def render_system_inputs(system):
+        """
+        시스템 하나의 입력 widget을 그린다. widget 값은 param_store에서 초기화하므로
+        화면에 없던 시스템을 다시 선택해도 값이 유지된다.
+        """
+        if system.type == 'ASHP':
+            st.write('### Air Source Heat Pump :snowflake:')
+        elif system.type == 'GSHP':
+            st.write('### Ground Source Heat Pump :earth_americas:')
+
+        keys = {
+            k: sss.param_store.widget_key(system.name, k) for k in system.parameters
+        }
+        # min/max가 바뀌면 widget이 새로 만들어지므로 값을 매번 session state에 다시 쓴다.
+        for k, key in keys.items():
+            sss[key] = sss[key] if key in sss else sss.param_store.get(system.name, k)
+
+        # 다른 파라미터를 참조하는 범위는 현재 입력값으로 계산한다. 이미 범위를 벗어난
+        # 값은 widget이 거부하지 않도록 범위에 포함하고 경고로 표시한다.
+        current = {k: sss[key] for k, key in keys.items()}
+        limits = system.constraints.limits(current)
+
+        n = len(system.parameters)
+        col11, col12 = st.columns(2)
+        for i, (k, v) in enumerate(system.parameters.items()):
+            if i < (n + 1) // 2:
+                col = col11
+            else:
+                col = col12
+
+            low, high = limits[k]
+            with col:
+                st.number_input(
+                    f"{v['explanation'][LANG]}, {v['latex']} [{v['unit']}]",
+                    min_value=float(min(low, current[k])),
+                    max_value=float(max(high, current[k])),
+                    step=v['step'],
+                    format=f"%.{-math.floor(math.log10(v['step']))}f",
+                    # label_visibility='collapsed',
+                    key=keys[k],
+                    on_change=mark_dirty,
+                    args=(system.name,),
+                )
 
-with st.sidebar:
-    st.title('Options')
-    st.divider()
-    st.header('시스템 모드')
-    st.segmented_control(
-        'Mode',
-        default='Cooling',
-        options=['Cooling', 'Heating', 'Hot Water'],
-        key='mode',
-        selection_mode='single',
-        label_visibility='collapsed',
+        violated = [
+            k for k, mask in system.constraints.violations(current).items() if mask
+        ]
+        if violated:
+            st.warning(
+                'Out of range: ' + ', '.join(system.parameters[k]['latex'] for k in violated)
+            )
 
-    )
-    st.header('시스템 추가')
-    if len(SYSTEM_CASE[sss.mode.upper()]) == 0:
-        st.write('No system available for the selected mode.')
-        st.stop()
-    else:
-        selected = st.selectbox(
-            'System type', SYSTEM_CASE[sss.mode.upper()].keys()
-        )
         st.button(
-            'Add system',
+            'Remove system',
             use_container_width=True,
-            on_click=functools.partial(add_system, type_=selected),
+            key=system.name,
+            on_click=functools.partial(remove_system, name=system.name),
         )
 
-# st.get_option('layout')
-ml, mr = 0.0001, 0.0001
-pad = 0.2
-col_border = False
-_, title_col, title_right_col = st.columns([ml, 4 + pad + 5, mr], border=col_border)
-_, title_col1, _, title_col2, _ = st.columns([ml, 4, pad, 5, mr], border=col_border)
-_, col1, _, col2, _ = st.columns([ml, 4, pad, 5, mr], border=col_border)
 
+    @st.fragment
+    def inputs_panel():
+        """
+        입력 패널. 입력을 바꾸면 이 fragment만 다시 실행하여 바뀐 시스템만 평가하고,
+        출력 패널이 그 시스템을 보여 주고 있을 때만 앱 전체를 다시 실행한다.
+        """
+        if not run_state['full_rerun']:
+            timer.begin_rerun(fragment='inputs')
+        st.subheader('System Inputs :dart:')
+        if len(sss.systems) == 0:
+            st.write('No system added yet.')
+            # st.stop()
+        elif sss.input_panel == 'All (tabs)':
+            st.write(' ')
+            st.write(' ')
+            tabs = st.tabs(list(sss.systems.keys()))
+            for tab, system in zip(tabs, sss.systems.values()):
+                with tab:
+                    render_system_inputs(system)
+        else:
+            # 선택한 시스템의 widget만 그린다.
+            active = st.selectbox(
+                'System',
+                list(sss.systems.keys()),
+                key='active_system',
+                help='Type to search. Inputs of other systems are kept.',
+            )
+            render_system_inputs(sss.systems[active])
+
+        # [system.name for system in sss.systems.values()]
+
+        dirty = sss.dirty_systems & sss.systems.keys()
+        sss.dirty_systems = set()
+        for name in dirty:
+            evaluate_parameters_cooling(sss, name, cache=sss.evaluation_cache)
+
+        # 출력 패널(선택된 시스템)이 바뀐 시스템에 의존할 때만 앱 전체를 다시 실행.
+        displayed = set(sss.get('selected_options') or ())
+        if not run_state['full_rerun']:
+            timer.end_rerun()
+            if sss.needs_app_rerun or dirty & displayed:
+                sss.needs_app_rerun = False
+                st.rerun()
+
+
+    with timer.phase('input tabs'), col1:
+        inputs_panel()
+
+
+    with timer.phase('evaluation'):
+        for key in sss.systems.keys():
+            evaluate_parameters_cooling(sss, key, cache=sss.evaluation_cache)
+
+
+    @st.fragment
+    def outputs_panel():
+        """
+        출력 패널. 표시할 시스템 선택을 바꾸면 이 fragment만 다시 실행한다.
+        """
+        if not run_state['full_rerun']:
+            timer.begin_rerun(fragment='outputs')
+        st.subheader('Output Data :chart_with_upwards_trend:')
+        options = st.multiselect(
+            'Select systems to display',
+            [system.name for system in sss.systems.values()],
+            # sss.seledted_options if 'selected_options' in sss else [],
+            default=sss.selected_options if 'selected_options' in sss else None,
+            key='selected_options',
+        )
 
-with title_col:
-    st.header('Exergy Analyzer  ', help='This is a help message.')
+        if len(options) != 0:
+            with timer.phase('efficiency chart'):
+                st.subheader('1. Exergy Efficiency')
+                count = 0
+                efficiencies = []
+                xins = []
+                xouts = []
+                for key in options:
+                    sv = sss.systems[key].variables
+                    terms = COOLING_TERMS[sss.systems[key].type]
+                    efficiencies.append(sv[terms['efficiency']])
+                    xins.append(sv[terms['input']])
+                    xouts.append(sv[terms['output']])
+
+                # Draw bar chart of efficiencies. color is based on options.
+                chart_data = pd.DataFrame(
+                    data={
+                        'efficiency': efficiencies,
+                        'xins': xins,
+                        'xouts': xouts,
+                        'system': options,
+                    },
+                )
 
+                # st.write(chart_data)
+                max_v = chart_data['efficiency'].max()
+
+                # No sort for Y.
+                c = alt.Chart(chart_data).mark_bar(size=30).encode(
+                    y=alt.Y('system:N', title='System', sort=None)
+                       .axis(title=None, labelFontSize=18, labelColor='black'),
+                    x=alt.X('efficiency:Q', title='Exergy Efficiency [%]')
+                       .axis(
+                            labelFontSize=20,
+                            labelColor='black',
+                            titleFontSize=22,
+                            titleColor='black',
+                        )
+                        .scale(domain=[0, max_v + 3]),
+                    color=alt.Color('system:N', sort=None, legend=None),
+                    tooltip=['system', 'efficiency'],
+                ).properties(
+                    width='container',
+                    height=len(options) * 60 + 50,
+                )
 
-def remove_system(name):
-    sss.systems.pop(name)
-    to_be_removed = []
-    for k, v in sss.items():
-        if k.startswith(name):
-            to_be_removed.append(k)
-    for k in to_be_removed:
-        sss.pop(k)
+                text = c.mark_text(
+                    align='left',
+                    baseline='middle',
+                    dx=3,
+                    fontSize=20,
+                    fontWeight='normal',
+                ).encode(
+                    text=alt.Text('efficiency:Q', format='.2f')
+                )
 
-    if 'selected_options' in sss:
-        sss.selected_options = [
-            option for option in sss.selected_options if option != name
-        ]
+                c = (c + text)
 
+                uncertainty = st.toggle(
+                    'Uncertainty',
+                    key='uncertainty_mode',
+                    help='Sample uncertain inputs around the current values and show '
+                         'efficiency percentiles (5-25-50-75-95).',
+                )
+                if uncertainty:
+                    chart_col, band_col = st.columns(2)
+                else:
+                    chart_col = st.container()
+                chart_col.altair_chart(c, use_container_width=True)
+
+                if uncertainty:
+                    if 'uncertainty_table' not in sss:
+                        # 시스템 종류별 기본 분포를 합친 표. 각 시스템에는 가진 파라미터만 적용한다.
+                        defaults = {}
+                        for specs in DEFAULT_UNCERTAINTY.values():
+                            defaults.update(specs)
+                        sss.uncertainty_table = pd.DataFrame([
+                            {'parameter': name, **spec} for name, spec in defaults.items()
+                        ])
+                    parameter_names = list(dict.fromkeys(
+                        name for key in options for name in sss.systems[key].parameters
+                    ))
+                    table = st.data_editor(
+                        sss.uncertainty_table,
+                        num_rows='dynamic',
+                        hide_index=True,
+                        use_container_width=True,
+                        key='uncertainty_editor',
+                        column_config={
+                            'parameter': st.column_config.SelectboxColumn(
+                                'Parameter', options=parameter_names, required=True,
+                            ),
+                            'distribution': st.column_config.SelectboxColumn(
+                                'Distribution', options=list(DISTRIBUTIONS), required=True,
+                            ),
+                            'scale': st.column_config.NumberColumn(
+                                'Scale', min_value=0.0, required=True,
+                                help='normal: standard deviation, uniform/triangular: half width',
+                            ),
+                        },
+                    )
+                    samples = st.select_slider(
+                        'Samples',
+                        UNCERTAINTY_SAMPLES,
+                        value=100_000,
+                        key='uncertainty_samples',
+                        format_func=lambda n: f'{n:,}',
+                    )
+
+                    # 같은 입력에서는 같은 분포가 나오도록 seed를 고정한다.
+                    results = []
+                    for key in options:
+                        system = sss.systems[key]
+                        distributions = {
+                            row.parameter: {'distribution': row.distribution, 'scale': row.scale}
+                            for row in table.dropna().itertuples()
+                            if row.parameter in system.parameters
+                        }
+                        result = propagate_cooling(
+                            system.type,
+                            sss.param_store.as_dict(system.name),
+                            distributions,
+                            n=samples,
+                            seed=0,
+                        )
+                        results.append((key, COOLING_TERMS[system.type]['efficiency'], result))
+                        if result['feasible'] < 1:
+                            st.caption(f"{key}: {1 - result['feasible']:.1%} of samples out of range")
 
-with col1:
-    st.subheader('System Inputs :dart:')
-    if len(sss.systems) == 0:
-        st.write('No system added yet.')
-        # st.stop()
-    else:
-        st.write(' ')
-        st.write(' ')
-        tabs = st.tabs(sss.systems.keys())
-        for tab, system in zip(tabs, sss.systems.values()):
-            with tab:
-                if system['type'] == 'ASHP':
-                    st.write('### Air Source Heat Pump :snowflake:')
-                elif system['type'] == 'GSHP':
-                    st.write('### Ground Source Heat Pump :earth_americas:')
-
-                n = len(system['parameters'])
-                col11, col12 = st.columns(2)
-                for i, (k, v) in enumerate(system['parameters'].items()):
-                    if i < (n + 1) // 2:
-                        col = col11
+                    chart = plot_efficiency_uncertainty(results, height=len(options) * 60 + 50)
+                    if chart is None:
+                        band_col.info('No samples within the parameter ranges.')
                     else:
-                        col = col12
-
-                    with col:
-                        system['parameters'][k]['value'] = st.number_input(
-                            f"{v['explanation'][LANG]}, {v['latex']} [{v['unit']}]",
-                            value=v['default'],
-                            step=v['step'],
-                            format=f"%.{-math.floor(math.log10(v['step']))}f",
-                            # label_visibility='collapsed',
-                            key=f"{system['name']}:{k}",
+                        band_col.altair_chart(chart, use_container_width=True)
+
+            with timer.phase('waterfall grid'):
+                st.subheader('2. Exergy Consumption Process')
+
+                systems = [
+                    (sss.systems[key].type, sss.systems[key].variables, count, key)
+                    for count, key in enumerate(options)
+                ]
+                # Altair는 막대 레코드만 보내고 브라우저에서 그린다.
+                renderer = st.radio(
+                    'Renderer',
+                    WATERFALL_RENDERERS,
+                    horizontal=True,
+                    key='waterfall_renderer',
+                    label_visibility='collapsed',
+                )
+                if renderer == 'Altair (browser)':
+                    st.altair_chart(plot_waterfall_cooling_altair(systems, cols=2))
+                else:
+                    with st.spinner('Loading...'):
+                        st.image(
+                            render_waterfall_grid(
+                                systems,
+                                cols=2,
+                                cache=sss.figure_cache,
+                                view=sss.waterfall_view,
+                            ),
+                            use_container_width=True,
                         )
 
-                st.button(
-                    'Remove system',
-                    use_container_width=True,
-                    key=system['name'],
-                    on_click=functools.partial(remove_system, name=system['name']),
+            with timer.phase('what-if'):
+                # 모델을 Vega 표현식으로 컴파일하여 slider 조작을 브라우저에서만 계산한다.
+                if st.toggle(
+                    'What-if mode (browser)',
+                    key='whatif_mode',
+                    help='Sliders are evaluated in the browser without server reruns. '
+                         'Inputs of the system are not changed.',
+                ):
+                    target = st.selectbox('System', options, key='whatif_system')
+                    system = sss.systems[target]
+                    st.altair_chart(plot_whatif_cooling(
+                        system.type,
+                        sss.param_store.as_dict(target),
+                        n=options.index(target),
+                        name=target,
+                    ))
+
+            with timer.phase('parameter sweep'):
+                st.subheader('3. Parameter Sweep')
+                # 선택된 시스템들이 공통으로 가진 파라미터만 sweep 축으로 고를 수 있다.
+                common = [
+                    name for name in sss.systems[options[0]].parameters
+                    if all(name in sss.systems[key].parameters for key in options)
+                ]
+                sweep_col1, sweep_col2 = st.columns(2)
+                x_param = sweep_col1.selectbox('Swept parameter', common, key='sweep_x')
+                spread_param = sweep_col2.selectbox(
+                    'Second parameter',
+                    [name for name in common if name != x_param],
+                    key='sweep_spread',
                 )
-
-    # [system['name'] for system in sss.systems.values()]
-
-
-for key in sss.systems.keys():
-    evaluate_parameters_cooling(sss, key)
-
-
-with col2:
-    st.subheader('Output Data :chart_with_upwards_trend:')
-    options = st.multiselect(
-        'Select systems to display',
-        [system['name'] for system in sss.systems.values()],
-        # sss.seledted_options if 'selected_options' in sss else [],
-        default=sss.selected_options if 'selected_options' in sss else None,
-        key='selected_options',
-    )
-
-    if len(options) != 0:
-        st.subheader('1. Exergy Efficiency')
-        count = 0
-        efficiencies = []
-        xins = []
-        xouts = []
-        for key in options:
-            sv = sss.systems[key]['variables']
-            if sss.systems[key]['type'] == 'ASHP':
-                eff = sv['Xout_A'] / sv['Xin_A'] * 100
-                efficiencies.append(eff)
-                xins.append(sv['Xin_A'])
-                xouts.append(sv['Xout_A'])
-            if sss.systems[key]['type'] == 'GSHP':
-                eff = sv['Xout_G'] / sv['Xin_G'] * 100
-                efficiencies.append(eff)
-                xins.append(sv['Xin_G'])
-                xouts.append(sv['Xout_G'])
-
-        # Draw bar chart of efficiencies. color is based on options.
-        chart_data = pd.DataFrame(
-            data={
-                'efficiency': efficiencies,
-                'xins': xins,
-                'xouts': xouts,
-                'system': options,
-            },
-        )
-
-        # st.write(chart_data)
-        max_v = chart_data['efficiency'].max()
-
-        # No sort for Y.
-        c = alt.Chart(chart_data).mark_bar(size=30).encode(
-            y=alt.Y('system:N', title='System', sort=None)
-               .axis(title=None, labelFontSize=18, labelColor='black'),
-            x=alt.X('efficiency:Q', title='Exergy Efficiency [%]')
-               .axis(
-                    labelFontSize=20,
-                    labelColor='black',
-                    titleFontSize=22,
-                    titleColor='black',
+                if st.toggle('Run sweep', key='sweep_mode'):
+                    # 현재 입력값 주변의 2차원 격자를 평가하고, multiview는 집계된 결과만 보낸다.
+                    dataframes = []
+                    for key in options:
+                        system = sss.systems[key]
+                        current = sss.param_store.as_dict(key)
+                        axes = {
+                            name: local_values(
+                                system.parameters[name],
+                                current[name],
+                                steps=SWEEP_STEPS,
+                                bounds=system.constraints.static[name],
+                            )
+                            for name in (x_param, spread_param)
+                        }
+                        efficiency = COOLING_TERMS[system.type]['efficiency']
+                        chunks = list(sweep_cooling(system.type, axes, fixed=current))
+                        dataframes.append(pd.DataFrame({
+                            x_param: np.concatenate([chunk[x_param] for chunk in chunks]),
+                            'Exergy efficiency [%]': np.concatenate([chunk[efficiency] for chunk in chunks]),
+                            'system': key,
+                        }))
+
+                    st.altair_chart(create_dynamic_multiview(dataframes, cols=2))
+
+            with timer.phase('annual simulation'):
+                st.subheader('4. Annual Simulation')
+                series_file = st.file_uploader(
+                    'Hourly series (time, T_0, T_g, load)',
+                    type=['csv', 'parquet'],
+                    help='각 시점의 외기온도, 토양온도, 냉방부하. 파일에 없는 파라미터는 현재 입력값을 사용.',
                 )
-                .scale(domain=[0, max_v + 3]),
-            color=alt.Color('system:N', sort=None, legend=None),
-            tooltip=['system', 'efficiency'],
-        ).properties(
-            width='container',
-            height=len(options) * 60 + 50,
-        )
-
-        text = c.mark_text(
-            align='left',
-            baseline='middle',
-            dx=3,
-            fontSize=20,
-            fontWeight='normal',
-        ).encode(
-            text=alt.Text('efficiency:Q', format='.2f')
-        )
-
-        c = (c + text)
-            
-
-        # # Draw random altair chart. but use options.
-        # chart_data = pd.DataFrame(
-        #     data={
-        #         'a': np.random.randn(100),
-        #         'b': np.random.randn(100),
-        #         'c': np.random.randn(100),
-        #         'system': np.random.choice(options, 100),
-        #     },
-        # )
-
-        # c = alt.Chart(chart_data).mark_circle().encode(
-        #     x='a', y='b', size='c', color='system', tooltip=['a', 'b', 'c']
-        # ).interactive()
-
-        st.altair_chart(c, use_container_width=True)
-
-        st.subheader('2. Exergy Consumption Process')
-
-        figs = []
-        count = 0
-        for key in options:
-            sv = sss.systems[key]['variables']
-            if sss.systems[key]['type'] == 'ASHP':
-                print('new fig')
-                fig = plot_waterfall_cooling_ashp(
-                    Xin_A=sv['Xin_A'],
-                    Xc_int_A=sv['Xc_int_A'],
-                    Xc_r_A=sv['Xc_r_A'],
-                    Xc_ext_A=sv['Xc_ext_A'],
-                    X_a_ext_out_A=sv['X_a_ext_out_A'],
-                    Xout_A=sv['Xout_A'],
-                    n=count,
-                    name=key,
+                if series_file is not None:
+                    series = load_series(series_file)
+                    rows = []
+                    for key in options:
+                        system = sss.systems[key]
+                        params = sss.param_store.as_dict(key)
+                        # time 컬럼이 없으면 1시간 간격으로 본다.
+                        result = simulate_cooling(
+                            system.type, series, params=params,
+                            columns={'load': 'load'},
+                            dt=1.0,
+                        )
+                        summary = summarize_cooling(system.type, result)
+                        if summary['infeasible_steps']:
+                            st.caption(
+                                f"{key}: {summary['infeasible_steps']:,} time steps "
+                                f"({summary['infeasible_hours']:,.0f} h) out of parameter range, "
+                                'excluded from the totals'
+                            )
+                        rows.append({
+                            'system': key,
+                            'Exergy input [kWh]': summary['Xin'],
+                            'Exergy output [kWh]': summary['Xout'],
+                            **{
+                                f'{k} [kWh]': v
+                                for k, v in summary['destruction'].items()
+                            },
+                            'Seasonal efficiency [%]': summary['efficiency'],
+                        })
+                    st.dataframe(pd.DataFrame(rows), hide_index=True)
+
+            with timer.phase('sensitivity'):
+                st.subheader('5. Global Sensitivity')
+                sens_col1, sens_col2 = st.columns(2)
+                target = sens_col1.selectbox('System', options, key='sensitivity_system')
+                system = sss.systems[target]
+                output = sens_col2.selectbox(
+                    'Output', sensitivity_outputs(system.type), key='sensitivity_output',
                 )
-                count += 1
-            if sss.systems[key]['type'] == 'GSHP':
-                fig = plot_waterfall_cooling_gshp(
-                    Xin_G=sv['Xin_G'],
-                    X_g=sv['X_g'],
-                    Xc_int_G=sv['Xc_int_G'],
-                    Xc_r_G=sv['Xc_r_G'],
-                    Xc_GHE=sv['Xc_GHE'],
-                    Xout_G=sv['Xout_G'],
-                    n=count,
-                    name=key,
+                params = sss.param_store.as_dict(system.name)
+
+                # 현재 입력에서의 정확한 편미분 (dual number)과 step 하나만큼의 변화량
+                _, jacobian = evaluate_cooling_jacobian(system.type, params, outputs=[output])
+                derivatives = np.array([float(jacobian[output][k]) for k in params])
+                steps = np.array([system.parameters[k]['step'] for k in params])
+                st.dataframe(
+                    pd.DataFrame({
+                        'parameter': list(params),
+                        f'∂{output}/∂x': derivatives,
+                        'Change per step': derivatives * steps,
+                    }).sort_values('Change per step', key=np.abs, ascending=False),
+                    hide_index=True,
+                    use_container_width=True,
                 )
-                count += 1                
-
-            figs.append(fig)
 
-        n = len(figs)
-        iter_ = iter(figs)
-        with st.spinner('Loading...'):
-            for i, fig in enumerate(range((n + 1) // 2)):
-                if i % 2 == 0:
-                    cols = st.columns(2)
-
-                for col in cols:
-                    try:
-                        col.write(next(iter_))
-                    except StopIteration:
-                        break
-
-        # Draw random altair chart. but use options.
-        # chart_data = pd.DataFrame(
-        #     data={
-        #         'a': np.random.randn(100),
-        #         'b': np.random.randn(100),
-        #         'c': np.random.randn(100),
-        #         'system': np.random.choice(options, 100),
-        #     },
-        # )
+                samples = st.select_slider(
+                    'Base samples',
+                    SENSITIVITY_SAMPLES,
+                    value=32768,
+                    key='sensitivity_samples',
+                    format_func=lambda n: f'{n:,}',
+                )
+                if st.toggle(
+                    'Run sensitivity analysis',
+                    key='sensitivity_mode',
+                    help='First-order and total Sobol indices over a range of ±10 steps '
+                         'around the current inputs (narrowed to satisfy the parameter ranges).',
+                ):
+                    # 모든 출력 항의 지수를 한 번에 구하므로 출력 항을 바꿀 때는 다시 계산하지 않는다.
+                    result = sss.sensitivity_cache.get_or_compute(
+                        (system.type, tuple(params.values()), samples),
+                        lambda: sobol_indices(system.type, params, n=samples, seed=0),
+                    )
+                    st.altair_chart(plot_sobol_indices(result, output), use_container_width=True)
+                    st.caption(
+                        f"{result['evaluated']:,} model evaluations "
+                        f"({result['rows']:,} Saltelli rows, {result['feasible']:.1%} in range)"
+                    )
 
-        # dataframes = [
-        #     chart_data[chart_data['system'] == option]
-        #     for option in options
-        # ]
+        if not run_state['full_rerun']:
+            timer.end_rerun()
 
-        # c = create_dynamic_multiview(dataframes, cols=3)
 
-        # # c = alt.Chart(chart_data).mark_circle().encode(
-        # #     x='a', y='b', size='c', column='system', tooltip=['a', 'b', 'c']
-        # # ).interactive()
+    # st.write(sss)
 
-        # st.altair_chart(c)
 
+    with col2:
+        outputs_panel()
 
+    timer.end_rerun()
+finally:
+    run_state['full_rerun'] = False
 
-# st.write(sss)
\ No newline at end of file
+with st.sidebar:
+    st.divider()
+    if st.toggle('Debug timing', key='debug_timing'):
+        st.caption(f'Rerun #{timer.reruns}, last {len(timer.durations["rerun"])} reruns')
+        st.dataframe(
+            pd.DataFrame(timer.summary()).set_index('phase'),
+            column_config={'count': None},
+            use_container_width=True,
+        )
+        for name in ('evaluation_cache', 'figure_cache', 'sensitivity_cache'):
+            info = sss[name].info()
+            st.caption(f'{name}: {info.hits} hits / {info.misses} misses, {info.currsize}/{info.maxsize} entries')
+        st.download_button(
+            'Export trace (Chrome JSON)',
+            data=json.dumps(timer.chrome_trace()),
+            file_name='exergy-dashboard-trace.json',
+            mime='application/json',
+            use_container_width=True,
+        )
\ No newline at end of file
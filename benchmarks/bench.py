@@ -0,0 +1,312 @@
+"""
+Benchmark suite for the evaluation kernels and chart builders.
+
+Results are written as JSON and can be compared against a baseline file;
+the script exits with status 1 if any benchmark is slower than the
+baseline by more than the tolerance.
+
+    python benchmarks/bench.py --save benchmarks/baseline.json
+    python benchmarks/bench.py --baseline benchmarks/baseline.json --tolerance 0.25
+"""
+import sys
+import json
+import time
+import argparse
+import platform
+import tempfile
+import statistics
+
+import numpy as np
+
+from exergy_dashboard.system import SYSTEM_CASE
+from exergy_dashboard.store import ParameterStore
+from exergy_dashboard.evaluation import (
+    evaluate_cooling,
+    evaluate_parameters_cooling,
+    evaluate_cooling_jacobian,
+)
+from exergy_dashboard.sweep import fixed_parameters
+from exergy_dashboard.surface import SURFACE_TERMS, get_surface
+from exergy_dashboard.sensitivity import DEFAULT_BASE_SAMPLES, sobol_indices
+from exergy_dashboard.uncertainty import DEFAULT_UNCERTAINTY, propagate_cooling
+
+
+SCENARIO_SIZES = [1, 1_000, 100_000, 1_000_000]
+LOOP_SIZES = [1, 1_000]
+SYSTEM_COUNTS = [1, 5, 20]
+# 편미분 배열이 (파라미터 수 x 행 수)이므로 큰 크기는 제외한다.
+JACOBIAN_SIZES = [1, 1_000, 100_000]
+UNCERTAINTY_SIZES = [100_000, 1_000_000]
+
+
+class _Session(dict):
+    """
+    evaluate_parameters_cooling에 전달할 최소한의 session state.
+    """
+
+    def __getattr__(self, key):
+        try:
+            return self[key]
+        except KeyError:
+            raise AttributeError(key) from None
+
+
+def timeit(func, repeat=5, min_seconds=0.2):
+    """
+    func 한 번 호출의 실행 시간 [s] 통계. 짧은 함수는 min_seconds 이상이 되도록
+    여러 번 호출하여 평균을 낸다.
+    """
+    func()
+    number = 1
+    while True:
+        start = time.perf_counter()
+        for _ in range(number):
+            func()
+        elapsed = time.perf_counter() - start
+        if elapsed >= min_seconds or number >= 1_000_000:
+            break
+        number *= 10
+
+    samples = [elapsed / number]
+    for _ in range(repeat - 1):
+        start = time.perf_counter()
+        for _ in range(number):
+            func()
+        samples.append((time.perf_counter() - start) / number)
+
+    return {
+        'median': statistics.median(samples),
+        'min': min(samples),
+        'number': number,
+        'repeat': repeat,
+    }
+
+
+def defaults(system_type):
+    return fixed_parameters(system_type, ())
+
+
+def scenarios(system_type, n, seed=0):
+    """
+    기본값 주변에서 T_0와 k를 바꾼 n개의 시나리오 컬럼.
+    """
+    rng = np.random.default_rng(seed)
+    columns = {k: np.full(n, v, dtype=float) for k, v in defaults(system_type).items()}
+    columns['T_0'] += rng.uniform(-2, 2, n)
+    columns['k'] += rng.uniform(-0.05, 0.05, n)
+    return columns
+
+
+def session(system_type, count):
+    sss = _Session(systems={}, param_store=ParameterStore())
+    for i in range(count):
+        name = f'{system_type} {i + 1}'
+        sss.systems[name] = sss.param_store.add(name, system_type)
+        for k, v in defaults(system_type).items():
+            sss[ParameterStore.widget_key(name, k)] = v
+    return sss
+
+
+def bench_evaluation(results, sizes, loop_sizes):
+    for system_type in SYSTEM_CASE['COOLING']:
+        for n in loop_sizes:
+            sss = session(system_type, n)
+
+            # 직전 결과를 지워 모든 노드를 다시 계산하는 경우
+            def full():
+                for name, record in sss.systems.items():
+                    record.evaluated = record.results = None
+                    evaluate_parameters_cooling(sss, name)
+
+            # 입력이 바뀌지 않아 IncrementalEvaluator가 노드를 다시 계산하지 않는 경우
+            # (widget 동기화와 기록 비용만 남는다)
+            def unchanged():
+                for name in sss.systems:
+                    evaluate_parameters_cooling(sss, name)
+
+            results[f'evaluate_parameters_cooling[{system_type}, n={n}, full]'] = timeit(full)
+            results[f'evaluate_parameters_cooling[{system_type}, n={n}, unchanged]'] = timeit(
+                unchanged
+            )
+
+        for n in sizes:
+            columns = scenarios(system_type, n)
+            results[f'evaluate_cooling[{system_type}, n={n}]'] = timeit(
+                lambda: evaluate_cooling(system_type, columns)
+            )
+
+        for n in JACOBIAN_SIZES:
+            columns = scenarios(system_type, n)
+            results[f'evaluate_cooling_jacobian[{system_type}, n={n}]'] = timeit(
+                lambda: evaluate_cooling_jacobian(system_type, columns)
+            )
+
+
+def bench_surface(results, sizes):
+    with tempfile.TemporaryDirectory() as directory:
+        for system_type in SYSTEM_CASE['COOLING']:
+            start = time.perf_counter()
+            surface = get_surface(system_type, directory)
+            elapsed = time.perf_counter() - start
+            results[f'build_surface[{system_type}]'] = {
+                'median': elapsed, 'min': elapsed, 'number': 1, 'repeat': 1,
+            }
+
+            efficiency = SURFACE_TERMS[system_type][:1]
+            for n in sizes:
+                columns = scenarios(system_type, n)
+                results[f'ResponseSurface.interpolate[{system_type}, n={n}]'] = timeit(
+                    lambda: surface.interpolate(columns, efficiency)
+                )
+
+
+def bench_uncertainty(results, sizes):
+    for system_type in SYSTEM_CASE['COOLING']:
+        for n in sizes:
+            results[f'propagate_cooling[{system_type}, n={n}]'] = timeit(
+                lambda: propagate_cooling(
+                    system_type, defaults(system_type),
+                    DEFAULT_UNCERTAINTY[system_type], n=n, seed=0,
+                ),
+                repeat=3,
+            )
+
+
+def bench_sensitivity(results):
+    for system_type in SYSTEM_CASE['COOLING']:
+        results[f'sobol_indices[{system_type}, n={DEFAULT_BASE_SAMPLES}]'] = timeit(
+            lambda: sobol_indices(system_type, defaults(system_type), seed=0),
+            repeat=3,
+        )
+
+
+def bench_charts(results, counts):
+    from exergy_dashboard.chart import (
+        render_waterfall_cooling,
+        render_waterfall_grid,
+        WaterfallView,
+        plot_waterfall_cooling_altair,
+        create_dynamic_multiview,
+    )
+    import pandas as pd
+
+    for system_type in SYSTEM_CASE['COOLING']:
+        variables = evaluate_cooling(system_type, defaults(system_type))
+        variables = {k: float(v) for k, v in variables.items()}
+        results[f'render_waterfall_cooling[{system_type}]'] = timeit(
+            lambda: render_waterfall_cooling(system_type, variables, n=0, name=system_type),
+            repeat=3,
+        )
+
+    for count in counts:
+        types = sorted(SYSTEM_CASE['COOLING'])
+        systems = []
+        for i in range(count):
+            system_type = types[i % len(types)]
+            variables = evaluate_cooling(system_type, defaults(system_type))
+            systems.append((system_type, variables, i, f'{system_type} {i + 1}'))
+        results[f'render_waterfall_grid[systems={count}]'] = timeit(
+            lambda: render_waterfall_grid(systems, cols=2),
+            repeat=3,
+        )
+
+        # 한 시스템의 값만 바뀌었을 때 figure를 유지한 채 갱신하는 비용
+        view = WaterfallView(cols=2).update(systems)
+        tweaked = list(systems)
+        system_type, variables, n, name = tweaked[0]
+        variants = [
+            (system_type, {k: v * scale for k, v in variables.items()}, n, name)
+            for scale in (1.0, 1.01)
+        ]
+
+        def tweak():
+            variants.reverse()
+            tweaked[0] = variants[0]
+            view.update(tweaked)
+
+        results[f'WaterfallView.update[systems={count}]'] = timeit(tweak)
+
+        results[f'plot_waterfall_cooling_altair[systems={count}].to_dict'] = timeit(
+            lambda: plot_waterfall_cooling_altair(systems, cols=2).to_dict()
+        )
+
+    for count in counts:
+        dataframes = []
+        for i in range(count):
+            columns = scenarios('ASHP', 200, seed=i)
+            result = evaluate_cooling('ASHP', columns)
+            dataframes.append(pd.DataFrame({
+                'T_0': columns['T_0'],
+                'eff_A': result['eff_A'],
+                'system': f'ASHP {i + 1}',
+            }))
+        results[f'create_dynamic_multiview[systems={count}].to_dict'] = timeit(
+            lambda: create_dynamic_multiview(dataframes, cols=3).to_dict(),
+            repeat=3,
+        )
+
+
+def compare(results, baseline, tolerance):
+    """
+    baseline보다 (1 + tolerance)배 이상 느려진 benchmark 목록.
+    """
+    regressions = []
+    for name, result in results.items():
+        if name not in baseline['results']:
+            continue
+        before = baseline['results'][name]['median']
+        ratio = result['median'] / before
+        if ratio > 1 + tolerance:
+            regressions.append((name, before, result['median'], ratio))
+    return regressions
+
+
+def main(argv=None):
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[1])
+    parser.add_argument('--save', help='Write results to this JSON file.')
+    parser.add_argument('--baseline', help='Compare against this JSON file.')
+    parser.add_argument('--tolerance', type=float, default=0.25)
+    parser.add_argument('--no-charts', action='store_true', help='Skip chart benchmarks.')
+    parser.add_argument('--quick', action='store_true', help='Skip the largest sizes.')
+    args = parser.parse_args(argv)
+
+    sizes = SCENARIO_SIZES[:-1] if args.quick else SCENARIO_SIZES
+    counts = SYSTEM_COUNTS[:-1] if args.quick else SYSTEM_COUNTS
+
+    results = {}
+    bench_evaluation(results, sizes, LOOP_SIZES)
+    bench_surface(results, sizes)
+    bench_uncertainty(results, UNCERTAINTY_SIZES[:-1] if args.quick else UNCERTAINTY_SIZES)
+    bench_sensitivity(results)
+    if not args.no_charts:
+        bench_charts(results, counts)
+
+    for name, result in results.items():
+        print(f'{name:60s} {result["median"] * 1e3:12.3f} ms')
+
+    if args.save:
+        with open(args.save, 'w') as f:
+            json.dump({
+                'python': platform.python_version(),
+                'machine': platform.machine(),
+                'numpy': np.__version__,
+                'results': results,
+            }, f, indent=2)
+
+    if args.baseline:
+        with open(args.baseline) as f:
+            baseline = json.load(f)
+        regressions = compare(results, baseline, args.tolerance)
+        for name, before, after, ratio in regressions:
+            print(
+                f'REGRESSION: {name}: {before * 1e3:.3f} ms -> {after * 1e3:.3f} ms ({ratio:.2f}x)',
+                file=sys.stderr,
+            )
+        if regressions:
+            return 1
+
+    return 0
+
+
+if __name__ == '__main__':
+    sys.exit(main())
@@ -0,0 +1,109 @@
+"""
+Import-time benchmark for the computational core.
+
+Each measurement runs in a fresh interpreter. A cold import compiles every
+module from source (empty bytecode cache); a warm import reuses the cache.
+The script exits with status 1 if an import exceeds its budget or pulls in
+a plotting/dashboard backend.
+
+    python benchmarks/import_time.py
+    python benchmarks/import_time.py --cold-budget-ms 1500 --warm-budget-ms 200
+"""
+import os
+import sys
+import json
+import argparse
+import tempfile
+import statistics
+import subprocess
+
+
+CORE_MODULES = [
+    'exergy_dashboard.model',
+    'exergy_dashboard.system',
+    'exergy_dashboard.evaluation',
+    'exergy_dashboard.store',
+    'exergy_dashboard.cache',
+    'exergy_dashboard.sweep',
+    'exergy_dashboard.parallel',
+    'exergy_dashboard.simulation',
+    'exergy_dashboard.chart',
+    'exergy_dashboard.vega',
+    'exergy_dashboard.surface',
+    'exergy_dashboard.uncertainty',
+    'exergy_dashboard.sensitivity',
+]
+
+HEAVY_MODULES = [
+    'streamlit',
+    'matplotlib',
+    'altair',
+    'pandas',
+    'pyarrow',
+    'dartwork_mpl',
+]
+
+PROBE = '''
+import sys, time, json
+start = time.perf_counter()
+for name in {modules!r}:
+    __import__(name)
+elapsed = time.perf_counter() - start
+print(json.dumps({{
+    'seconds': elapsed,
+    'heavy': [m for m in {heavy!r} if m in sys.modules],
+}}))
+'''
+
+
+def measure(modules, pycache_prefix=None):
+    env = dict(os.environ)
+    env.pop('PYTHONDONTWRITEBYTECODE', None)
+    if pycache_prefix is not None:
+        env['PYTHONPYCACHEPREFIX'] = pycache_prefix
+
+    code = PROBE.format(modules=modules, heavy=HEAVY_MODULES)
+    output = subprocess.run(
+        [sys.executable, '-c', code],
+        env=env, check=True, capture_output=True, text=True,
+    ).stdout
+    return json.loads(output)
+
+
+def main(argv=None):
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[1])
+    parser.add_argument('--cold-budget-ms', type=float, default=2000.0)
+    parser.add_argument('--warm-budget-ms', type=float, default=300.0)
+    parser.add_argument('--repeat', type=int, default=5)
+    args = parser.parse_args(argv)
+
+    with tempfile.TemporaryDirectory() as prefix:
+        cold = measure(CORE_MODULES, pycache_prefix=prefix)
+        warm = [
+            measure(CORE_MODULES, pycache_prefix=prefix)
+            for _ in range(args.repeat)
+        ]
+
+    cold_ms = cold['seconds'] * 1000
+    warm_ms = statistics.median(w['seconds'] for w in warm) * 1000
+    heavy = sorted(set(cold['heavy']).union(*(w['heavy'] for w in warm)))
+
+    print(f'cold import: {cold_ms:8.1f} ms (budget {args.cold_budget_ms:.0f} ms)')
+    print(f'warm import: {warm_ms:8.1f} ms (budget {args.warm_budget_ms:.0f} ms, median of {args.repeat})')
+
+    failures = []
+    if cold_ms > args.cold_budget_ms:
+        failures.append('cold import exceeds budget')
+    if warm_ms > args.warm_budget_ms:
+        failures.append('warm import exceeds budget')
+    if heavy:
+        failures.append(f'core import loaded {", ".join(heavy)}')
+
+    for failure in failures:
+        print(f'FAIL: {failure}', file=sys.stderr)
+
+    return 1 if failures else 0
+
+
+if __name__ == '__main__':
+    sys.exit(main())
@@ -0,0 +1,4 @@
+from exergy_dashboard.cli import main
+
+
+main()
@@ -0,0 +1,87 @@
+import collections
+
+
+CacheInfo = collections.namedtuple(
+    'CacheInfo', ['hits', 'misses', 'maxsize', 'currsize']
+)
+
+
+class LRUCache:
+    """
+    크기 제한이 있는 LRU 캐시. hit/miss 횟수를 기록한다.
+
+    Parameters:
+    - maxsize: 저장할 최대 항목 수
+    - maxbytes: 저장된 값들의 최대 총 크기 (None이면 제한 없음)
+    - sizeof: 값의 크기를 계산하는 함수 (기본값 len)
+    """
+
+    def __init__(self, maxsize=128, maxbytes=None, sizeof=len):
+        if maxsize < 1:
+            raise ValueError('maxsize must be at least 1.')
+
+        self.maxsize = maxsize
+        self.maxbytes = maxbytes
+        self.sizeof = sizeof
+        self.hits = 0
+        self.misses = 0
+        self.nbytes = 0
+        self._data = collections.OrderedDict()
+
+    def __len__(self):
+        return len(self._data)
+
+    def __contains__(self, key):
+        return key in self._data
+
+    def get(self, key, default=None):
+        try:
+            value = self._data[key]
+        except KeyError:
+            self.misses += 1
+            return default
+
+        self._data.move_to_end(key)
+        self.hits += 1
+        return value
+
+    def put(self, key, value):
+        if key in self._data:
+            self._discard(key)
+
+        self._data[key] = value
+        if self.maxbytes is not None:
+            self.nbytes += self.sizeof(value)
+
+        # 가장 최근 항목은 항상 유지한다.
+        while len(self._data) > 1 and (
+            len(self._data) > self.maxsize
+            or (self.maxbytes is not None and self.nbytes > self.maxbytes)
+        ):
+            self._discard(next(iter(self._data)))
+
+    def _discard(self, key):
+        value = self._data.pop(key)
+        if self.maxbytes is not None:
+            self.nbytes -= self.sizeof(value)
+
+    def get_or_compute(self, key, func):
+        """
+        key에 해당하는 값을 반환. 없으면 func()로 계산하여 저장한다.
+        """
+        sentinel = object()
+        value = self.get(key, sentinel)
+        if value is sentinel:
+            value = func()
+            self.put(key, value)
+
+        return value
+
+    def info(self):
+        return CacheInfo(self.hits, self.misses, self.maxsize, len(self._data))
+
+    def clear(self):
+        self._data.clear()
+        self.nbytes = 0
+        self.hits = 0
+        self.misses = 0
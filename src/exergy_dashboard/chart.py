@@ -1,9 +1,9 @@
+import io
+
 import numpy as np
-import matplotlib.pyplot as plt
-import altair as alt
-import pandas as pd
 
-import dartwork_mpl as dm
+# matplotlib, dartwork_mpl, altair, pandas는 import 비용이 크므로
+# 실제로 차트를 그릴 때 불러온다.
 
 
 COLORS = [
@@ -20,279 +20,888 @@ COLORS = [
 ] * 50
 
 
-def plot_waterfall_cooling_ashp(
-    Xin_A,
-    Xc_int_A,
-    Xc_r_A,
-    Xc_ext_A,
-    X_a_ext_out_A,
-    Xout_A,
-    n,
-    name,
-):
-    fig, ax = plt.subplots(figsize=(dm.cm2in(8), dm.cm2in(5)))
-
-    # ASHP plot
-    labels_ashp = ['Input', r'$X_{c,int}$', r'$X_{c,ref}$', r'$X_{c,ext}$', r'$X_{ext,out}$', 'Output']
-    values_ashp = [Xin_A, -Xc_int_A, -Xc_r_A, -Xc_ext_A, -X_a_ext_out_A, Xout_A]
-    x_ashp = np.arange(len(labels_ashp))
-    cumulative_values_ashp = np.cumsum(values_ashp)
-
-    # Common settings
-    bar_width = 0.4
-    y_max = np.max(values_ashp) * 1.1
-    x_padding = 0.4
-    annotation_size = dm.fs(-0.5)
-    line_thickness = 0.1
-    text_padding = 0.04
-
-    # Function to draw connecting lines
-    def draw_waterfall_lines(ax, x, cumulative_values, line_thickness):
-        for i in range(1, len(x)):
-            start = cumulative_values[i-1]
-            end = cumulative_values[i]
-            ax.plot([x[i-1]-bar_width/2, x[i]+bar_width/2], [start, start], color='dm.gray6', linestyle='-', linewidth=line_thickness)
-
-    # Plot bars for ASHP
-    for i in range(len(x_ashp)):
-        if i == 0 or i == len(x_ashp) - 1:
-            ax.bar(x_ashp[i], values_ashp[i], bar_width, color=COLORS[n])
-        else:
-            ax.bar(x_ashp[i], values_ashp[i], bar_width, bottom=cumulative_values_ashp[i-1], color=COLORS[n])
-
-    # Draw connecting lines for ASHP
-    draw_waterfall_lines(ax, x_ashp, cumulative_values_ashp, line_thickness)
-
-    # Axis settings
-    ax.tick_params(axis='x', which='both', bottom=False, top=False)
-    ax.tick_params(axis='y', which='both', left=True, right=False)
-    ax.set_yticks([])
-    ax.set_ylim(0, y_max)
-    ax.spines['top'].set_visible(False)
-    ax.spines['right'].set_visible(False)
-    ax.spines['left'].set_visible(False)
-    ax.spines['bottom'].set_visible(True)
-
-    # Set x-axis labels and limits
-    ax.set_xticks(x_ashp)
-    ax.set_xticklabels(labels_ashp, ha='center', fontsize=dm.fs(0.3))
-    ax.set_xlim(-x_padding, len(labels_ashp) - 1 + x_padding)
-
-    # Add bar values as text
-    for i, value in enumerate(values_ashp):
-        if i == 0 or i == len(values_ashp) - 1:
-            height = value
-            va = 'bottom'
-            y_pos = height + text_padding
-        else:
-            height = cumulative_values_ashp[i]
-            va = 'top'
-            y_pos = height - text_padding
-        
-        sign = '-' if value < 0 else ''
-        text_value = f'{abs(value):.1f}'
-        
-        # Combine sign and value, but add a small space between them
-        full_text = f'{sign}{text_value}' if sign else text_value
-        
-        # Add the full text, centered on the bar
-        ax.text(i, y_pos, full_text, ha='center', va=va, fontsize=dm.fs(0), weight='normal')
-
-    # Add title for ASHP
-    ax.set_title(f'{name}', fontsize=dm.fs(0.5))
+# waterfall 막대 정의: (라벨, 변수). 처음과 마지막은 합계 막대이고,
+# 나머지는 손실로서 누적값에서 빼며 그린다.
+WATERFALL_BARS = {
+    'ASHP': (
+        ('Input', 'Xin_A'),
+        (r'$X_{c,int}$', 'Xc_int_A'),
+        (r'$X_{c,ref}$', 'Xc_r_A'),
+        (r'$X_{c,ext}$', 'Xc_ext_A'),
+        (r'$X_{ext,out}$', 'X_a_ext_out_A'),
+        ('Output', 'Xout_A'),
+    ),
+    'GSHP': (
+        ('Input', 'Xin_G'),
+        (r'$X_{c,int}$', 'Xc_int_G'),
+        (r'$X_{c,ref}$', 'Xc_r_G'),
+        (r'$X_{c,GHE}$', 'Xc_GHE'),
+        ('Output', 'Xout_G'),
+    ),
+}
+
+# Vega-Lite는 LaTeX를 그리지 못하므로 축 라벨은 일반 텍스트로 바꾼다.
+WATERFALL_TEXT_LABELS = {
+    r'$X_{c,int}$': 'Xc,int',
+    r'$X_{c,ref}$': 'Xc,ref',
+    r'$X_{c,ext}$': 'Xc,ext',
+    r'$X_{ext,out}$': 'Xext,out',
+    r'$X_{c,GHE}$': 'Xc,GHE',
+}
+
+
+def waterfall_bars(system_type, variables):
+    """
+    waterfall 막대의 라벨, 높이, 시작점을 반환.
+
+    손실 막대는 음수 높이로, 직전 누적값에서 시작한다.
+    """
+    labels, names = zip(*WATERFALL_BARS[system_type])
+    values = np.array([float(variables[k]) for k in names])
+    values[1:-1] *= -1
+
+    cumulative = np.cumsum(values)
+    bottoms = np.zeros_like(values)
+    bottoms[1:-1] = cumulative[:-2]
+
+    return labels, values, bottoms
+
+
+# waterfall 공통 설정
+BAR_WIDTH = 0.4
+X_PADDING = 0.4
+LINE_THICKNESS = 0.1
+TEXT_PADDING = 1
+
+
+def _waterfall_segments(x, tops):
+    # 막대 사이 연결선: 직전 막대의 끝 높이를 다음 막대까지 잇는다.
+    segments = np.empty((len(x) - 1, 2, 2))
+    segments[:, 0, 0] = x[:-1] - BAR_WIDTH / 2
+    segments[:, 1, 0] = x[1:] + BAR_WIDTH / 2
+    segments[:, :, 1] = tops[:-1, None]
+    return segments
+
+
+def _draw_waterfall(fig, systems, cols):
+    """
+    fig에 시스템마다 subplot 하나씩 waterfall을 그리고, 축별 artist를 반환한다.
+    """
+    from matplotlib.collections import LineCollection
+    import dartwork_mpl as dm
+
+    rows = -(-len(systems) // cols)
+    axes = fig.subplots(rows, cols, squeeze=False).ravel()
+
+    panels = []
+    for ax, (system_type, variables, n, name) in zip(axes, systems):
+        labels, values, bottoms = waterfall_bars(system_type, variables)
+        x = np.arange(len(labels))
+
+        bars = ax.bar(x, values, BAR_WIDTH, bottom=bottoms, color=COLORS[n])
+        lines = ax.add_collection(LineCollection(
+            _waterfall_segments(x, bottoms + values),
+            colors='dm.gray6',
+            linestyles='-',
+            linewidths=LINE_THICKNESS,
+        ))
+
+        # 막대 끝에 값 표시 (손실 막대는 아래쪽)
+        texts = ax.bar_label(
+            bars,
+            labels=[f'{value:.1f}' for value in values],
+            padding=TEXT_PADDING,
+            fontsize=dm.fs(0),
+        )
+
+        # Axis settings
+        ax.tick_params(axis='x', which='both', bottom=False, top=False)
+        ax.tick_params(axis='y', which='both', left=True, right=False)
+        ax.set_yticks([])
+        ax.set_ylim(0, np.max(values) * 1.1)
+        ax.spines['top'].set_visible(False)
+        ax.spines['right'].set_visible(False)
+        ax.spines['left'].set_visible(False)
+        ax.spines['bottom'].set_visible(True)
+
+        # Set x-axis labels and limits
+        ax.set_xticks(x)
+        ax.set_xticklabels(labels, ha='center', fontsize=dm.fs(0.3))
+        ax.set_xlim(-X_PADDING, len(labels) - 1 + X_PADDING)
+
+        ax.set_title(f'{name}', fontsize=dm.fs(0.5))
+
+        panels.append({
+            'ax': ax,
+            'bars': bars,
+            'lines': lines,
+            'texts': texts,
+            'values': values,
+        })
+
+    for ax in axes[len(systems):]:
+        ax.set_visible(False)
 
     dm.simple_layout(fig, margins=(0.1,0.1,0.1,0.1), bbox=(0, 1, 0, 1), verbose=False)
-    # fig_name = 'ASHP_exergy_distribution_waterfall_paper'
-    # plt.savefig(save_dir + fig_name + '.png', dpi=600, transparent=True)
-    # dm.util.save_and_show(fig, size=600)
+
+    return panels
+
+
+def _waterfall_figsize(count, cols):
+    import dartwork_mpl as dm
+
+    rows = -(-count // cols)
+    return (dm.cm2in(8) * cols, dm.cm2in(5) * rows)
+
+
+def plot_waterfall_cooling(systems, cols=2):
+    """
+    여러 시스템의 waterfall 차트를 figure 하나의 subplot으로 그린다.
+
+    축마다 bar 한 번, 연결선 LineCollection 하나, bar_label 한 번만 호출한다.
+
+    Parameters:
+    - systems: (system_type, variables, n, name) 리스트.
+      variables는 WATERFALL_BARS의 변수를 담은 mapping, n은 색상 인덱스.
+    - cols: 열의 개수
+    """
+    import matplotlib.pyplot as plt
+
+    systems = list(systems)
+    cols = max(1, min(cols, len(systems)))
+
+    fig = plt.figure(figsize=_waterfall_figsize(len(systems), cols))
+    _draw_waterfall(fig, systems, cols)
 
     return fig
 
 
-def plot_waterfall_cooling_gshp(
-    Xin_G,
-    X_g,
-    Xc_int_G,
-    Xc_r_G,
-    Xc_GHE,
-    Xout_G,
+class WaterfallView:
+    """
+    waterfall figure를 유지하면서 값이 바뀐 시스템의 artist만 갱신하는 view.
+
+    시스템 구성(종류, 이름, 색상, 열 수)이 같으면 figure를 다시 만들지 않고
+    막대 높이/시작점, 연결선, 값 텍스트, y 범위만 바꾼 뒤 해당 축만 blit한다.
+    구성이 바뀌면 figure를 새로 그린다.
+    """
+
+    def __init__(self, cols=2, dpi=200):
+        self.cols = cols
+        self.dpi = dpi
+        self.figure = None
+        self.panels = []
+        self.layout = None
+        self.redrawn = []
+        self._backgrounds = []
+
+    def _build(self, systems, cols):
+        from matplotlib.figure import Figure
+        from matplotlib.backends.backend_agg import FigureCanvasAgg
+
+        fig = Figure(figsize=_waterfall_figsize(len(systems), cols), dpi=self.dpi)
+        FigureCanvasAgg(fig)
+        self.panels = _draw_waterfall(fig, systems, cols)
+
+        # 데이터 artist는 animated로 두어 배경에서 제외하고, 축 밖으로 그리지 않도록 자른다.
+        for panel in self.panels:
+            for artist in self._artists(panel):
+                artist.set_animated(True)
+            for text in panel['texts']:
+                text.set_clip_on(True)
+                text.set_clip_box(panel['ax'].bbox)
+
+        fig.canvas.draw()
+        self._backgrounds = [
+            fig.canvas.copy_from_bbox(panel['ax'].bbox) for panel in self.panels
+        ]
+        for panel in self.panels:
+            self._draw_panel(panel)
+
+        self.figure = fig
+        self.redrawn = list(range(len(self.panels)))
+
+    @staticmethod
+    def _artists(panel):
+        return [*panel['bars'], panel['lines'], *panel['texts']]
+
+    def _draw_panel(self, panel):
+        ax = panel['ax']
+        for artist in self._artists(panel):
+            ax.draw_artist(artist)
+
+    def _update_panel(self, panel, system_type, variables):
+        labels, values, bottoms = waterfall_bars(system_type, variables)
+
+        for rect, height, bottom in zip(panel['bars'], values, bottoms):
+            rect.set_y(bottom)
+            rect.set_height(height)
+
+        panel['lines'].set_segments(
+            _waterfall_segments(np.arange(len(values)), bottoms + values)
+        )
+
+        for text, rect, value in zip(panel['texts'], panel['bars'], values):
+            text.xy = (rect.get_x() + rect.get_width() / 2, rect.get_y() + rect.get_height())
+            text.xyann = (0, TEXT_PADDING if value >= 0 else -TEXT_PADDING)
+            text.set_verticalalignment('bottom' if value >= 0 else 'top')
+            text.set_text(f'{value:.1f}')
+
+        panel['ax'].set_ylim(0, np.max(values) * 1.1)
+        panel['values'] = values
+
+    def update(self, systems):
+        """
+        systems((system_type, variables, n, name) 리스트)로 view를 갱신한다.
+
+        self.redrawn에 다시 그린 축의 인덱스를 남긴다.
+        """
+        systems = list(systems)
+        cols = max(1, min(self.cols, len(systems)))
+        layout = (
+            tuple((system_type, COLORS[n], name) for system_type, _, n, name in systems),
+            cols,
+        )
+
+        if layout != self.layout:
+            self._build(systems, cols)
+            self.layout = layout
+            return self
+
+        self.redrawn = []
+        canvas = self.figure.canvas
+        for i, (panel, background, (system_type, variables, _, _)) in enumerate(
+            zip(self.panels, self._backgrounds, systems)
+        ):
+            _, values, _ = waterfall_bars(system_type, variables)
+            if np.array_equal(values, panel['values']):
+                continue
+
+            self._update_panel(panel, system_type, variables)
+            canvas.restore_region(background)
+            self._draw_panel(panel)
+            self.redrawn.append(i)
+
+        return self
+
+    def to_bytes(self):
+        """
+        현재 canvas 버퍼를 PNG bytes로 변환한다.
+        """
+        import matplotlib.image as mpimg
+
+        buffer = io.BytesIO()
+        mpimg.imsave(
+            buffer,
+            np.asarray(self.figure.canvas.buffer_rgba()),
+            format='png',
+            dpi=self.dpi,
+            # 갱신마다 인코딩하므로 압축률보다 속도를 택한다.
+            pil_kwargs={'compress_level': 1},
+        )
+        return buffer.getvalue()
+
+
+def figure_to_bytes(fig, fmt='png', dpi=200):
+    """
+    figure를 PNG/SVG bytes로 변환한 뒤 figure를 닫는다.
+    """
+    import matplotlib.pyplot as plt
+
+    buffer = io.BytesIO()
+    try:
+        fig.savefig(buffer, format=fmt, dpi=dpi)
+    finally:
+        plt.close(fig)
+
+    return buffer.getvalue()
+
+
+def _waterfall_key(system_type, variables, n, name):
+    values = tuple(float(variables[k]) for _, k in WATERFALL_BARS[system_type])
+    return (system_type, values, COLORS[n], name)
+
+
+def render_waterfall_cooling(
+    system_type,
+    variables,
     n,
     name,
+    fmt='png',
+    dpi=200,
+    cache=None,
 ):
-    fig, ax = plt.subplots(figsize=(dm.cm2in(8), dm.cm2in(5)))
-
-    print(f'{Xin_G=}, {X_g=}, {Xc_int_G=}, {Xc_r_G=}, {Xc_GHE=}, {Xout_G=}')
-
-    # ASHP plot
-    labels_gshp = ['Input', r'$X_{c,int}$', r'$X_{c,ref}$', r'$X_{c,GHE}$', 'Output']
-    values_gshp = [Xin_G, -Xc_int_G, -Xc_r_G, -Xc_GHE, Xout_G]
-    x_ashp = np.arange(len(labels_gshp))
-    cumulative_values_ashp = np.cumsum(values_gshp)
-
-    # Common settings
-    bar_width = 0.4
-    y_max = np.max(values_gshp) * 1.1
-    x_padding = 0.4
-    annotation_size = dm.fs(-0.5)
-    line_thickness = 0.1
-    text_padding = 0.04
-
-    # Function to draw connecting lines
-    def draw_waterfall_lines(ax, x, cumulative_values, line_thickness):
-        for i in range(1, len(x)):
-            start = cumulative_values[i-1]
-            end = cumulative_values[i]
-            ax.plot([x[i-1]-bar_width/2, x[i]+bar_width/2], [start, start], color='dm.gray6', linestyle='-', linewidth=line_thickness)
-
-    # Plot bars for ASHP
-    for i in range(len(x_ashp)):
-        if i == 0 or i == len(x_ashp) - 1:
-            ax.bar(x_ashp[i], values_gshp[i], bar_width, color=COLORS[n])
-        else:
-            ax.bar(x_ashp[i], values_gshp[i], bar_width, bottom=cumulative_values_ashp[i-1], color=COLORS[n])
-
-    # Draw connecting lines for ASHP
-    draw_waterfall_lines(ax, x_ashp, cumulative_values_ashp, line_thickness)
-
-    # Axis settings
-    ax.tick_params(axis='x', which='both', bottom=False, top=False)
-    ax.tick_params(axis='y', which='both', left=True, right=False)
-    ax.set_yticks([])
-    ax.set_ylim(0, y_max)
-    ax.spines['top'].set_visible(False)
-    ax.spines['right'].set_visible(False)
-    ax.spines['left'].set_visible(False)
-    ax.spines['bottom'].set_visible(True)
-
-    # Set x-axis labels and limits
-    ax.set_xticks(x_ashp)
-    ax.set_xticklabels(labels_gshp, ha='center', fontsize=dm.fs(0.3))
-    ax.set_xlim(-x_padding, len(labels_gshp) - 1 + x_padding)
-
-    # Add bar values as text
-    for i, value in enumerate(values_gshp):
-        if i == 0 or i == len(values_gshp) - 1:
-            height = value
-            va = 'bottom'
-            y_pos = height + text_padding
-        else:
-            height = cumulative_values_ashp[i]
-            va = 'top'
-            y_pos = height - text_padding
-        
-        sign = '-' if value < 0 else ''
-        text_value = f'{abs(value):.1f}'
-        
-        # Combine sign and value, but add a small space between them
-        full_text = f'{sign}{text_value}' if sign else text_value
-        
-        # Add the full text, centered on the bar
-        ax.text(i, y_pos, full_text, ha='center', va=va, fontsize=dm.fs(0), weight='normal')
-
-    # Add title for ASHP
-    ax.set_title(f'{name}', fontsize=dm.fs(0.5))
+    """
+    시스템의 waterfall 차트를 이미지 bytes로 렌더링.
+
+    Parameters:
+    - system_type: 'ASHP' 또는 'GSHP'
+    - variables: evaluate_parameters_cooling의 결과
+    - n: 색상 인덱스
+    - name: 차트 제목
+    - fmt: 'png' 또는 'svg'
+    - cache: LRUCache. 주어지면 (입력값, 색상, 제목, 포맷) 키로 결과를 재사용한다.
+    """
+    return render_waterfall_grid(
+        [(system_type, variables, n, name)],
+        cols=1,
+        fmt=fmt,
+        dpi=dpi,
+        cache=cache,
+    )
 
-    dm.simple_layout(fig, margins=(0.1,0.1,0.1,0.1), bbox=(0, 1, 0, 1), verbose=False)
-    # fig_name = 'ASHP_exergy_distribution_waterfall_paper'
-    # plt.savefig(save_dir + fig_name + '.png', dpi=600, transparent=True)
-    # dm.util.save_and_show(fig, size=600)
 
-    return fig
+def render_waterfall_grid(systems, cols=2, fmt='png', dpi=200, cache=None, view=None):
+    """
+    여러 시스템의 waterfall 차트를 이미지 하나로 렌더링.
+
+    Parameters:
+    - systems: (system_type, variables, n, name) 리스트
+    - cols: 열의 개수
+    - fmt, dpi, cache: render_waterfall_cooling과 같다.
+    - view: WaterfallView. 주어지면 PNG는 figure를 다시 만들지 않고 바뀐 축만 갱신한다.
+    """
+    systems = list(systems)
+
+    def render():
+        if view is not None and fmt == 'png' and view.dpi == dpi and view.cols == cols:
+            return view.update(systems).to_bytes()
+
+        fig = plot_waterfall_cooling(systems, cols=cols)
+        return figure_to_bytes(fig, fmt=fmt, dpi=dpi)
+
+    if cache is None:
+        return render()
+
+    key = (tuple(_waterfall_key(*system) for system in systems), cols, fmt, dpi)
+    return cache.get_or_compute(key, render)
+
+
+def waterfall_records(systems):
+    """
+    Vega-Lite waterfall에 넘길 막대 레코드 리스트.
+
+    막대의 시작/끝 높이를 미리 계산해 두므로 브라우저에서는 window 변환 없이
+    그리기만 한다. 시스템당 막대 수만큼의 작은 레코드만 전송된다.
+    """
+    records = []
+    for system_type, variables, n, name in systems:
+        labels, values, bottoms = waterfall_bars(system_type, variables)
+        labels = [WATERFALL_TEXT_LABELS.get(label, label) for label in labels]
+        for i, (label, value, bottom) in enumerate(zip(labels, values, bottoms)):
+            records.append({
+                'system': name,
+                'order': i,
+                'label': label,
+                'next': labels[min(i + 1, len(labels) - 1)],
+                'amount': round(float(value), 3),
+                'start': round(float(bottom), 3),
+                'end': round(float(bottom + value), 3),
+            })
+
+    return records
+
+
+def plot_waterfall_cooling_altair(systems, cols=2, width=240, height=160):
+    """
+    여러 시스템의 waterfall 차트를 Altair(Vega-Lite)로 생성.
+
+    시스템이 둘 이상이면 시스템별로 facet하고, 막대 색상은 matplotlib 버전과 같다.
+
+    Parameters:
+    - systems: (system_type, variables, n, name) 리스트
+    - cols: facet 열의 개수
+    - width, height: subplot 하나의 크기 [px]
+    """
+    import altair as alt
+
+    systems = list(systems)
+    names = [name for _, _, _, name in systems]
+    bar_size = 24
+
+    data = alt.Data(values=waterfall_records(systems))
+    x = alt.X(
+        'label:N',
+        sort=alt.EncodingSortField('order'),
+        axis=alt.Axis(title=None, labelAngle=0),
+    )
 
+    bar = alt.Chart().mark_bar(size=bar_size).encode(
+        x=x,
+        y=alt.Y('start:Q', title='Exergy [kW]'),
+        y2='end:Q',
+        color=alt.Color(
+            'system:N',
+            scale=alt.Scale(domain=names, range=[COLORS[n] for _, _, n, _ in systems]),
+            legend=None,
+        ),
+        tooltip=[
+            alt.Tooltip('system:N'),
+            alt.Tooltip('label:N'),
+            alt.Tooltip('amount:Q', format='.2f'),
+        ],
+    )
 
+    # 막대 사이 연결선
+    rule = alt.Chart().mark_rule(
+        xOffset=-bar_size / 2, x2Offset=bar_size / 2, color='#b0b0b0', strokeWidth=0.5,
+    ).encode(
+        x=x,
+        x2='next:N',
+        y='end:Q',
+    ).transform_filter(alt.datum.label != alt.datum.next)
+
+    # 합계 막대는 위, 손실 막대는 아래에 값 표시
+    text_total = alt.Chart().mark_text(baseline='bottom', dy=-2).encode(
+        x=x,
+        y='end:Q',
+        text=alt.Text('amount:Q', format='.1f'),
+    ).transform_filter(alt.datum.amount >= 0)
+    text_loss = alt.Chart().mark_text(baseline='top', dy=2).encode(
+        x=x,
+        y='end:Q',
+        text=alt.Text('amount:Q', format='.1f'),
+    ).transform_filter(alt.datum.amount < 0)
+
+    chart = alt.layer(bar, rule, text_total, text_loss, data=data).properties(
+        width=width,
+        height=height,
+    )
 
+    if len(systems) == 1:
+        return chart.properties(title=names[0])
 
-def plot_waterfall_cooling_ashp_altair(
-    Xin_A,
-    Xc_int_A,
-    Xc_r_A,
-    Xc_ext_A,
-    X_a_ext_out_A,
-    Xout_A
-):
-    # values_ashp = [Xin_A, -Xc_int_A, -Xc_r_A, -Xc_ext_A, -X_a_ext_out_A, Xout_A]
-    data = [
-        {"label": "Begin", "amount": Xin_A},
-        {"label": "Jan", "amount": -Xc_int_A},
-        {"label": "Feb", "amount": -Xc_r_A},
-        {"label": "Mar", "amount": -Xc_ext_A},
-        {"label": "Apr", "amount": -X_a_ext_out_A},
-        {"label": "End", "amount": Xout_A},
-    ]
-    source = pd.DataFrame(data)
-
-    # Define frequently referenced fields
-    amount = alt.datum.amount
-    label = alt.datum.label
-    window_lead_label = alt.datum.window_lead_label
-    window_sum_amount = alt.datum.window_sum_amount
-
-    # Define frequently referenced/long expressions
-    calc_prev_sum = alt.expr.if_(label == "End", 0, window_sum_amount - amount)
-    calc_amount = alt.expr.if_(label == "End", window_sum_amount, amount)
-    calc_text_amount = (
-        alt.expr.if_((label != "Begin") & (label != "End") & calc_amount > 0, "+", "")
-        + calc_amount
+    return chart.facet(
+        facet=alt.Facet('system:N', sort=names, title=None),
+        columns=cols,
+    ).resolve_scale(
+        x='independent',
+        y='independent',
     )
 
-    # The "base_chart" defines the transform_window, transform_calculate, and X axis
-    base_chart = alt.Chart(source).transform_window(
-        window_sum_amount="sum(amount)",
-        window_lead_label="lead(label)",
-    ).transform_calculate(
-        calc_lead=alt.expr.if_((window_lead_label == None), label, window_lead_label),
-        calc_prev_sum=calc_prev_sum,
-        calc_amount=calc_amount,
-        calc_text_amount=calc_text_amount,
-        calc_center=(window_sum_amount + calc_prev_sum) / 2,
-        calc_sum_dec=alt.expr.if_(window_sum_amount < calc_prev_sum, window_sum_amount, ""),
-        calc_sum_inc=alt.expr.if_(window_sum_amount > calc_prev_sum, window_sum_amount, ""),
-    ).encode(
-        x=alt.X("label:O", axis=alt.Axis(title="Months", labelAngle=0), sort=None)
-    )
 
-    color_coding = (
-        alt.when((label == "Begin") | (label == "End"))
-        .then(alt.value("#878d96"))
-        .when(calc_amount < 0)
-        .then(alt.value("#24a148"))
-        .otherwise(alt.value("#fa4d56"))
+def plot_whatif_cooling(system_type, params, n, name, width=320, height=180):
+    """
+    브라우저에서 모델을 계산하는 what-if 차트 (waterfall + 효율).
+
+    모델 수식을 Vega-Lite calculate 변환으로 컴파일하고, 입력 파라미터를 slider에
+    묶은 Vega parameter로 둔다. slider를 움직여도 서버 호출 없이 브라우저에서
+    다시 계산된다. Vega 표현식과 Python 모델의 일치는 tests/test_vega.py에서 검증한다.
+
+    Parameters:
+    - system_type: 'ASHP' 또는 'GSHP'
+    - params: 파라미터 이름 -> 시작 값 (온도는 ℃)
+    - n: 색상 인덱스
+    - name: 차트 제목
+    """
+    import altair as alt
+    from exergy_dashboard.system import SYSTEM_CASE
+    from exergy_dashboard.evaluation import COOLING_TERMS
+    from exergy_dashboard.vega import (
+        compile_constraints,
+        compile_cooling,
+        parameter_name,
     )
 
-    bar = base_chart.mark_bar(size=45).encode(
-        y=alt.Y("calc_prev_sum:Q", title="Amount"),
-        y2=alt.Y2("window_sum_amount:Q"),
-        color=color_coding,
+    params = {k: float(params[k]) for k in SYSTEM_CASE['COOLING'][system_type]['parameters']}
+
+    # slider 범위는 고정이므로 다른 파라미터를 참조하는 경계는 정적 범위를 쓴다.
+    constraints = SYSTEM_CASE['COOLING'][system_type]['constraints']
+    sliders = []
+    for key, spec in SYSTEM_CASE['COOLING'][system_type]['parameters'].items():
+        low, high = constraints.static[key]
+        sliders.append(alt.param(
+            name=parameter_name(key),
+            value=params[key],
+            bind=alt.binding_range(
+                min=low, max=high, step=spec['step'], name=f"{key} [{spec['unit']}] ",
+            ),
+        ))
+
+    # 막대 정의만 데이터로 보내고, 값은 각 행에서 모델을 계산한 뒤 term 필드에서 꺼낸다.
+    bars = WATERFALL_BARS[system_type]
+    rows = [
+        {
+            'order': i,
+            'label': WATERFALL_TEXT_LABELS.get(label, label),
+            'term': term,
+            'total': i in (0, len(bars) - 1),
+        }
+        for i, (label, term) in enumerate(bars)
+    ]
+    efficiency = COOLING_TERMS[system_type]['efficiency']
+
+    # 모델 계산은 최상위 vconcat에서 한 번만 정의하고, 하위 차트는 결과 필드만 쓴다.
+    waterfall = alt.Chart().transform_calculate(
+        amount='datum.total ? datum[datum.term] : -datum[datum.term]',
+    ).transform_window(
+        cumulative='sum(amount)',
+        next='lead(label)',
+        sort=[alt.SortField('order')],
+    ).transform_calculate(
+        start='datum.total ? 0 : datum.cumulative - datum.amount',
+        end='datum.total ? datum.amount : datum.cumulative',
     )
 
-    # The "rule" chart is for the horizontal lines that connect the bars
-    rule = base_chart.mark_rule(xOffset=-22.5, x2Offset=22.5).encode(
-        y="window_sum_amount:Q",
-        x2="calc_lead",
+    x = alt.X(
+        'label:N',
+        sort=alt.EncodingSortField('order'),
+        axis=alt.Axis(title=None, labelAngle=0),
+    )
+    # slider 조합이 범위 제약을 벗어나면 회색으로 표시
+    color = alt.condition('datum.feasible', alt.value(COLORS[n]), alt.value('#d0d0d0'))
+    bar = waterfall.mark_bar(size=24).encode(
+        x=x,
+        color=color,
+        y=alt.Y('start:Q', title='Exergy [kW]'),
+        y2='end:Q',
+        tooltip=[alt.Tooltip('label:N'), alt.Tooltip('amount:Q', format='.3f')],
+    )
+    rule = waterfall.mark_rule(
+        xOffset=-12, x2Offset=12, color='#b0b0b0', strokeWidth=0.5,
+    ).encode(
+        x=x,
+        x2='next:N',
+        y='end:Q',
+    ).transform_filter('isValid(datum.next)')
+    # 합계 막대는 위, 손실 막대는 아래에 값 표시
+    text_total = waterfall.mark_text(baseline='bottom', dy=-2).encode(
+        x=x,
+        y='end:Q',
+        text=alt.Text('amount:Q', format='.2f'),
+    ).transform_filter('datum.total')
+    text_loss = waterfall.mark_text(baseline='top', dy=2).encode(
+        x=x,
+        y='end:Q',
+        text=alt.Text('amount:Q', format='.2f'),
+    ).transform_filter('!datum.total')
+    waterfall_chart = alt.layer(bar, rule, text_total, text_loss).properties(
+        width=width,
+        height=height,
+        title=name,
     )
 
-    # Add values as text
-    text_pos_values_top_of_bar = base_chart.mark_text(baseline="bottom", dy=-4).encode(
-        text=alt.Text("calc_sum_inc:N"),
-        y="calc_sum_inc:Q",
+    # 효율은 한 행이면 충분하다.
+    eff = alt.Chart().transform_filter(alt.datum.order == 0).transform_calculate(
+        efficiency=f'datum.{efficiency}',
     )
-    text_neg_values_bot_of_bar = base_chart.mark_text(baseline="top", dy=4).encode(
-        text=alt.Text("calc_sum_dec:N"),
-        y="calc_sum_dec:Q",
+    eff_chart = alt.layer(
+        eff.mark_bar().encode(
+            x=alt.X('efficiency:Q', title='Exergy efficiency [%]', scale=alt.Scale(domain=[0, 100])),
+            color=color,
+        ),
+        eff.mark_text(align='left', dx=3).encode(
+            x='efficiency:Q',
+            text=alt.Text('efficiency:Q', format='.2f'),
+        ),
+    ).properties(width=width, height=30)
+
+    # transform_calculate/add_params는 호출마다 차트 전체를 복사하므로 생성자에 한 번에 넘긴다.
+    return alt.vconcat(
+        waterfall_chart,
+        eff_chart,
+        data=alt.Data(values=rows),
+        transform=[
+            alt.CalculateTransform(calculate=expression, **{'as': field})
+            for field, expression in [
+                *compile_cooling(system_type),
+                ('feasible', compile_constraints(system_type)),
+            ]
+        ],
+        params=[slider.param for slider in sliders],
     )
-    text_bar_values_mid_of_bar = base_chart.mark_text(baseline="middle").encode(
-        text=alt.Text("calc_text_amount:N"),
-        y="calc_center:Q",
-        color=alt.value("white"),
+
+
+# multiview에 보내는 데이터 크기 상한
+MULTIVIEW_MAX_POINTS = 2000
+MULTIVIEW_HISTOGRAM_BINS = 30
+MULTIVIEW_SCATTER_BINS = 40
+
+
+def histogram_records(values, bins=MULTIVIEW_HISTOGRAM_BINS):
+    """
+    값의 히스토그램을 NumPy로 미리 계산한 레코드 리스트 (bin 수만큼).
+    """
+    values = np.asarray(values, dtype=float)
+    values = values[np.isfinite(values)]
+    counts, edges = np.histogram(values, bins=bins)
+    return [
+        {'start': float(start), 'end': float(end), 'count': int(count)}
+        for start, end, count in zip(edges[:-1], edges[1:], counts)
+    ]
+
+
+def scatter_records(x, y, max_points=MULTIVIEW_MAX_POINTS, bins=MULTIVIEW_SCATTER_BINS):
+    """
+    산점도 데이터. 점이 max_points 이하이면 그대로, 넘으면 2차원 격자로 묶은
+    셀(비어 있지 않은 셀만)을 반환한다. 어느 쪽이든 레코드 수는 점의 수와 무관하게
+    max(max_points, bins²) 이하이다.
+
+    Returns:
+    - ('points', [{'x', 'y'}], None) 또는
+      ('bins', [{'i', 'j', 'count'}], (x_edges, y_edges)). 셀의 좌표는 격자
+      인덱스로만 보내고 브라우저에서 edges로 계산한다.
+    """
+    x = np.asarray(x, dtype=float)
+    y = np.asarray(y, dtype=float)
+    finite = np.isfinite(x) & np.isfinite(y)
+    x = x[finite]
+    y = y[finite]
+
+    if len(x) <= max_points:
+        return 'points', [
+            {'x': a, 'y': b} for a, b in zip(x.tolist(), y.tolist())
+        ], None
+
+    counts, x_edges, y_edges = np.histogram2d(x, y, bins=bins)
+    i, j = np.nonzero(counts)
+    records = [
+        {'i': a, 'j': b, 'count': c}
+        for a, b, c in zip(i.tolist(), j.tolist(), counts[i, j].astype(int).tolist())
+    ]
+    return 'bins', records, (x_edges, y_edges)
+
+
+def create_dynamic_multiview(
+    dataframes,
+    cols=2,
+    max_points=MULTIVIEW_MAX_POINTS,
+    bins=MULTIVIEW_HISTOGRAM_BINS,
+    scatter_bins=MULTIVIEW_SCATTER_BINS,
+):
+    """
+    다양한 길이의 데이터프레임 리스트로부터 동적 다중 뷰 플롯 생성
+
+    데이터프레임을 그대로 spec에 넣지 않고 NumPy로 집계한 결과만 보낸다.
+    (집계 결과는 작은 DataFrame으로 넘겨 레코드별 schema 검증을 피한다.)
+    히스토그램은 bin별 개수, 산점도는 max_points를 넘으면 2차원 bin별 개수를
+    보내므로 spec 크기가 행 수와 무관하게 제한된다.
+
+    Parameters:
+    - dataframes: 차트로 만들 데이터프레임 리스트
+    - cols: 열의 개수 (기본값 2)
+    - max_points: 산점도를 점으로 그릴 최대 점의 수
+    - bins: 히스토그램 bin 수
+    - scatter_bins: 산점도를 묶을 때 축별 bin 수
+    """
+    import altair as alt
+    import pandas as pd
+
+    colors = COLORS
+
+    # 각 데이터프레임에 대한 기본 차트 생성 함수
+    def create_base_chart(df, title, n):
+        # 데이터프레임의 숫자형 컬럼 찾기
+        numeric_cols = df.select_dtypes(include=[np.number]).columns
+
+        if len(numeric_cols) == 1:
+            # 단일 숫자 컬럼인 경우 히스토그램
+            column = numeric_cols[0]
+            data = pd.DataFrame(histogram_records(df[column].to_numpy(), bins=bins))
+            chart = alt.Chart(data).mark_bar(color=colors[n]).encode(
+                alt.X('start:Q', title=column, bin='binned'),
+                alt.X2('end:Q'),
+                alt.Y('count:Q', title='Count'),
+            )
+        elif len(numeric_cols) >= 2:
+            # 두 개 이상의 숫자 컬럼인 경우 산점도
+            x_col, y_col = numeric_cols[:2]
+            kind, records, edges = scatter_records(
+                df[x_col].to_numpy(),
+                df[y_col].to_numpy(),
+                max_points=max_points,
+                bins=scatter_bins,
+            )
+            if kind == 'points':
+                chart = alt.Chart(pd.DataFrame(records, columns=['x', 'y'])).mark_circle(color=colors[n]).encode(
+                    x=alt.X('x:Q', title=x_col),
+                    y=alt.Y('y:Q', title=y_col),
+                )
+            else:
+                # 점이 많으면 2차원 bin의 개수를 투명도로 표시 (격자는 등간격)
+                x_edges, y_edges = edges
+                x0, dx = float(x_edges[0]), float(x_edges[1] - x_edges[0])
+                y0, dy = float(y_edges[0]), float(y_edges[1] - y_edges[0])
+                chart = alt.Chart(pd.DataFrame(records, columns=['i', 'j', 'count'])).transform_calculate(
+                    x_start=f'{x0!r} + datum.i * {dx!r}',
+                    x_end=f'{x0!r} + (datum.i + 1) * {dx!r}',
+                    y_start=f'{y0!r} + datum.j * {dy!r}',
+                    y_end=f'{y0!r} + (datum.j + 1) * {dy!r}',
+                ).mark_rect(color=colors[n]).encode(
+                    x=alt.X('x_start:Q', title=x_col),
+                    x2='x_end:Q',
+                    y=alt.Y('y_start:Q', title=y_col),
+                    y2='y_end:Q',
+                    opacity=alt.Opacity('count:Q', legend=None, scale=alt.Scale(range=[0.2, 1])),
+                    tooltip=[alt.Tooltip('count:Q')],
+                )
+        else:
+            # 숫자 컬럼이 없는 경우 막대 그래프
+            categorical_cols = df.select_dtypes(include=['object', 'category']).columns
+            if len(categorical_cols) > 0:
+                column = categorical_cols[0]
+                counts = df[column].value_counts(sort=False)
+                data = pd.DataFrame({
+                    'category': counts.index.astype(str),
+                    'count': counts.to_numpy(),
+                })
+                chart = alt.Chart(data).mark_bar(color=colors[n]).encode(
+                    x=alt.X('category:N', title=column),
+                    y=alt.Y('count:Q', title='Count'),
+                )
+            else:
+                raise ValueError("플롯할 적절한 컬럼이 없습니다.")
+
+        return chart.properties(
+            title=title,
+            width=250,
+            height=200
+        )
+
+    # 동적으로 차트 리스트 생성
+    charts = [
+        create_base_chart(df, df['system'].iloc[0], i)
+        for i, df in enumerate(dataframes)
+    ]
+
+    # 열 수에 맞춰 동적으로 레이아웃 생성
+    def chunk_charts(lst, chunk_size):
+        for i in range(0, len(lst), chunk_size):
+            yield lst[i:i + chunk_size]
+
+    # 차트들을 chunk로 나누어 수평/수직 결합
+    chart_rows = [
+        alt.hconcat(*row_charts)
+        for row_charts in chunk_charts(charts, cols)
+    ]
+
+    # 최종 수직 결합
+    return alt.vconcat(*chart_rows)
+
+
+def plot_efficiency_uncertainty(results, bins=MULTIVIEW_HISTOGRAM_BINS, height=None):
+    """
+    시스템별 효율 분포의 백분위 band와 히스토그램.
+
+    Parameters:
+    - results: (시스템 이름, 효율 항 이름, propagate_cooling의 결과) 리스트.
+      순서는 효율 막대 차트와 같게 한다.
+    - bins: 히스토그램 bin 수
+    - height: band 차트의 높이. 기본값은 효율 막대 차트와 같다.
+
+    band는 5-95 백분위(선), 25-75 백분위(막대), 중앙값(tick)으로 그린다.
+    표본은 NumPy로 집계하여 bin별 밀도만 보낸다.
+
+    Returns:
+    - alt.VConcatChart. 범위 제약을 만족한 표본이 있는 시스템이 없으면 None.
+    """
+    import altair as alt
+    import pandas as pd
+
+    bands = []
+    histograms = []
+    for name, efficiency, result in results:
+        summary = result['summary'][efficiency]
+        values = result['samples'][efficiency]
+        values = values[np.isfinite(values)]
+        if summary is None or not len(values):
+            continue
+        bands.append({'system': name, 'feasible': result['feasible'], **summary})
+
+        density, edges = np.histogram(values, bins=bins, density=True)
+        histograms.append(pd.DataFrame({
+            'system': name,
+            'efficiency': (edges[:-1] + edges[1:]) / 2,
+            'density': density,
+        }))
+
+    if not bands:
+        return None
+
+    bands = pd.DataFrame(bands)
+    names = bands['system'].tolist()
+    height = len(names) * 60 + 50 if height is None else height
+    y = alt.Y('system:N', sort=names, title=None).axis(labelFontSize=18, labelColor='black')
+    color = alt.Color('system:N', sort=names, legend=None)
+
+    base = alt.Chart(bands).encode(y=y)
+    band = alt.layer(
+        base.mark_rule(strokeWidth=2).encode(
+            x=alt.X('p5:Q', title='Exergy Efficiency [%]').scale(zero=False),
+            x2='p95:Q',
+            color=color,
+        ),
+        base.mark_bar(size=20, opacity=0.6).encode(x='p25:Q', x2='p75:Q', color=color),
+        base.mark_tick(size=30, thickness=3, color='black').encode(
+            x='p50:Q',
+            tooltip=[
+                'system',
+                alt.Tooltip('mean:Q', format='.2f'),
+                alt.Tooltip('std:Q', format='.2f'),
+                alt.Tooltip('p5:Q', format='.2f'),
+                alt.Tooltip('p50:Q', format='.2f'),
+                alt.Tooltip('p95:Q', format='.2f'),
+                alt.Tooltip('feasible:Q', format='.1%'),
+            ],
+        ),
+    ).properties(width='container', height=height)
+
+    distribution = alt.Chart(pd.concat(histograms)).mark_area(
+        opacity=0.4, interpolate='step',
+    ).encode(
+        x=alt.X('efficiency:Q', title='Exergy Efficiency [%]').scale(zero=False),
+        y=alt.Y('density:Q', title='Density').stack(None),
+        color=color,
+    ).properties(width='container', height=160)
+
+    return alt.vconcat(band, distribution)
+
+
+def plot_sobol_indices(result, output, width=None, height=None):
+    """
+    한 출력 항의 1차/전체 Sobol 지수 tornado 차트 (전체 지수가 큰 순서).
+
+    Parameters:
+    - result: sobol_indices의 결과
+    - output: 항 이름 (예: 'eff_A')
+    """
+    import altair as alt
+    import pandas as pd
+
+    indices = result['indices'][output]
+    records = []
+    for name, first, total in zip(result['parameters'], indices['first'], indices['total']):
+        low, high = result['bounds'][name]
+        records.append({
+            'parameter': name,
+            'range': f'{low:.4g} – {high:.4g}',
+            'Total': float(total),
+            'First-order': float(first),
+        })
+
+    data = pd.DataFrame(records).sort_values('Total', ascending=False)
+    order = data['parameter'].tolist()
+    data = data.melt(
+        id_vars=['parameter', 'range'],
+        value_vars=['Total', 'First-order'],
+        var_name='index',
+        value_name='value',
     )
 
-    return alt.layer(
-        bar,
-        rule,
-        text_pos_values_top_of_bar,
-        text_neg_values_bot_of_bar,
-        text_bar_values_mid_of_bar
+    return alt.Chart(data).mark_bar().encode(
+        y=alt.Y('parameter:N', sort=order, title=None).axis(labelFontSize=14),
+        yOffset=alt.YOffset('index:N', sort=['Total', 'First-order']),
+        x=alt.X('value:Q', title=f'Sobol index of {output}').scale(domain=[0, 1], clamp=True),
+        color=alt.Color(
+            'index:N',
+            sort=['Total', 'First-order'],
+            scale=alt.Scale(range=[COLORS[0], COLORS[1]]),
+            legend=alt.Legend(title=None, orient='bottom'),
+        ),
+        tooltip=[
+            'parameter', 'range', 'index',
+            alt.Tooltip('value:Q', format='.3f'),
+        ],
     ).properties(
-        width=600,
-        height=450
-    )
\ No newline at end of file
+        width='container' if width is None else width,
+        height=len(order) * 28 if height is None else height,
+    )
@@ -0,0 +1,252 @@
+import os
+import sys
+import time
+import tempfile
+import argparse
+
+import numpy as np
+import pandas as pd
+import pyarrow as pa
+import pyarrow.csv as pa_csv
+import pyarrow.parquet as pq
+
+from exergy_dashboard.system import SYSTEM_CASE
+from exergy_dashboard.evaluation import evaluate_cooling, evaluate_cooling_feasible
+
+
+DEFAULT_CHUNK_SIZE = 100_000
+
+# 모든 냉방 시스템의 파라미터 이름. chunk마다 정수/실수 추론이 달라지지 않도록 float로 읽는다.
+PARAMETER_NAMES = list(dict.fromkeys(
+    name for case in SYSTEM_CASE['COOLING'].values() for name in case['parameters']
+))
+
+
+def read_chunks(path, chunk_size):
+    """
+    시나리오 파일(CSV 또는 Parquet)을 chunk_size 행의 DataFrame으로 나누어 읽는다.
+    """
+    if path.endswith(('.parquet', '.pq')):
+        for batch in pq.ParquetFile(path).iter_batches(batch_size=chunk_size):
+            yield _float_parameters(batch.to_pandas())
+    elif path.endswith(('.csv', '.csv.gz')):
+        for df in pd.read_csv(path, chunksize=chunk_size):
+            yield _float_parameters(df)
+    else:
+        raise ValueError(f'Unsupported scenario file: {path!r} (expected CSV or Parquet).')
+
+
+def read_columns(path):
+    """
+    시나리오 파일의 컬럼 이름 (데이터는 읽지 않는다).
+    """
+    if path.endswith(('.parquet', '.pq')):
+        return pq.ParquetFile(path).schema_arrow.names
+    if path.endswith(('.csv', '.csv.gz')):
+        return pd.read_csv(path, nrows=0).columns.tolist()
+    raise ValueError(f'Unsupported scenario file: {path!r} (expected CSV or Parquet).')
+
+
+def _float_parameters(df):
+    return df.astype({name: float for name in PARAMETER_NAMES if name in df})
+
+
+class ResultWriter:
+    """
+    결과를 chunk 단위로 CSV 또는 Parquet 파일에 이어서 쓴다.
+
+    같은 디렉터리의 임시 파일에 쓰고 close에서 path로 교체하므로, 중간에 실패하면
+    (abort) 잘린 결과 파일이 남지 않는다.
+    """
+
+    def __init__(self, path):
+        if path.endswith(('.parquet', '.pq')):
+            self._writer_class = pq.ParquetWriter
+        elif path.endswith('.csv'):
+            self._writer_class = pa_csv.CSVWriter
+        else:
+            raise ValueError(f'Unsupported output file: {path!r} (expected CSV or Parquet).')
+
+        self.path = path
+        self._temp = None
+        self._writer = None
+        self._schema = None
+
+    def write(self, df):
+        table = pa.Table.from_pandas(df, preserve_index=False)
+        if self._writer is None:
+            self._schema = table.schema
+            directory = os.path.dirname(os.path.abspath(self.path))
+            fd, self._temp = tempfile.mkstemp(
+                suffix=os.path.splitext(self.path)[1], dir=directory,
+            )
+            os.close(fd)
+            self._writer = self._writer_class(self._temp, self._schema)
+        self._writer.write_table(table.cast(self._schema))
+
+    def close(self):
+        if self._writer is not None:
+            self._writer.close()
+            os.replace(self._temp, self.path)
+            self._writer = None
+
+    def abort(self):
+        if self._writer is not None:
+            self._writer.close()
+            os.remove(self._temp)
+            self._writer = None
+
+
+def output_names(system_types):
+    """
+    주어진 시스템 종류들의 결과 컬럼 이름 (순서 유지, 중복 제거).
+    """
+    names = {}
+    for system_type in system_types:
+        parameters = SYSTEM_CASE['COOLING'][system_type]['parameters']
+        defaults = {k: v['default'] for k, v in parameters.items()}
+        names.update(dict.fromkeys(evaluate_cooling(system_type, defaults)))
+
+    return list(names)
+
+
+def evaluate_chunk(df, system_type=None, type_column='type', outputs=(), mask_infeasible=True):
+    """
+    시나리오 DataFrame 하나를 평가. 행마다 type_column으로 시스템 종류를 구분하고,
+    없는 파라미터는 기본값을 사용한다.
+
+    mask_infeasible이면 파라미터 범위 제약을 벗어난 행은 평가하지 않고 결과를 NaN으로
+    두며, 'feasible' 컬럼을 추가한다.
+    """
+    n = len(df)
+    if system_type is not None:
+        types = np.full(n, system_type, dtype=object)
+    else:
+        types = df[type_column].to_numpy()
+
+    columns = {name: np.full(n, np.nan) for name in outputs}
+    if mask_infeasible:
+        columns['feasible'] = np.zeros(n, dtype=bool)
+        evaluate = evaluate_cooling_feasible
+    else:
+        evaluate = evaluate_cooling
+
+    for t in pd.unique(types):
+        if t not in SYSTEM_CASE['COOLING']:
+            raise ValueError(f'Unknown cooling system type: {t!r}')
+
+        mask = types == t
+        rows = df[mask]
+        params = {
+            name: rows[name].to_numpy() if name in rows else spec['default']
+            for name, spec in SYSTEM_CASE['COOLING'][t]['parameters'].items()
+        }
+        for name, values in evaluate(t, params).items():
+            columns[name][mask] = values
+
+    return pd.concat(
+        [df.reset_index(drop=True), pd.DataFrame(columns)], axis=1,
+    )
+
+
+def run_eval(args):
+    if args.type is None and args.type_column not in read_columns(args.scenarios):
+        raise ValueError(
+            f'Scenario file has no {args.type_column!r} column; '
+            'pass --type to use one system type for every row.'
+        )
+
+    system_types = [args.type] if args.type else list(SYSTEM_CASE['COOLING'])
+    outputs = output_names(system_types)
+    writer = ResultWriter(args.output)
+
+    rows = 0
+    infeasible = 0
+    start = time.perf_counter()
+    try:
+        for df in read_chunks(args.scenarios, args.chunk_size):
+            result = evaluate_chunk(
+                df,
+                system_type=args.type,
+                type_column=args.type_column,
+                outputs=outputs,
+                mask_infeasible=not args.keep_infeasible,
+            )
+            writer.write(result)
+            rows += len(df)
+            if not args.keep_infeasible:
+                infeasible += int((~result['feasible']).sum())
+            elapsed = time.perf_counter() - start
+            if not args.quiet:
+                print(
+                    f'{rows:,} rows ({rows / elapsed:,.0f} rows/s)',
+                    file=sys.stderr,
+                )
+    except BaseException:
+        writer.abort()
+        raise
+    writer.close()
+
+    elapsed = time.perf_counter() - start
+    print(
+        f'Evaluated {rows:,} rows in {elapsed:.2f} s '
+        f'({rows / elapsed if elapsed > 0 else 0:,.0f} rows/s) -> {args.output}',
+        file=sys.stderr,
+    )
+    if infeasible:
+        print(
+            f'{infeasible:,} rows violate the parameter ranges and were left as NaN.',
+            file=sys.stderr,
+        )
+
+
+def build_parser():
+    parser = argparse.ArgumentParser(
+        prog='exergy-dashboard',
+        description='Exergy analysis tools without the Streamlit dashboard.',
+    )
+    subparsers = parser.add_subparsers(dest='command', required=True)
+
+    parser_eval = subparsers.add_parser(
+        'eval', help='Evaluate cooling scenarios from a CSV/Parquet file.',
+    )
+    parser_eval.add_argument('scenarios', help='Scenario file (.csv or .parquet).')
+    parser_eval.add_argument(
+        '-o', '--output', required=True,
+        help='Result file (.csv or .parquet), written incrementally.',
+    )
+    parser_eval.add_argument(
+        '--type', choices=list(SYSTEM_CASE['COOLING']),
+        help='System type for every row. By default it is read from --type-column.',
+    )
+    parser_eval.add_argument(
+        '--type-column', default='type',
+        help='Column holding the system type of each row (default: type).',
+    )
+    parser_eval.add_argument(
+        '--chunk-size', type=int, default=DEFAULT_CHUNK_SIZE,
+        help=f'Rows evaluated per chunk (default: {DEFAULT_CHUNK_SIZE}).',
+    )
+    parser_eval.add_argument(
+        '--keep-infeasible', action='store_true',
+        help='Evaluate rows that violate the parameter ranges instead of masking them.',
+    )
+    parser_eval.add_argument(
+        '-q', '--quiet', action='store_true', help='Only print the final summary.',
+    )
+    parser_eval.set_defaults(func=run_eval)
+
+    return parser
+
+
+def main(argv=None):
+    parser = build_parser()
+    args = parser.parse_args(argv)
+    try:
+        args.func(args)
+    except ValueError as e:
+        parser.error(str(e))
+
+
+if __name__ == '__main__':
+    main()
@@ -1,151 +1,223 @@
-import math
-import copy
-import streamlit as st
-
-
-c_a	 = 1.005
-rho_a =	1.2
-
-
-def evaluate_parameters_cooling(sss, system_name):
-    # Extract all inputs.
-    params = {}
-    for key, value in sss.items():
-        if not key.startswith(system_name + ':'):
-            continue
-
-        key = key.split(':')[1]
-        if key.startswith('T_'):
+import numpy as np
+
+from exergy_dashboard.system import SYSTEM_CASE
+from exergy_dashboard.model import IncrementalEvaluator
+
+
+def _prepare_inputs(system_type, params, mode='COOLING'):
+    """
+    파라미터 컬럼(스칼라, 배열, DataFrame)을 동일한 shape의 float 배열로 변환.
+    온도(T_*)는 ℃에서 K로 변환한다.
+    """
+    names = SYSTEM_CASE[mode][system_type]['parameters'].keys()
+    columns = []
+    for name in names:
+        value = np.asarray(params[name], dtype=float)
+        if name.startswith('T_'):
             value = value + 273.15
-        params[key] = value
-
-    # Evaluate parameters.
-    if sss.systems[system_name]['type'] == 'ASHP':        
-        T_0 = params['T_0']
-        k = params['k']
-        T_r_int_A = params['T_r_int_A']
-        T_r_ext_A = params['T_r_ext_A']
-        Q_r_int_A = params['Q_r_int_A']
-        T_a_int_in = params['T_a_int_in']
-        T_a_int_out = params['T_a_int_out']
-        T_a_ext_out = params['T_a_ext_out']
-        E_f_int = params['E_f_int']
-        E_f_ext = params['E_f_ext']
-
-        # Outdoor air
-        T_a_ext_in = T_0
-
-        # System COP
-        cop_A = k * T_r_int_A / (T_r_ext_A - T_r_int_A)
-
-        # System capacity - ASHP
-        E_cmp_A = Q_r_int_A / cop_A    # kW, 압축기 전력
-        Q_r_ext_A = Q_r_int_A + E_cmp_A    # kW, 실외기 배출열량
-
-        # Air & Cooling water parameters
-        V_int = Q_r_int_A / (c_a * rho_a * (T_a_int_in - T_a_int_out))
-        V_ext = Q_r_ext_A / (c_a * rho_a * (T_a_ext_out - T_a_ext_in))
-        m_int = V_int * rho_a
-        m_ext = V_ext * rho_a
-
-        ## Internal unit with evaporator
-        X_r_int_A = - Q_r_int_A * (1 - T_0 / T_r_int_A) # 냉매에서 실내 공기에 전달한 엑서지
-        X_a_int_out_A = c_a * m_int * ((T_a_int_out - T_0) - T_0 * math.log(T_a_int_out / T_0)) # 실외기 취출 공기 엑서지 
-        X_a_int_in_A = c_a * m_int * ((T_a_int_in - T_0) - T_0 * math.log(T_a_int_in / T_0)) # 실외기 흡기 공기 엑서지
-
-        Xin_int_A = E_f_int + X_r_int_A # 엑서지 인풋 (팬 투입 전력 + 냉매에서 실내 공기에 전달한 엑서지)
-        Xout_int_A = X_a_int_out_A - X_a_int_in_A # 엑서지 아웃풋
-        Xc_int_A = Xin_int_A - Xout_int_A # 엑서지 소비율
-
-        ## Closed refrigerant loop system  
-        X_r_ext_A = Q_r_ext_A * (1 - T_0 / T_r_ext_A) # 냉매에서 실외 공기에 전달한 엑서지
-        X_r_int_A = - Q_r_int_A * (1 - T_0 / T_r_int_A) # 냉매에서 실내 공기에 전달한 엑서지
-
-        Xin_r_A = E_cmp_A # 엑서지 인풋 (컴프레서 투입 전력)
-        Xout_r_A = X_r_ext_A + X_r_int_A # 엑서지 아웃풋
-        Xc_r_A = Xin_r_A - Xout_r_A # 엑서지 소비율
-
-        ## External unit with condenser
-        X_r_ext_A = Q_r_ext_A * (1 - T_0 / T_r_ext_A) # 냉매에서 실외 공기에 전달한 엑서지
-        X_a_ext_out_A = c_a * m_ext * ((T_a_ext_out - T_0) - T_0 * math.log(T_a_ext_out / T_0)) # 실외기 취출 공기 엑서지
-        X_a_ext_in_A = c_a * m_ext * ((T_a_ext_in - T_0) - T_0 * math.log(T_a_ext_in / T_0)) # 실외기 흡기 공기 엑서지 (외기)
-
-        Xin_ext_A = E_f_ext + X_r_ext_A # 엑서지 인풋 (팬 투입 전력 + 냉매에서 실외 공기에 전달한 엑서지)
-        Xout_ext_A = X_a_ext_out_A - X_a_ext_in_A # 엑서지 아웃풋
-        Xc_ext_A = Xin_ext_A - Xout_ext_A # 엑서지 소비율
-
-        ## Total
-        Xin_A = E_cmp_A + E_f_int + E_f_ext # 총 엑서지 인풋 (컴프레서 + 실내팬 + 실외팬 전력)
-        Xout_A = X_a_int_out_A - X_a_int_in_A # 총 엑서지 아웃풋
-        Xc_A = Xin_A - Xout_A # 총 엑서지 소비율
-    elif sss.systems[system_name]['type'] == 'GSHP':
-        T_0 = params['T_0']
-        T_r_int_G = params['T_r_int_G']
-        T_r_ext_G = params['T_r_ext_G']
-        Q_r_int_G = params['Q_r_int_G']
-        E_pmp_G = params['E_pmp_G'] 
-        T_g = params['T_g']
-        k = params['k']
-        T_a_int_in = params['T_a_int_in']
-        T_a_int_out = params['T_a_int_out']
-        E_f_int = params['E_f_int']
-        # T_a_ext_in = params['T_a_ext_in']
-        # T_a_ext_out = params['T_a_ext_out']
-
-        # Outdoor air
-        T_ext_in = T_0
-
-        # System COP
-        cop_G = k * T_r_int_G / (T_r_ext_G - T_r_int_G)
-
-        # System capacity - GSHP
-        E_cmp_G = Q_r_int_G / cop_G    # kW, 압축기 전력
-        Q_r_ext_G = Q_r_int_G + E_cmp_G    # kW, 실외기 배출열량
-        Q_g = Q_r_ext_G + E_pmp_G    # kW, 토양 열교환량
-
-        # # Air & Cooling water parameters
-        V_int = Q_r_int_G / (c_a * rho_a * (T_a_int_in - T_a_int_out))
-        # V_ext = Q_r_ext_G / (c_a * rho_a * (T_a_ext_out - T_a_ext_in))
-        m_int = V_int * rho_a
-        # m_ext = V_ext * rho_a
-
-        ## Internal unit with evaporator
-        X_r_int_G = - Q_r_int_G * (1 - T_0 / T_r_int_G) # 냉매에서 실내 공기에 전달한 엑서지
-        X_a_int_out_G = c_a * m_int * ((T_a_int_out - T_0) - T_0 * math.log(T_a_int_out / T_0)) # 실외기 취출 공기 엑서지
-        X_a_int_in_G = c_a * m_int * ((T_a_int_in - T_0) - T_0 * math.log(T_a_int_in / T_0)) # 실외기 흡기 공기 엑서지
-
-        Xin_int_G = E_f_int + X_r_int_G # 엑서지 인풋 (팬 투입 전력 + 냉매에서 실내 공기에 전달한 엑서지)
-        Xout_int_G = X_a_int_out_G - X_a_int_in_G # 엑서지 아웃풋
-        Xc_int_G = Xin_int_G - Xout_int_G # 엑서지 소비율
-
-        ## Closed refrigerant loop system
-        X_r_ext_G = - Q_r_ext_G * (1 - T_0 / T_r_ext_G) # 냉매에서 실외기측에 전달한 엑서지
-        X_r_int_G = - Q_r_int_G * (1 - T_0 / T_r_int_G) # 냉매에서 실내 공기에 전달한 엑서지
-
-        Xin_r_G = E_cmp_G + X_r_ext_G # 엑서지 인풋 (컴프레서 투입 전력 + 냉매에서 실외기측에 전달한 엑서지)
-        Xout_r_G = X_r_int_G # 엑서지 아웃풋
-        Xc_r_G = Xin_r_G - Xout_r_G # 엑서지 소비율
-
-        ## Circulating water in GHE
-        X_g = - Q_g * (1 - T_0 / T_g) # 땅에서 추출한 엑서지
-        X_r_ext_G = - Q_r_ext_G * (1 - T_0 / T_r_ext_G) # 냉매에서 실내 공기에 전달한 엑서지
-
-        Xin_ext_G = E_pmp_G + X_g # 엑서지 인풋 (펌프 투입 전력 + 땅에서 추출한 엑서지)
-        Xout_ext_G = X_r_ext_G # 엑서지 아웃풋
-        Xc_GHE = Xin_ext_G - Xout_ext_G # 엑서지 소비율
-
-        ## Total
-        Xin_G = E_cmp_G + E_f_int + E_pmp_G + X_g # 총 엑서지 인풋 (컴프레서 + 실내팬 + 펌프 전력 + 땅에서 추출한 엑서지)
-        Xout_G = X_a_int_out_G - X_a_int_in_G # 총 엑서지 아웃풋
-        Xc_G = Xin_G - Xout_G # 총 엑서지 소비율
-
-    sss.systems[system_name]['variables'] = {
-        k: v for k, v in locals().items()
-        if k not in ('sss', 'system_name', 'params', 'key', 'value')
-    }
-
-    return {
-        k: v for k, v in locals().items()
-        if k not in ('sss', 'system_name', 'params', 'key', 'value')
+        columns.append(value)
+
+    return dict(zip(names, np.broadcast_arrays(*columns)))
+
+
+# 시스템 종류 -> 수식 그래프 (system.py의 SYSTEM_CASE에 정의)
+COOLING_MODELS = {
+    system_type: case['model']
+    for system_type, case in SYSTEM_CASE['COOLING'].items()
+}
+
+# evaluate_cooling_jacobian에서 한 번에 미분할 행 수
+JACOBIAN_CHUNK_SIZE = 8192
+
+# 시스템별 주요 엑서지 항 이름
+COOLING_TERMS = {
+    'ASHP': {
+        'load': 'Q_r_int_A',
+        'input': 'Xin_A',
+        'output': 'Xout_A',
+        'efficiency': 'eff_A',
+        'destruction': ('Xc_int_A', 'Xc_r_A', 'Xc_ext_A'),
+    },
+    'GSHP': {
+        'load': 'Q_r_int_G',
+        'input': 'Xin_G',
+        'output': 'Xout_G',
+        'efficiency': 'eff_G',
+        'destruction': ('Xc_int_G', 'Xc_r_G', 'Xc_GHE'),
+    },
+}
+
+
+def evaluate_cooling(system_type, params, evaluator=None):
+    """
+    Streamlit 세션과 무관한 냉방 모델 평가 API.
+
+    Parameters:
+    - system_type: 'ASHP' 또는 'GSHP'
+    - params: 파라미터 이름 -> 값(스칼라 또는 배열)의 매핑. DataFrame도 가능.
+      온도는 ℃ 단위.
+    - evaluator: IncrementalEvaluator. 주어지면 바뀐 입력의 하위 항만 다시 계산한다.
+
+    Returns:
+    - 모든 중간/최종 엑서지 항의 이름 -> numpy 배열 dict
+    """
+    try:
+        model = COOLING_MODELS[system_type]
+    except KeyError:
+        raise ValueError(f'Unknown cooling system type: {system_type!r}') from None
+
+    inputs = _prepare_inputs(system_type, params)
+    with np.errstate(divide='ignore', invalid='ignore'):
+        if evaluator is None:
+            values = model.evaluate(inputs)
+        else:
+            values = evaluator.update(inputs)
+
+    return {name: values[name] for name in model.order}
+
+
+def jacobian_outputs(system_type):
+    """
+    기본 미분 대상: 입력/출력 엑서지, 구성요소별 엑서지 소비, 효율.
+    """
+    terms = COOLING_TERMS[system_type]
+    return (terms['input'], terms['output'], *terms['destruction'], terms['efficiency'])
+
+
+def evaluate_cooling_jacobian(
+    system_type, params, outputs=None, wrt=None, chunk_size=JACOBIAN_CHUNK_SIZE,
+):
+    """
+    evaluate_cooling과 함께 입력 파라미터에 대한 정확한 편미분을 반환.
+
+    forward-mode dual number로 모든 입력에 대한 편미분을 한 번의 평가에서 구한다
+    (EquationGraph.differentiate). 유한 차분과 달리 step 크기에 따른 오차가 없다.
+    온도는 ℃ 입력에 273.15를 더하기만 하므로 ℃에 대한 편미분과 K에 대한 편미분은 같다.
+
+    dual number는 모든 중간 항마다 (len(wrt), 행 수) gradient 배열을 가지므로 행을
+    chunk_size씩 나누어 평가한다. 중간 결과의 메모리는 chunk 하나 분량
+    (약 항의 수 * len(wrt) * chunk_size * 8 byte, 기본값에서 수십 MB)이고,
+    반환하는 jacobian은 len(outputs) * len(wrt) * 행 수 * 8 byte이다.
+
+    Parameters:
+    - params: evaluate_cooling과 같다.
+    - outputs: 미분할 항 이름. 기본값은 jacobian_outputs(system_type).
+    - wrt: 미분할 파라미터 이름. 기본값은 모든 파라미터.
+    - chunk_size: 한 번에 미분할 행 수
+
+    Returns:
+    - (result, jacobian). result는 evaluate_cooling의 결과이고, jacobian은
+      항 이름 -> 파라미터 이름 -> 편미분 배열 dict. 단위는 [항의 단위 / 파라미터의 단위].
+    """
+    try:
+        model = COOLING_MODELS[system_type]
+    except KeyError:
+        raise ValueError(f'Unknown cooling system type: {system_type!r}') from None
+
+    outputs = jacobian_outputs(system_type) if outputs is None else tuple(outputs)
+    wrt = model.parameters if wrt is None else tuple(wrt)
+
+    inputs = _prepare_inputs(system_type, params)
+    shape = np.shape(next(iter(inputs.values())))
+    size = int(np.prod(shape))
+    columns = {name: value.reshape(-1) for name, value in inputs.items()}
+
+    result = {name: np.empty(size) for name in model.order}
+    jacobian = {output: {name: np.empty(size) for name in wrt} for output in outputs}
+    with np.errstate(divide='ignore', invalid='ignore'):
+        for start in range(0, size, chunk_size):
+            stop = min(start + chunk_size, size)
+            values, gradients = model.differentiate(
+                {name: column[start:stop] for name, column in columns.items()}, wrt=wrt,
+            )
+            for name in model.order:
+                result[name][start:stop] = values[name]
+            for output in outputs:
+                for name, gradient in zip(wrt, gradients[output]):
+                    jacobian[output][name][start:stop] = gradient
+
+    result = {name: values.reshape(shape) for name, values in result.items()}
+    jacobian = {
+        output: {name: values.reshape(shape) for name, values in gradients.items()}
+        for output, gradients in jacobian.items()
     }
+    return result, jacobian
+
+
+def evaluate_cooling_feasible(system_type, params):
+    """
+    파라미터 범위 제약을 만족하는 행만 평가하는 evaluate_cooling.
+
+    범위를 벗어난 행은 계산하지 않고 결과를 NaN으로 채운다.
+
+    Returns:
+    - evaluate_cooling의 결과에 'feasible' (제약을 만족하는 행의 bool 배열)을 더한 dict
+    """
+    constraints = SYSTEM_CASE['COOLING'][system_type]['constraints']
+    names = SYSTEM_CASE['COOLING'][system_type]['parameters'].keys()
+    columns = dict(zip(names, np.broadcast_arrays(*(
+        np.asarray(params[name], dtype=float) for name in names
+    ))))
+
+    feasible = constraints.feasible(columns)
+    if feasible.all():
+        result = evaluate_cooling(system_type, columns)
+    else:
+        rows = evaluate_cooling(
+            system_type, {name: column[feasible] for name, column in columns.items()},
+        )
+        result = {}
+        for name, values in rows.items():
+            result[name] = np.full(feasible.shape, np.nan)
+            result[name][feasible] = values
+
+    result['feasible'] = feasible
+    return result
+
+
+def evaluate_parameters_cooling(sss, system_name, cache=None):
+    """
+    시스템의 입력을 sss.param_store(ParameterStore)에서 읽어 평가하고
+    결과를 시스템의 SystemRecord에 저장.
+
+    Parameters:
+    - sss: Streamlit session state
+    - system_name: 평가할 시스템 이름 (예: 'ASHP 1')
+    - cache: LRUCache. 주어지면 (시스템 종류, 파라미터 값) 키로 결과를 재사용한다.
+
+    캐시에 없는 경우에는 직전 평가 결과에서 시작하여 바뀐 입력의 하위 항만
+    다시 계산한다.
+    """
+    # Extract all inputs.
+    store = sss.param_store
+    store.sync(sss, system_name)
+    record = store.record(system_name)
+    params = store.as_dict(system_name)
 
+    # Evaluate parameters.
+    model = COOLING_MODELS[record.type]
+
+    def evaluate():
+        evaluator = IncrementalEvaluator(model)
+        if record.results is not None:
+            previous = dict(zip(params, record.evaluated))
+            evaluator.values = {
+                **_prepare_inputs(record.type, previous),
+                **dict(zip(model.order, record.results)),
+            }
+
+        result = evaluate_cooling(record.type, params, evaluator=evaluator)
+        results = np.array([result[name] for name in model.order], dtype=float)
+        results.flags.writeable = False
+        return results
+
+    if cache is None:
+        results = evaluate()
+    else:
+        key = (record.type, tuple(params.values()))
+        results = cache.get_or_compute(key, evaluate)
+
+    record.evaluated = record.values.copy()
+    record.results = results
+
+    return record.variables
@@ -0,0 +1,410 @@
+import ast
+import itertools
+
+import numpy as np
+
+
+FUNCTIONS = {
+    'log': np.log,
+    'exp': np.exp,
+    'sqrt': np.sqrt,
+}
+
+
+class Dual:
+    """
+    forward-mode 자동 미분용 dual number.
+
+    value는 값 배열, grad는 shape (입력의 수, *value.shape)의 편미분 배열이다.
+    모든 입력에 대한 편미분을 한 번의 평가로 함께 전파한다. Dual이 아닌 피연산자
+    (상수, 배열)는 미분이 0인 값으로 취급한다.
+    """
+
+    __slots__ = ('value', 'grad')
+    __array_ufunc__ = None  # ndarray 연산자가 Dual의 반사 연산자를 쓰도록 한다.
+
+    def __init__(self, value, grad):
+        self.value = value
+        self.grad = grad
+
+    def __repr__(self):
+        return f'Dual({self.value!r}, {self.grad!r})'
+
+    def __add__(self, other):
+        if isinstance(other, Dual):
+            return Dual(self.value + other.value, self.grad + other.grad)
+        return Dual(self.value + other, self.grad)
+
+    __radd__ = __add__
+
+    def __sub__(self, other):
+        if isinstance(other, Dual):
+            return Dual(self.value - other.value, self.grad - other.grad)
+        return Dual(self.value - other, self.grad)
+
+    def __rsub__(self, other):
+        return Dual(other - self.value, -self.grad)
+
+    def __mul__(self, other):
+        if isinstance(other, Dual):
+            return Dual(
+                self.value * other.value,
+                self.grad * other.value + other.grad * self.value,
+            )
+        return Dual(self.value * other, self.grad * other)
+
+    __rmul__ = __mul__
+
+    def __truediv__(self, other):
+        if isinstance(other, Dual):
+            value = self.value / other.value
+            return Dual(value, (self.grad - other.grad * value) / other.value)
+        return Dual(self.value / other, self.grad / other)
+
+    def __rtruediv__(self, other):
+        value = other / self.value
+        return Dual(value, -self.grad * value / self.value)
+
+    def __pow__(self, other):
+        if isinstance(other, Dual):
+            return dual_exp(other * dual_log(self))
+        return Dual(
+            self.value ** other,
+            self.grad * (other * self.value ** (other - 1)),
+        )
+
+    def __rpow__(self, other):
+        value = other ** self.value
+        return Dual(value, self.grad * (value * np.log(other)))
+
+    def __neg__(self):
+        return Dual(-self.value, -self.grad)
+
+    def __pos__(self):
+        return self
+
+
+def dual_log(x):
+    if isinstance(x, Dual):
+        return Dual(np.log(x.value), x.grad / x.value)
+    return np.log(x)
+
+
+def dual_exp(x):
+    if isinstance(x, Dual):
+        value = np.exp(x.value)
+        return Dual(value, x.grad * value)
+    return np.exp(x)
+
+
+def dual_sqrt(x):
+    if isinstance(x, Dual):
+        value = np.sqrt(x.value)
+        return Dual(value, x.grad / (2 * value))
+    return np.sqrt(x)
+
+
+# FUNCTIONS의 Dual 버전. EquationGraph.evaluate(functions=DUAL_FUNCTIONS)로 미분한다.
+DUAL_FUNCTIONS = {
+    'log': dual_log,
+    'exp': dual_exp,
+    'sqrt': dual_sqrt,
+}
+
+
+class Equation:
+    """
+    이름이 붙은 수식 하나. expression은 Python 산술식 문자열이다.
+    """
+
+    __slots__ = ('name', 'expression', 'tree', 'inputs', 'code')
+
+    def __init__(self, name, expression, reserved=()):
+        self.name = name
+        self.expression = expression
+        self.tree = ast.parse(expression, mode='eval')
+        self.inputs = tuple(dict.fromkeys(
+            node.id for node in ast.walk(self.tree)
+            if isinstance(node, ast.Name) and node.id not in reserved
+        ))
+        self.code = compile(self.tree, f'<{name}>', 'eval')
+
+    def __repr__(self):
+        return f'Equation({self.name!r}, {self.expression!r})'
+
+
+class EquationGraph:
+    """
+    파라미터와 수식으로 이루어진 의존성 그래프.
+
+    Parameters:
+    - parameters: 입력 파라미터 이름
+    - equations: 노드 이름 -> 수식 문자열. 수식은 파라미터, 상수, 다른 노드,
+      FUNCTIONS의 함수를 참조할 수 있다.
+    - constants: 상수 이름 -> 값
+    """
+
+    def __init__(self, parameters, equations, constants=None):
+        self.parameters = tuple(parameters)
+        self.constants = dict(constants or {})
+
+        reserved = set(FUNCTIONS) | set(self.constants)
+        self.equations = {
+            name: Equation(name, expression, reserved)
+            for name, expression in equations.items()
+        }
+
+        known = set(self.parameters) | set(self.equations)
+        for equation in self.equations.values():
+            unknown = [name for name in equation.inputs if name not in known]
+            if unknown:
+                raise ValueError(
+                    f'Equation {equation.name!r} refers to unknown names {unknown}.'
+                )
+
+        self.dependents = {name: [] for name in known}
+        for equation in self.equations.values():
+            for name in equation.inputs:
+                self.dependents[name].append(equation.name)
+
+        self.order = self._sort()
+
+    def _sort(self):
+        remaining = {
+            name: len(equation.inputs) - sum(
+                name_ in self.parameters for name_ in equation.inputs
+            )
+            for name, equation in self.equations.items()
+        }
+        ready = [name for name, count in remaining.items() if count == 0]
+        order = []
+        while ready:
+            name = ready.pop(0)
+            order.append(name)
+            for dependent in self.dependents[name]:
+                remaining[dependent] -= 1
+                if remaining[dependent] == 0:
+                    ready.append(dependent)
+
+        if len(order) != len(self.equations):
+            cycle = sorted(set(self.equations) - set(order))
+            raise ValueError(f'Equations {cycle} form a dependency cycle.')
+
+        return tuple(order)
+
+    def downstream(self, names):
+        """
+        names 중 하나라도 바뀌었을 때 다시 계산해야 하는 노드 집합.
+        """
+        dirty = set()
+        stack = list(names)
+        while stack:
+            for dependent in self.dependents[stack.pop()]:
+                if dependent not in dirty:
+                    dirty.add(dependent)
+                    stack.append(dependent)
+
+        return dirty
+
+    def compute(self, values, nodes, functions=FUNCTIONS):
+        """
+        nodes를 의존성 순서대로 계산하여 values에 채운다.
+        """
+        namespace = {'__builtins__': {}, **functions, **self.constants, **values}
+        for name in nodes:
+            value = eval(self.equations[name].code, namespace)
+            namespace[name] = value
+            values[name] = value
+
+        return values
+
+    def evaluate(self, inputs, functions=FUNCTIONS):
+        """
+        모든 노드를 계산. 파라미터와 노드 이름 -> 값 dict를 반환한다.
+        """
+        values = {name: inputs[name] for name in self.parameters}
+        return self.compute(values, self.order, functions=functions)
+
+    def differentiate(self, inputs, wrt=None):
+        """
+        모든 노드를 계산하면서 wrt 파라미터에 대한 편미분을 dual number로 함께 구한다.
+
+        Parameters:
+        - inputs: 파라미터 이름 -> 값. 배열이면 같은 shape이어야 한다.
+        - wrt: 미분할 파라미터 이름 (기본값: 모든 파라미터)
+
+        Returns:
+        - (values, jacobian). values는 evaluate와 같고, jacobian은
+          노드 이름 -> wrt 순서의 편미분 배열 (shape (len(wrt), *값의 shape)).
+          파라미터에 의존하지 않는 노드의 편미분은 0이다.
+        """
+        wrt = self.parameters if wrt is None else tuple(wrt)
+        shape = np.broadcast_shapes(*(np.shape(inputs[name]) for name in self.parameters))
+
+        seeded = {}
+        for name in self.parameters:
+            value = np.broadcast_to(np.asarray(inputs[name], dtype=float), shape)
+            if name in wrt:
+                grad = np.zeros((len(wrt), *shape))
+                grad[wrt.index(name)] = 1.0
+                seeded[name] = Dual(value, grad)
+            else:
+                seeded[name] = value
+
+        dual = self.evaluate(seeded, functions=DUAL_FUNCTIONS)
+
+        values = {}
+        jacobian = {}
+        for name, value in dual.items():
+            if isinstance(value, Dual):
+                values[name] = value.value
+                jacobian[name] = value.grad
+            else:
+                values[name] = value
+                jacobian[name] = np.zeros((len(wrt), *np.shape(value)))
+
+        return values, jacobian
+
+
+class IncrementalEvaluator:
+    """
+    마지막 평가 결과를 보관하고, 바뀐 입력의 하위 노드만 다시 계산한다.
+    """
+
+    def __init__(self, graph):
+        self.graph = graph
+        self.values = None
+        self.recomputed = ()
+
+    def update(self, inputs):
+        graph = self.graph
+        if self.values is None:
+            self.values = graph.evaluate(inputs)
+            self.recomputed = graph.order
+            return self.values
+
+        changed = [
+            name for name in graph.parameters
+            if not np.array_equal(inputs[name], self.values[name])
+        ]
+        dirty = graph.downstream(changed)
+        self.recomputed = tuple(name for name in graph.order if name in dirty)
+        for name in changed:
+            self.values[name] = inputs[name]
+
+        return graph.compute(self.values, self.recomputed)
+
+
+class Constraints:
+    """
+    파라미터 정의의 range를 컴파일한 제약 조건.
+
+    경계는 숫자이거나 다른 파라미터를 참조하는 수식 문자열(예: 'T_a_int_in-0.5')이다.
+    수식은 생성 시 한 번만 파싱하고, 스칼라나 배열 입력에 대해 벡터화하여 평가한다.
+    값의 단위는 파라미터 정의와 같다 (온도는 ℃).
+    """
+
+    def __init__(self, parameters):
+        self.parameters = tuple(parameters)
+        self.bounds = {}
+        for name, spec in parameters.items():
+            low, high = spec['range']
+            self.bounds[name] = (
+                self._compile(name, 'min', low),
+                self._compile(name, 'max', high),
+            )
+
+        for name, bounds in self.bounds.items():
+            for bound in bounds:
+                if not isinstance(bound, Equation):
+                    continue
+                unknown = [n for n in bound.inputs if n not in self.bounds]
+                if unknown:
+                    raise ValueError(
+                        f'Range of {name!r} refers to unknown parameters {unknown}.'
+                    )
+
+        self.static = self._propagate()
+
+    @staticmethod
+    def _compile(name, side, bound):
+        if isinstance(bound, str):
+            return Equation(f'{name}:{side}', bound, reserved=FUNCTIONS)
+        return float(bound)
+
+    @staticmethod
+    def _evaluate(bound, values):
+        if isinstance(bound, Equation):
+            return eval(bound.code, {'__builtins__': {}, **FUNCTIONS, **values})
+        return bound
+
+    def limits(self, values):
+        """
+        현재 값 values(파라미터 -> 스칼라 또는 배열)에서 각 파라미터의 (min, max).
+        """
+        return {
+            name: (self._evaluate(low, values), self._evaluate(high, values))
+            for name, (low, high) in self.bounds.items()
+        }
+
+    def violations(self, values):
+        """
+        파라미터 -> 범위를 벗어난(또는 NaN인) 행의 mask.
+        """
+        violations = {}
+        for name, (low, high) in self.limits(values).items():
+            value = np.asarray(values[name], dtype=float)
+            violations[name] = ~((value >= low) & (value <= high))
+
+        return violations
+
+    def feasible(self, values):
+        """
+        모든 파라미터가 범위 안에 있는 행의 mask.
+        """
+        mask = np.ones(np.broadcast_shapes(*(
+            np.shape(values[name]) for name in self.parameters
+        )), dtype=bool)
+        for violated in self.violations(values).values():
+            mask &= ~violated
+
+        return mask
+
+    def _propagate(self):
+        """
+        수식 경계를 참조하는 파라미터의 정적 범위로 풀어 숫자 (min, max)를 구한다.
+
+        경계 수식은 입력에 대해 단조(예: 'T_0+0.5')라고 보고, 입력 범위의 양 끝점
+        조합에서 평가한 최솟값/최댓값을 쓴다. 범위가 변하지 않을 때까지 반복한다.
+        """
+        static = {
+            name: (
+                -np.inf if isinstance(low, Equation) else low,
+                np.inf if isinstance(high, Equation) else high,
+            )
+            for name, (low, high) in self.bounds.items()
+        }
+
+        with np.errstate(invalid='ignore'):
+            for _ in range(len(self.bounds)):
+                updated = {}
+                for name, (low, high) in self.bounds.items():
+                    updated[name] = (
+                        self._static_bound(low, static, min),
+                        self._static_bound(high, static, max),
+                    )
+                if updated == static:
+                    break
+                static = updated
+
+        return static
+
+    def _static_bound(self, bound, static, reduce):
+        if not isinstance(bound, Equation):
+            return bound
+
+        corners = [
+            float(self._evaluate(bound, dict(zip(bound.inputs, corner))))
+            for corner in itertools.product(*(static[name] for name in bound.inputs))
+        ]
+        return reduce(corners)
@@ -0,0 +1,203 @@
+import os
+import math
+import time
+import itertools
+import collections
+import dataclasses
+import concurrent.futures
+
+import numpy as np
+
+from exergy_dashboard.evaluation import COOLING_TERMS, evaluate_cooling
+from exergy_dashboard.sweep import (
+    DEFAULT_CHUNK_SIZE,
+    resolve_axes,
+    grid_size,
+    fixed_parameters,
+    evaluate_grid_chunk,
+)
+
+
+@dataclasses.dataclass
+class WorkerStats:
+    chunks: int = 0
+    rows: int = 0
+    seconds: float = 0.0
+
+    @property
+    def rows_per_second(self):
+        return self.rows / self.seconds if self.seconds > 0 else 0.0
+
+
+@dataclasses.dataclass
+class ExecutionStats:
+    """
+    병렬 실행 통계. workers는 worker 프로세스 id -> WorkerStats.
+    """
+    workers: dict = dataclasses.field(default_factory=dict)
+    rows: int = 0
+    wall_seconds: float = 0.0
+
+    @property
+    def rows_per_second(self):
+        return self.rows / self.wall_seconds if self.wall_seconds > 0 else 0.0
+
+    def record(self, pid, rows, seconds):
+        worker = self.workers.setdefault(pid, WorkerStats())
+        worker.chunks += 1
+        worker.rows += rows
+        worker.seconds += seconds
+        self.rows += rows
+
+
+def _timed(func, *args):
+    start = time.perf_counter()
+    result = func(*args)
+    return os.getpid(), time.perf_counter() - start, result
+
+
+def default_outputs(system_type):
+    """
+    worker가 돌려보내는 기본 항: 효율, 입력/출력 엑서지, 구성요소별 엑서지 소비.
+
+    중간 항까지 모두 보내면 pickle 비용이 계산 비용보다 커지므로 필요한 항만 보낸다.
+    """
+    terms = COOLING_TERMS[system_type]
+    return (terms['efficiency'], terms['input'], terms['output'], *terms['destruction'])
+
+
+def _select_columns(system_type, columns, outputs):
+    result = evaluate_cooling(system_type, columns)
+    return {name: result[name] for name in outputs}
+
+
+def _select_grid(system_type, axes, constants, start, stop, outputs):
+    result = evaluate_grid_chunk(system_type, axes, constants, start, stop)
+    return {name: result[name] for name in (*axes, *outputs, 'feasible')}
+
+
+def _evaluate_columns(system_type, columns, outputs):
+    return _timed(_select_columns, system_type, columns, outputs)
+
+
+def _evaluate_grid(system_type, axes, constants, start, stop, outputs):
+    return _timed(_select_grid, system_type, axes, constants, start, stop, outputs)
+
+
+def _ordered_map(executor, tasks, window, stats):
+    """
+    tasks를 executor에 제출하고 제출 순서대로 결과를 yield.
+    동시에 실행 중인 작업은 window 개로 제한한다.
+    """
+    tasks = iter(tasks)
+    pending = collections.deque(
+        executor.submit(*task) for task in itertools.islice(tasks, window)
+    )
+
+    while pending:
+        pid, seconds, result = pending.popleft().result()
+        rows = len(next(iter(result.values())))
+        stats.record(pid, rows, seconds)
+        task = next(tasks, None)
+        if task is not None:
+            pending.append(executor.submit(*task))
+
+        yield result
+
+
+def sweep_cooling_parallel(
+    system_type,
+    axes,
+    fixed=None,
+    workers=None,
+    chunk_size=DEFAULT_CHUNK_SIZE,
+    stats=None,
+    outputs=None,
+):
+    """
+    sweep_cooling의 병렬 버전. 격자를 chunk로 나누어 프로세스 풀에서 평가하고,
+    결과는 격자 순서대로 yield한다. 각 chunk에는 sweep 축, outputs의 항,
+    'feasible'만 들어 있다 (고정 파라미터와 중간 항은 보내지 않는다).
+
+    Parameters:
+    - workers: worker 프로세스 수 (기본값 CPU 수)
+    - chunk_size: worker 하나가 한 번에 평가할 점의 수
+    - stats: ExecutionStats. 주어지면 worker별 처리량을 기록한다.
+    - outputs: 돌려받을 항 이름. 기본값은 default_outputs(system_type).
+    """
+    outputs = default_outputs(system_type) if outputs is None else tuple(outputs)
+    axes = resolve_axes(system_type, axes)
+    constants = fixed_parameters(system_type, axes, fixed)
+    total = grid_size(axes)
+    workers = workers or os.cpu_count()
+    stats = stats if stats is not None else ExecutionStats()
+
+    tasks = (
+        (
+            _evaluate_grid, system_type, axes, constants,
+            start, min(start + chunk_size, total), outputs,
+        )
+        for start in range(0, total, chunk_size)
+    )
+
+    start = time.perf_counter()
+    with concurrent.futures.ProcessPoolExecutor(max_workers=workers) as executor:
+        try:
+            yield from _ordered_map(executor, tasks, 2 * workers, stats)
+        finally:
+            stats.wall_seconds += time.perf_counter() - start
+
+
+def evaluate_cooling_parallel(
+    system_type,
+    params,
+    workers=None,
+    chunk_size=DEFAULT_CHUNK_SIZE,
+    stats=None,
+    outputs=None,
+):
+    """
+    시나리오 집합(파라미터 컬럼)을 프로세스 풀에서 나누어 평가.
+    Monte Carlo 샘플처럼 이미 만들어진 입력에 사용한다.
+
+    Parameters:
+    - outputs: 돌려받을 항 이름. 기본값은 default_outputs(system_type).
+
+    Returns:
+    - 항 이름 -> 배열 dict. shape은 입력을 broadcast한 shape이고 행 순서는 입력과 같다.
+    """
+    outputs = default_outputs(system_type) if outputs is None else tuple(outputs)
+    columns = {name: np.asarray(params[name], dtype=float) for name in params.keys()}
+    shape = np.broadcast_shapes(*(column.shape for column in columns.values()))
+    columns = {
+        name: np.broadcast_to(column, shape).reshape(-1)
+        for name, column in columns.items()
+    }
+    total = math.prod(shape)
+    if total == 0 or not shape:
+        # 나눌 행이 없으면 프로세스 풀 없이 평가한다.
+        result = _select_columns(system_type, columns, outputs)
+        return {name: np.reshape(values, shape) for name, values in result.items()}
+
+    workers = workers or os.cpu_count()
+    stats = stats if stats is not None else ExecutionStats()
+
+    tasks = (
+        (
+            _evaluate_columns,
+            system_type,
+            {name: values[start:start + chunk_size] for name, values in columns.items()},
+            outputs,
+        )
+        for start in range(0, total, chunk_size)
+    )
+
+    start = time.perf_counter()
+    with concurrent.futures.ProcessPoolExecutor(max_workers=workers) as executor:
+        batches = list(_ordered_map(executor, tasks, 2 * workers, stats))
+    stats.wall_seconds += time.perf_counter() - start
+
+    return {
+        name: np.concatenate([batch[name] for batch in batches]).reshape(shape)
+        for name in outputs
+    }
@@ -0,0 +1,86 @@
+import os
+import time
+import contextlib
+import collections
+
+import numpy as np
+
+
+class PhaseTimer:
+    """
+    Streamlit rerun의 단계별 실행 시간을 기록.
+
+    Parameters:
+    - window: 단계별로 보관할 최근 측정 수 (rolling percentile 계산에 사용)
+    """
+
+    def __init__(self, window=100):
+        self.window = window
+        self.reruns = 0
+        self.fragment = None
+        self.durations = {}
+        self.events = collections.deque(maxlen=window * 20)
+
+    @contextlib.contextmanager
+    def phase(self, name):
+        start = time.perf_counter()
+        try:
+            yield
+        finally:
+            self.record(name, start, time.perf_counter())
+
+    def record(self, name, start, end):
+        if name not in self.durations:
+            self.durations[name] = collections.deque(maxlen=self.window)
+        self.durations[name].append(end - start)
+        self.events.append((name, start, end, self.reruns, self.fragment))
+
+    def begin_rerun(self, fragment=None):
+        """
+        새 rerun의 시작. fragment만 다시 실행될 때는 fragment 이름을 준다.
+        이후 기록되는 단계는 새 rerun 번호(와 fragment 이름)로 묶인다.
+        """
+        self.reruns += 1
+        self.fragment = fragment
+        self._rerun_start = time.perf_counter()
+
+    def end_rerun(self):
+        name = 'rerun' if self.fragment is None else f'fragment {self.fragment}'
+        self.record(name, self._rerun_start, time.perf_counter())
+
+    def summary(self, percentiles=(50, 90, 99)):
+        """
+        단계별 최근 측정의 percentile [ms].
+        """
+        rows = []
+        for name, durations in self.durations.items():
+            values = np.percentile(np.asarray(durations) * 1000, percentiles)
+            rows.append({
+                'phase': name,
+                'count': len(durations),
+                'last [ms]': durations[-1] * 1000,
+                **{f'p{p} [ms]': v for p, v in zip(percentiles, values)},
+            })
+        return rows
+
+    def chrome_trace(self):
+        """
+        chrome://tracing 또는 Perfetto에서 열 수 있는 Trace Event 형식.
+        """
+        pid = os.getpid()
+        return {
+            'traceEvents': [
+                {
+                    'name': name,
+                    'cat': 'rerun',
+                    'ph': 'X',
+                    'ts': start * 1e6,
+                    'dur': (end - start) * 1e6,
+                    'pid': pid,
+                    'tid': 1,
+                    'args': {'rerun': rerun, 'fragment': fragment},
+                }
+                for name, start, end, rerun, fragment in self.events
+            ],
+            'displayTimeUnit': 'ms',
+        }
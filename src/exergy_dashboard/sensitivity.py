@@ -0,0 +1,183 @@
+import itertools
+
+import numpy as np
+
+from exergy_dashboard.system import SYSTEM_CASE
+from exergy_dashboard.evaluation import COOLING_TERMS, evaluate_cooling
+from exergy_dashboard.parallel import evaluate_cooling_parallel
+from exergy_dashboard.sweep import DEFAULT_CHUNK_SIZE
+
+
+# 현재 값 주변의 표본 범위 (파라미터 정의의 step 단위, 양쪽)
+SENSITIVITY_STEPS = 10
+DEFAULT_BASE_SAMPLES = 32768
+# 제약을 벗어나는 표본 범위를 줄이는 비율과 최대 반복 횟수
+SHRINK_FACTOR = 0.9
+SHRINK_ITERATIONS = 100
+
+
+def sensitivity_outputs(system_type):
+    """
+    기본 분석 대상: 엑서지 효율과 구성요소별 엑서지 소비 항.
+    """
+    terms = COOLING_TERMS[system_type]
+    return (terms['efficiency'], *terms['destruction'])
+
+
+def sample_bounds(system_type, params, steps=SENSITIVITY_STEPS):
+    """
+    각 파라미터의 표본 범위 (min, max).
+
+    현재 값 ± steps * step을 정적 범위(Constraints.static)로 자른 뒤, 범위 제약을
+    벗어나는 꼭짓점이 있으면 그 제약에 관련된 파라미터의 폭을 현재 값 쪽으로 줄인다.
+    경계 수식이 단조라고 보므로(Constraints._propagate와 같은 가정) 모든 꼭짓점이
+    제약을 만족하면 표본 범위 전체가 제약을 만족한다. Sobol 지수는 입력이 독립이라고
+    가정하므로 표본을 걸러내는 대신 범위를 줄인다.
+    """
+    parameters = SYSTEM_CASE['COOLING'][system_type]['parameters']
+    constraints = SYSTEM_CASE['COOLING'][system_type]['constraints']
+
+    center = {name: float(params[name]) for name in parameters}
+    bounds = {}
+    for name, spec in parameters.items():
+        low, high = constraints.static[name]
+        bounds[name] = (
+            max(center[name] - steps * spec['step'], low),
+            min(center[name] + steps * spec['step'], high),
+        )
+
+    names = list(parameters)
+    corners = np.array(list(itertools.product((0, 1), repeat=len(names))), dtype=bool)
+    for _ in range(SHRINK_ITERATIONS):
+        columns = {
+            name: np.where(corners[:, i], bounds[name][1], bounds[name][0])
+            for i, name in enumerate(names)
+        }
+        violated = [
+            name for name, mask in constraints.violations(columns).items() if mask.any()
+        ]
+        if not violated:
+            break
+
+        involved = set(violated)
+        for name in violated:
+            for bound in constraints.bounds[name]:
+                involved.update(getattr(bound, 'inputs', ()))
+        for name in involved:
+            low, high = bounds[name]
+            bounds[name] = (
+                center[name] - SHRINK_FACTOR * (center[name] - low),
+                center[name] + SHRINK_FACTOR * (high - center[name]),
+            )
+
+    return bounds
+
+
+def saltelli_columns(bounds, n, seed=None):
+    """
+    Saltelli 표본 행렬 A, B, AB_1 ... AB_d를 세로로 이어 붙인 입력 컬럼.
+
+    AB_i는 A의 i번째 열을 B의 것으로 바꾼 행렬이다. 모든 행렬을 한 번에 평가할 수
+    있도록 n * (d + 2) 행의 컬럼 하나로 만든다.
+
+    Returns:
+    - 파라미터 이름 -> 길이 n * (d + 2)의 배열 dict. 행렬 순서는 A, B, AB_1, ..., AB_d.
+    """
+    names = list(bounds)
+    low = np.array([bounds[name][0] for name in names])
+    high = np.array([bounds[name][1] for name in names])
+
+    rng = np.random.default_rng(seed)
+    a = low + (high - low) * rng.random((n, len(names)))
+    b = low + (high - low) * rng.random((n, len(names)))
+
+    blocks = np.repeat(a[np.newaxis], len(names) + 2, axis=0)
+    blocks[1] = b
+    for i in range(len(names)):
+        blocks[i + 2, :, i] = b[:, i]
+
+    stacked = blocks.reshape(-1, len(names))
+    return {name: stacked[:, i] for i, name in enumerate(names)}
+
+
+def sobol_indices(
+    system_type,
+    params,
+    bounds=None,
+    n=DEFAULT_BASE_SAMPLES,
+    outputs=None,
+    seed=None,
+    workers=None,
+    chunk_size=DEFAULT_CHUNK_SIZE,
+):
+    """
+    모든 파라미터의 1차(first-order) 및 전체(total) Sobol 지수.
+
+    Saltelli 표본 행렬을 모두 이어 붙여 한 번에 평가하고(workers가 주어지면 chunk로 나누어
+    프로세스 풀에서 평가), 1차 지수는 Saltelli (2010), 전체 지수는 Jansen 추정량으로 구한다.
+    파라미터 범위 제약을 벗어난 행은 평가하지 않으며, 각 지수는 관련된 행이 모두 유효한
+    표본만으로 추정한다.
+
+    Parameters:
+    - params: 파라미터 이름 -> 현재 값. bounds가 없을 때 표본 범위의 중심.
+    - bounds: 파라미터 이름 -> (min, max). 기본값은 sample_bounds(system_type, params).
+    - n: 기본 표본 수. 평가하는 행은 n * (파라미터 수 + 2)개.
+    - outputs: 분석할 항 이름. 기본값은 sensitivity_outputs(system_type).
+    - workers: 주어지면 evaluate_cooling_parallel로 평가한다.
+
+    Returns:
+    - dict:
+      - 'parameters': 파라미터 이름 튜플
+      - 'bounds': 사용한 표본 범위
+      - 'indices': 항 이름 -> {'first': 배열, 'total': 배열} (parameters 순서)
+      - 'rows': Saltelli 표본 행 수 (n * (파라미터 수 + 2))
+      - 'evaluated': 그중 제약을 만족하여 실제로 평가한 행 수
+      - 'feasible': 제약을 만족한 행의 비율
+    """
+    parameters = SYSTEM_CASE['COOLING'][system_type]['parameters']
+    constraints = SYSTEM_CASE['COOLING'][system_type]['constraints']
+    bounds = sample_bounds(system_type, params) if bounds is None else bounds
+    outputs = sensitivity_outputs(system_type) if outputs is None else tuple(outputs)
+    names = tuple(parameters)
+
+    columns = saltelli_columns({name: bounds[name] for name in names}, n, seed)
+    feasible = constraints.feasible(columns)
+    rows = {name: column[feasible] for name, column in columns.items()}
+    if workers is None:
+        with np.errstate(divide='ignore', invalid='ignore'):
+            result = evaluate_cooling(system_type, rows)
+    else:
+        result = evaluate_cooling_parallel(
+            system_type, rows, workers=workers, chunk_size=chunk_size, outputs=outputs,
+        )
+
+    indices = {}
+    for output in outputs:
+        values = np.full(feasible.shape, np.nan)
+        values[feasible] = result[output]
+        blocks = values.reshape(len(names) + 2, n)
+        f_a, f_b = blocks[0], blocks[1]
+
+        first = np.full(len(names), np.nan)
+        total = np.full(len(names), np.nan)
+        with np.errstate(divide='ignore', invalid='ignore'):
+            for i, f_ab in enumerate(blocks[2:]):
+                valid = np.isfinite(f_a) & np.isfinite(f_b) & np.isfinite(f_ab)
+                if valid.sum() < 2:
+                    continue
+                variance = np.var(np.concatenate([f_a[valid], f_b[valid]]))
+                if variance <= 0:
+                    continue
+                first[i] = np.mean(f_b[valid] * (f_ab[valid] - f_a[valid])) / variance
+                total[i] = 0.5 * np.mean((f_a[valid] - f_ab[valid]) ** 2) / variance
+
+        indices[output] = {'first': first, 'total': total}
+
+    return {
+        'parameters': names,
+        'bounds': {name: bounds[name] for name in names},
+        'indices': indices,
+        'rows': len(feasible),
+        'evaluated': int(feasible.sum()),
+        'feasible': float(feasible.mean()),
+    }
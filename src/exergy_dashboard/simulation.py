@@ -0,0 +1,136 @@
+import numpy as np
+
+from exergy_dashboard.system import SYSTEM_CASE
+from exergy_dashboard.evaluation import evaluate_cooling_feasible, COOLING_TERMS
+
+
+def load_series(path, columns=None):
+    """
+    시계열 파일(CSV 또는 Parquet)을 읽어 DataFrame으로 반환.
+
+    Parameters:
+    - path: .csv 또는 .parquet 파일 경로 (또는 name 속성이 있는 파일 객체)
+    - columns: 읽을 컬럼 (기본값 전체)
+    """
+    import pandas as pd
+
+    name = str(getattr(path, 'name', path))
+    if name.endswith(('.parquet', '.pq')):
+        return pd.read_parquet(path, columns=columns)
+    if name.endswith(('.csv', '.csv.gz')):
+        return pd.read_csv(path, usecols=columns, engine='pyarrow')
+    raise ValueError(f'Unsupported series file: {name!r} (expected CSV or Parquet).')
+
+
+def time_steps(time, default=1.0):
+    """
+    각 시점의 시간 간격 [h]. 마지막 시점은 직전 간격을 사용한다.
+    """
+    time = np.asarray(time, dtype='datetime64[ns]')
+    if len(time) < 2:
+        return np.full(len(time), default)
+
+    dt = np.diff(time).astype('timedelta64[ns]').astype(float) / 3.6e12
+    return np.append(dt, dt[-1])
+
+
+def simulate_cooling(
+    system_type,
+    series,
+    params=None,
+    columns=None,
+    time='time',
+    dt=None,
+):
+    """
+    시계열 입력(외기온도, 토양온도, 냉방부하 등)에 대해 냉방 모델을 한 번에 평가.
+
+    Parameters:
+    - system_type: 'ASHP' 또는 'GSHP'
+    - series: DataFrame 또는 컬럼 이름 -> 배열 매핑
+    - params: 시계열에 없는 파라미터의 값. 지정하지 않으면 기본값 사용.
+    - columns: 파라미터 이름 -> series 컬럼 이름. 'load'는 냉방부하 파라미터를 뜻한다.
+      지정하지 않은 파라미터는 같은 이름의 컬럼이 있으면 사용한다.
+    - time: 시간 컬럼 이름. 없으면 일정한 간격 dt [h]를 사용한다.
+    - dt: 시간 컬럼이 없을 때의 간격 [h]
+
+    냉방부하가 0 이하인 시점은 시스템이 정지한 것으로 보고 모든 항을 0으로 둔다.
+    운전 중이지만 파라미터 범위 제약을 벗어난 시점은 평가하지 않고 NaN으로 둔다.
+
+    Returns:
+    - 'dt', 'running' (운전 중인 시점), 'feasible' (정지했거나 제약을 만족하는 시점)과
+      모든 엑서지 항의 이름 -> 시점별 배열 dict
+
+    Raises:
+    - ValueError: 시간 컬럼도 dt도 없을 때
+    """
+    parameters = SYSTEM_CASE['COOLING'][system_type]['parameters']
+    load = COOLING_TERMS[system_type]['load']
+    params = params or {}
+    columns = dict(columns or {})
+    if 'load' in columns:
+        columns[load] = columns.pop('load')
+
+    inputs = {}
+    for name, spec in parameters.items():
+        column = columns.get(name, name)
+        if column not in series:
+            column = name
+        if column in series:
+            inputs[name] = np.asarray(series[column], dtype=float)
+        else:
+            inputs[name] = params.get(name, spec['default'])
+
+    if time in series:
+        steps = time_steps(series[time], default=1.0 if dt is None else dt)
+    elif dt is not None:
+        steps = dt
+    else:
+        raise ValueError(
+            f'Series has no {time!r} column; pass dt to set a constant time step.'
+        )
+
+    # 시점 수는 load만이 아니라 시계열로 주어진 모든 입력(과 시간)에서 정한다.
+    shape = np.broadcast_shapes(np.shape(steps), *(np.shape(v) for v in inputs.values()))
+    steps = np.broadcast_to(np.asarray(steps, dtype=float), shape)
+    inputs = {name: np.broadcast_to(value, shape) for name, value in inputs.items()}
+
+    result = evaluate_cooling_feasible(system_type, inputs)
+    running = inputs[load] > 0
+    feasible = result.pop('feasible') | ~running
+    result = {k: np.where(running, v, 0.0) for k, v in result.items()}
+    result['dt'] = steps
+    result['running'] = running
+    result['feasible'] = feasible
+
+    return result
+
+
+def summarize_cooling(system_type, result):
+    """
+    시뮬레이션 결과의 누적 엑서지 [kWh]와 계절 엑서지 효율 [%].
+
+    파라미터 범위 제약을 벗어난 시점은 누적값에서 제외하고, 그 수를
+    'infeasible_steps'와 'infeasible_hours'로 보고한다.
+    """
+    terms = COOLING_TERMS[system_type]
+    dt = result['dt']
+    feasible = result['feasible']
+    infeasible = ~feasible
+
+    def total(name):
+        return float(np.sum(result[name][feasible] * dt[feasible]))
+
+    Xin = total(terms['input'])
+    Xout = total(terms['output'])
+
+    return {
+        'hours': float(np.sum(dt)),
+        'running_hours': float(np.sum(dt[result['running'] & feasible])),
+        'infeasible_steps': int(np.count_nonzero(infeasible)),
+        'infeasible_hours': float(np.sum(dt[infeasible])),
+        'Xin': Xin,
+        'Xout': Xout,
+        'destruction': {name: total(name) for name in terms['destruction']},
+        'efficiency': Xout / Xin * 100 if Xin != 0 else float('nan'),
+    }
@@ -0,0 +1,135 @@
+import dataclasses
+
+import numpy as np
+
+from exergy_dashboard.system import SYSTEM_CASE
+
+
+@dataclasses.dataclass(slots=True, eq=False)
+class SystemRecord:
+    """
+    시스템 하나의 값과 결과만 담는 레코드.
+
+    파라미터 정의(설명, 단위, 범위 등)와 수식은 SYSTEM_CASE에서 공유한다.
+
+    - values: 현재 파라미터 값 (파라미터 정의 순서, 온도는 ℃)
+    - evaluated: results를 계산할 때 사용한 파라미터 값
+    - results: 모델 노드 값 (model.order 순서)
+    """
+    name: str
+    type: str
+    mode: str
+    values: np.ndarray
+    evaluated: np.ndarray | None = None
+    results: np.ndarray | None = None
+
+    @property
+    def case(self):
+        return SYSTEM_CASE[self.mode][self.type]
+
+    @property
+    def parameters(self):
+        return self.case['parameters']
+
+    @property
+    def model(self):
+        return self.case['model']
+
+    @property
+    def constraints(self):
+        return self.case['constraints']
+
+    @property
+    def variables(self):
+        """
+        마지막 평가의 파라미터 값과 결과 이름 -> 값 dict.
+        """
+        if self.results is None:
+            return {}
+
+        return {
+            **dict(zip(self.parameters, self.evaluated.tolist())),
+            **dict(zip(self.model.order, self.results.tolist())),
+        }
+
+
+class ParameterStore:
+    """
+    시스템별 파라미터 값 저장소.
+
+    시스템마다 파라미터 값을 SystemRecord의 float 배열 하나로 보관하고, 파라미터
+    이름 -> 배열 인덱스는 시스템 종류별로 공유한다. 조회, 갱신, 삭제는 해당
+    시스템의 파라미터 수에만 비례한다.
+    """
+
+    def __init__(self):
+        self._index = {}
+        self._records = {}
+
+    def __contains__(self, system_name):
+        return system_name in self._records
+
+    def __len__(self):
+        return len(self._records)
+
+    def add(self, system_name, system_type, mode='COOLING'):
+        """
+        기본값으로 시스템을 추가하고 SystemRecord를 반환.
+        """
+        parameters = SYSTEM_CASE[mode][system_type]['parameters']
+        if system_type not in self._index:
+            self._index[system_type] = {
+                name: i for i, name in enumerate(parameters)
+            }
+
+        record = SystemRecord(
+            name=system_name,
+            type=system_type,
+            mode=mode,
+            values=np.array(
+                [spec['default'] for spec in parameters.values()], dtype=float,
+            ),
+        )
+        self._records[system_name] = record
+
+        return record
+
+    def remove(self, system_name):
+        self._records.pop(system_name)
+
+    def record(self, system_name):
+        return self._records[system_name]
+
+    def names(self, system_name):
+        return self._index[self._records[system_name].type].keys()
+
+    def get(self, system_name, parameter):
+        record = self._records[system_name]
+        return float(record.values[self._index[record.type][parameter]])
+
+    def set(self, system_name, parameter, value):
+        record = self._records[system_name]
+        record.values[self._index[record.type][parameter]] = value
+
+    def values(self, system_name):
+        return self._records[system_name].values
+
+    def as_dict(self, system_name):
+        return dict(zip(self.names(system_name), self.values(system_name).tolist()))
+
+    @staticmethod
+    def widget_key(system_name, parameter):
+        return f'{system_name}:{parameter}'
+
+    def widget_keys(self, system_name):
+        return [self.widget_key(system_name, name) for name in self.names(system_name)]
+
+    def sync(self, sss, system_name):
+        """
+        Streamlit widget 값(키 '<시스템>:<파라미터>')을 저장소에 반영.
+        화면에 없는 widget의 값은 저장소의 값을 유지한다.
+        """
+        values = self.values(system_name)
+        for i, key in enumerate(self.widget_keys(system_name)):
+            if key in sss:
+                values[i] = sss[key]
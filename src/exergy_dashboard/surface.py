@@ -0,0 +1,364 @@
+"""
+미리 계산한 격자에서 다중선형 보간으로 엑서지 항을 구하는 응답 표면.
+
+오프라인 도구이며 앱에서는 쓰지 않는다. 벡터화된 정확한 모델(evaluate_cooling)이
+더 빠르고 정확하다 (benchmarks/bench.py에서 비교).
+"""
+import os
+import json
+import hashlib
+import tempfile
+
+import numpy as np
+
+from exergy_dashboard.system import SYSTEM_CASE
+from exergy_dashboard.evaluation import COOLING_TERMS, evaluate_cooling_feasible
+from exergy_dashboard.sweep import sweep_cooling, fixed_parameters
+
+
+# 시스템 종류 -> 격자 축 이름 -> (min, max, 점의 수).
+# 탐색에서 자주 바꾸는 입력(외기온도, 부하, k, 냉매 온도)의 실용 범위.
+# 효율은 부하와 k에 대해 곡률이 커서 이 두 축을 촘촘하게 나눈다.
+SURFACE_AXES = {
+    'ASHP': {
+        'T_0': (20.0, 40.0, 11),
+        'Q_r_int_A': (5.0, 30.0, 26),
+        'k': (0.2, 0.6, 17),
+        'T_r_int_A': (0.0, 12.0, 7),
+        'T_r_ext_A': (44.0, 60.0, 9),
+    },
+    'GSHP': {
+        'T_0': (20.0, 40.0, 11),
+        'Q_r_int_G': (5.0, 30.0, 26),
+        'k': (0.2, 0.6, 17),
+        'T_r_int_G': (0.0, 12.0, 7),
+        'T_r_ext_G': (20.0, 36.0, 9),
+    },
+}
+
+# 격자에 저장하는 항: 효율, 입력/출력 엑서지, 구성요소별 엑서지 소비
+SURFACE_TERMS = {
+    system_type: (
+        terms['efficiency'], terms['input'], terms['output'], *terms['destruction'],
+    )
+    for system_type, terms in COOLING_TERMS.items()
+}
+
+DEFAULT_VALIDATION_POINTS = 2000
+# 파일/메타데이터 형식 버전. 바꾸면 이전 격자 파일을 쓰지 않고 새로 만든다.
+SURFACE_FORMAT = 2
+
+
+def default_directory():
+    """
+    격자 파일을 저장하는 디렉터리. 환경 변수 EXERGY_DASHBOARD_CACHE로 바꿀 수 있다.
+    """
+    return os.environ.get(
+        'EXERGY_DASHBOARD_CACHE',
+        os.path.join(os.path.expanduser('~'), '.cache', 'exergy-dashboard', 'surfaces'),
+    )
+
+
+def surface_axes(system_type, axes=None):
+    """
+    축 정의 (min, max, 점의 수)를 이름 -> 1차원 값 배열 dict로 변환.
+    """
+    axes = SURFACE_AXES[system_type] if axes is None else axes
+    return {
+        name: np.linspace(low, high, int(points))
+        for name, (low, high, points) in axes.items()
+    }
+
+
+def surface_key(system_type, axes, fixed, terms):
+    """
+    모델 수식, 상수, 축, 고정값, 항 이름의 해시. 하나라도 바뀌면 격자를 다시 만든다.
+    """
+    model = SYSTEM_CASE['COOLING'][system_type]['model']
+    content = json.dumps({
+        'format': SURFACE_FORMAT,
+        'type': system_type,
+        'equations': {
+            name: equation.expression for name, equation in model.equations.items()
+        },
+        'constants': model.constants,
+        'axes': {name: values.tolist() for name, values in axes.items()},
+        'fixed': fixed,
+        'terms': list(terms),
+    }, sort_keys=True)
+    return hashlib.sha256(content.encode()).hexdigest()[:16]
+
+
+class ResponseSurface:
+    """
+    미리 계산한 N차원 격자에서 다중선형 보간으로 엑서지 항을 구하는 응답 표면.
+
+    Parameters:
+    - system_type: 'ASHP' 또는 'GSHP'
+    - axes: 축 이름 -> 오름차순 1차원 값 배열
+    - terms: 저장된 항 이름
+    - fixed: 축이 아닌 파라미터의 값. 이 값과 다른 입력은 격자가 답할 수 없다.
+    - values: shape (항의 수, *축 길이) 배열. 보통 읽기 전용 memmap이며,
+      범위 제약을 벗어난 격자점은 NaN이다.
+    - validation_error: 항 이름 -> {'abs': 최대 절대 오차, 'rel': 최대 상대 오차}.
+      무작위 검증점에서 정확한 모델과 비교한 validation max error이며, 격자 전체의
+      오차 상한(bound)은 아니다.
+    """
+
+    def __init__(
+        self, system_type, axes, terms, fixed, values, validation_error=None, path=None,
+    ):
+        self.system_type = system_type
+        self.axes = {name: np.asarray(v, dtype=float) for name, v in axes.items()}
+        self.terms = tuple(terms)
+        self.fixed = dict(fixed)
+        self.values = values
+        self.validation_error = validation_error or {}
+        self.path = path
+        self.shape = tuple(len(v) for v in self.axes.values())
+
+    def __repr__(self):
+        return (
+            f'ResponseSurface({self.system_type!r}, '
+            f'axes={list(self.axes)}, shape={self.shape})'
+        )
+
+    def covers(self, params):
+        """
+        params(파라미터 -> 스칼라 또는 배열)의 각 행을 격자로 답할 수 있는지의 mask.
+
+        축이 아닌 파라미터가 fixed와 같고 축 값이 격자 범위 안에 있어야 한다.
+        """
+        columns = self._columns(params)
+        mask = np.ones(np.broadcast_shapes(*(np.shape(v) for v in columns.values())), dtype=bool)
+        for name, value in self.fixed.items():
+            mask &= np.isclose(columns[name], value, rtol=0, atol=1e-9)
+        for name, values in self.axes.items():
+            mask &= (columns[name] >= values[0]) & (columns[name] <= values[-1])
+
+        return mask
+
+    def interpolate(self, params, terms=None):
+        """
+        다중선형 보간. 격자 범위 밖이거나, 주변 격자점 중 하나라도 범위 제약을
+        벗어난(NaN) 행은 NaN이다. 축이 아닌 파라미터는 확인하지 않는다 (covers 참고).
+
+        Returns:
+        - 항 이름 -> 배열 dict
+        """
+        terms = self.terms if terms is None else tuple(terms)
+        columns = self._columns(params)
+        shape = np.broadcast_shapes(*(np.shape(columns[name]) for name in self.axes))
+
+        strides = np.cumprod((1, *self.shape[:0:-1]))[::-1]
+        base = np.zeros(int(np.prod(shape)), dtype=np.intp)
+        inside = np.ones(shape, dtype=bool)
+        # 꼭짓점 (flat offset, 가중치) 목록. 축마다 두 배로 늘린다.
+        corners = [(0, 1.0)]
+        for (name, values), stride in zip(self.axes.items(), strides):
+            x = np.broadcast_to(columns[name], shape).ravel()
+            i = np.clip(np.searchsorted(values, x, side='right') - 1, 0, len(values) - 2)
+            t = (x - values[i]) / (values[i + 1] - values[i])
+            inside &= ((x >= values[0]) & (x <= values[-1])).reshape(shape)
+            base += i * stride
+            corners = [
+                (offset + c * stride, w * (t if c else 1 - t))
+                for offset, w in corners
+                for c in (0, 1)
+            ]
+
+        rows = self.values.reshape(len(self.terms), -1)
+        result = {}
+        for name in terms:
+            row = rows[self.terms.index(name)]
+            total = np.zeros(base.size)
+            for offset, w in corners:
+                total += w * row[base + offset]
+            result[name] = np.where(inside, total.reshape(shape), np.nan)
+
+        return result
+
+    def query(self, params, terms=None):
+        """
+        격자로 답할 수 있는 행은 보간하고, 나머지 행은 정확한 모델로 평가한다.
+
+        Returns:
+        - 항 이름 -> 배열 dict에 'interpolated' (보간한 행의 bool 배열)를 더한 dict.
+          범위 제약을 벗어난 행은 NaN이다.
+        """
+        terms = self.terms if terms is None else tuple(terms)
+        columns = self._columns(params)
+        columns = dict(zip(columns, np.broadcast_arrays(*columns.values())))
+
+        result = self.interpolate(columns, terms)
+        interpolated = self.covers(columns)
+        for name in terms:
+            interpolated &= ~np.isnan(result[name])
+
+        exact = ~interpolated
+        if exact.any():
+            rows = evaluate_cooling_feasible(
+                self.system_type,
+                {name: column[exact] for name, column in columns.items()},
+            )
+            for name in terms:
+                result[name][exact] = rows[name]
+
+        result['interpolated'] = interpolated
+        return result
+
+    def _columns(self, params):
+        parameters = SYSTEM_CASE['COOLING'][self.system_type]['parameters']
+        return {name: np.asarray(params[name], dtype=float) for name in parameters}
+
+
+def build_surface(
+    system_type,
+    path,
+    axes=None,
+    fixed=None,
+    terms=None,
+    validation=DEFAULT_VALIDATION_POINTS,
+    seed=0,
+):
+    """
+    격자를 평가하여 path(.npy)에 저장하고 ResponseSurface로 반환.
+
+    값은 np.lib.format.open_memmap으로 sweep chunk 단위로 채우므로 격자 전체의 중간
+    결과를 메모리에 만들지 않는다. 메타데이터(축, 고정값, 검증 오차)는 같은 이름의
+    .json 파일에 저장한다. 두 파일 모두 임시 파일에 쓴 뒤 교체하므로 다른 프로세스가
+    만들다 만 파일을 읽지 않는다.
+
+    Parameters:
+    - axes: 축 이름 -> (min, max, 점의 수). 기본값은 SURFACE_AXES.
+    - fixed: 축이 아닌 파라미터의 값. 기본값은 파라미터 정의의 default.
+    - terms: 저장할 항. 기본값은 SURFACE_TERMS.
+    - validation: validation max error를 측정할 무작위 검증점의 수
+    """
+    axes = surface_axes(system_type, axes)
+    fixed = {
+        name: float(value)
+        for name, value in fixed_parameters(system_type, axes, fixed).items()
+    }
+    terms = SURFACE_TERMS[system_type] if terms is None else tuple(terms)
+    shape = tuple(len(values) for values in axes.values())
+
+    directory = os.path.dirname(os.path.abspath(path))
+    os.makedirs(directory, exist_ok=True)
+    fd, temp = tempfile.mkstemp(suffix='.npy', dir=directory)
+    os.close(fd)
+    try:
+        values = np.lib.format.open_memmap(
+            temp, mode='w+', dtype=np.float64, shape=(len(terms), *shape),
+        )
+        rows = values.reshape(len(terms), -1)
+        start = 0
+        for chunk in sweep_cooling(system_type, axes, fixed=fixed):
+            stop = start + len(chunk['feasible'])
+            for i, name in enumerate(terms):
+                rows[i, start:stop] = chunk[name]
+            start = stop
+        values.flush()
+        del rows, values
+        os.replace(temp, path)
+    except BaseException:
+        os.remove(temp)
+        raise
+
+    surface = ResponseSurface(
+        system_type, axes, terms, fixed, np.load(path, mmap_mode='r'), path=path,
+    )
+    surface.validation_error = validate_surface(surface, validation, seed)
+
+    metadata = {
+        'type': system_type,
+        'axes': {name: v.tolist() for name, v in axes.items()},
+        'terms': list(terms),
+        'fixed': fixed,
+        'validation_error': surface.validation_error,
+    }
+    fd, temp = tempfile.mkstemp(suffix='.json', dir=directory)
+    with os.fdopen(fd, 'w') as f:
+        json.dump(metadata, f, indent=2)
+    os.replace(temp, _metadata_path(path))
+
+    return surface
+
+
+def validate_surface(surface, points=DEFAULT_VALIDATION_POINTS, seed=0):
+    """
+    격자 범위 안의 무작위 점에서 보간값과 정확한 모델을 비교.
+
+    Returns:
+    - 항 이름 -> {'abs': 최대 절대 오차, 'rel': 최대 상대 오차} (validation max error).
+      검증점에서 관측한 최댓값일 뿐 오차 상한은 아니다. 보간할 수 없는 점(범위 제약
+      근처)은 제외한다.
+    """
+    rng = np.random.default_rng(seed)
+    columns = {
+        name: rng.uniform(values[0], values[-1], points)
+        for name, values in surface.axes.items()
+    }
+    for name, value in surface.fixed.items():
+        columns[name] = np.full(points, value, dtype=float)
+
+    actual = surface.interpolate(columns)
+    expected = evaluate_cooling_feasible(surface.system_type, columns)
+
+    error = {}
+    for name in surface.terms:
+        valid = ~np.isnan(actual[name]) & ~np.isnan(expected[name])
+        difference = np.abs(actual[name][valid] - expected[name][valid])
+        scale = np.maximum(np.abs(expected[name][valid]), 1e-12)
+        error[name] = {
+            'abs': float(difference.max(initial=0.0)),
+            'rel': float((difference / scale).max(initial=0.0)),
+        }
+
+    return error
+
+
+def load_surface(path):
+    """
+    저장된 격자를 읽기 전용 memmap으로 연다. 같은 파일을 연 프로세스들은 OS
+    페이지 캐시를 공유한다.
+    """
+    with open(_metadata_path(path)) as f:
+        metadata = json.load(f)
+
+    return ResponseSurface(
+        metadata['type'],
+        metadata['axes'],
+        metadata['terms'],
+        metadata['fixed'],
+        np.load(path, mmap_mode='r'),
+        validation_error=metadata['validation_error'],
+        path=path,
+    )
+
+
+def get_surface(system_type, directory=None, axes=None, fixed=None, terms=None):
+    """
+    system_type의 격자를 directory에서 읽고, 없으면 만든다.
+
+    파일 이름에 모델과 격자 정의의 해시(surface_key)가 들어가므로, 모델이 바뀌면
+    새 격자를 만든다.
+    """
+    directory = default_directory() if directory is None else directory
+    grid = surface_axes(system_type, axes)
+    fixed = {
+        name: float(value)
+        for name, value in fixed_parameters(system_type, grid, fixed).items()
+    }
+    terms = SURFACE_TERMS[system_type] if terms is None else tuple(terms)
+
+    key = surface_key(system_type, grid, fixed, terms)
+    path = os.path.join(directory, f'{system_type}-{key}.npy')
+    if os.path.exists(path) and os.path.exists(_metadata_path(path)):
+        return load_surface(path)
+
+    return build_surface(system_type, path, axes=axes, fixed=fixed, terms=terms)
+
+
+def _metadata_path(path):
+    return os.path.splitext(path)[0] + '.json'
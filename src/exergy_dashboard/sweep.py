@@ -0,0 +1,131 @@
+import math
+
+import numpy as np
+
+from exergy_dashboard.system import SYSTEM_CASE
+from exergy_dashboard.evaluation import evaluate_cooling_feasible
+
+
+DEFAULT_CHUNK_SIZE = 65536
+
+
+def parameter_values(spec, bounds=None):
+    """
+    파라미터 정의의 range와 step으로 격자 값을 생성.
+
+    range에 다른 파라미터를 참조하는 문자열 경계가 있으면 bounds(Constraints.static의
+    정적 범위)를 사용한다. 범위 밖 조합은 평가할 때 걸러진다.
+    """
+    low, high = spec['range'] if bounds is None else bounds
+    if isinstance(low, str) or isinstance(high, str):
+        raise ValueError(
+            f"Dependent range {spec['range']!r} cannot be swept directly; "
+            'pass explicit values or static bounds instead.'
+        )
+
+    step = spec['step']
+    n = int(math.floor((high - low) / step + 1e-9)) + 1
+    return low + step * np.arange(n)
+
+
+def local_values(spec, center, steps=50, bounds=None):
+    """
+    현재 값 center를 중심으로 앞뒤 steps개 step 간격의 값을 생성.
+
+    bounds(정적 범위)가 주어지면 그 안으로 자르고, 없으면 숫자 경계로만 자른다.
+    """
+    values = center + spec['step'] * np.arange(-steps, steps + 1)
+    low, high = spec['range'] if bounds is None else bounds
+    if not isinstance(low, str):
+        values = values[values >= low]
+    if not isinstance(high, str):
+        values = values[values <= high]
+
+    return values
+
+
+def resolve_axes(system_type, axes):
+    """
+    sweep 축 정의를 이름 -> 1차원 값 배열 dict로 변환.
+
+    Parameters:
+    - axes: 파라미터 이름 리스트(정의된 range/step 사용) 또는
+      이름 -> 값 배열(None이면 range/step 사용) dict
+    """
+    parameters = SYSTEM_CASE['COOLING'][system_type]['parameters']
+    constraints = SYSTEM_CASE['COOLING'][system_type]['constraints']
+    if not isinstance(axes, dict):
+        axes = {name: None for name in axes}
+
+    resolved = {}
+    for name, values in axes.items():
+        if name not in parameters:
+            raise KeyError(f'{system_type} has no parameter {name!r}.')
+        if values is None:
+            values = parameter_values(parameters[name], constraints.static[name])
+        resolved[name] = np.asarray(values, dtype=float).ravel()
+
+    return resolved
+
+
+def grid_size(axes):
+    return math.prod(len(values) for values in axes.values())
+
+
+def grid_chunk(axes, start, stop):
+    """
+    데카르트 격자의 [start, stop) 구간의 점들을 컬럼으로 반환.
+    격자 전체를 메모리에 만들지 않는다.
+    """
+    shape = tuple(len(values) for values in axes.values())
+    index = np.unravel_index(np.arange(start, stop), shape)
+    return {
+        name: values[i]
+        for (name, values), i in zip(axes.items(), index)
+    }
+
+
+def sweep_cooling(system_type, axes, fixed=None, chunk_size=DEFAULT_CHUNK_SIZE):
+    """
+    파라미터 격자에 대해 냉방 모델을 chunk 단위로 평가하는 generator.
+
+    Parameters:
+    - system_type: 'ASHP' 또는 'GSHP'
+    - axes: sweep할 파라미터 (resolve_axes 참고)
+    - fixed: sweep하지 않는 파라미터의 값. 지정하지 않으면 기본값 사용.
+    - chunk_size: 한 번에 평가할 점의 수
+
+    Yields:
+    - 입력과 모든 엑서지 항의 이름 -> 배열 dict (최대 chunk_size 행).
+      파라미터 범위 제약을 벗어난 격자점은 평가하지 않고 NaN으로 채우며,
+      'feasible' 컬럼에 표시한다.
+    """
+    axes = resolve_axes(system_type, axes)
+    constants = fixed_parameters(system_type, axes, fixed)
+
+    total = grid_size(axes)
+    for start in range(0, total, chunk_size):
+        stop = min(start + chunk_size, total)
+        yield evaluate_grid_chunk(system_type, axes, constants, start, stop)
+
+
+def fixed_parameters(system_type, axes, fixed=None):
+    """
+    sweep 축이 아닌 파라미터의 값. fixed에 없으면 기본값을 사용한다.
+    """
+    parameters = SYSTEM_CASE['COOLING'][system_type]['parameters']
+    fixed = fixed or {}
+    return {
+        name: fixed.get(name, spec['default'])
+        for name, spec in parameters.items()
+        if name not in axes
+    }
+
+
+def evaluate_grid_chunk(system_type, axes, constants, start, stop):
+    columns = grid_chunk(axes, start, stop)
+    for name, value in constants.items():
+        columns[name] = np.full(stop - start, value, dtype=float)
+
+    result = evaluate_cooling_feasible(system_type, columns)
+    return {**columns, **result}
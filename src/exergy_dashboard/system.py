@@ -1,3 +1,14 @@
+import types
+
+from exergy_dashboard.model import Constraints, EquationGraph
+
+
+CONSTANTS = {
+    'c_a': 1.005, # kJ/(kg·K), 공기 비열
+    'rho_a': 1.2, # kg/m³, 공기 밀도
+}
+
+
 COOLING_ASGP = {
     'parameters':{
         'T_0': {
@@ -80,7 +91,54 @@ COOLING_ASGP = {
             'unit': 'kW',
             'step': 0.1,
         },
-    }
+    },
+    'equations': {
+        # Outdoor air
+        'T_a_ext_in': 'T_0',
+
+        # System COP
+        'cop_A': 'k * T_r_int_A / (T_r_ext_A - T_r_int_A)',
+
+        # System capacity - ASHP
+        'E_cmp_A': 'Q_r_int_A / cop_A', # kW, 압축기 전력
+        'Q_r_ext_A': 'Q_r_int_A + E_cmp_A', # kW, 실외기 배출열량
+
+        # Air & Cooling water parameters
+        'V_int': 'Q_r_int_A / (c_a * rho_a * (T_a_int_in - T_a_int_out))',
+        'V_ext': 'Q_r_ext_A / (c_a * rho_a * (T_a_ext_out - T_a_ext_in))',
+        'm_int': 'V_int * rho_a',
+        'm_ext': 'V_ext * rho_a',
+
+        ## Internal unit with evaporator
+        'X_r_int_A': '- Q_r_int_A * (1 - T_0 / T_r_int_A)', # 냉매에서 실내 공기에 전달한 엑서지
+        'X_a_int_out_A': 'c_a * m_int * ((T_a_int_out - T_0) - T_0 * log(T_a_int_out / T_0))', # 실외기 취출 공기 엑서지
+        'X_a_int_in_A': 'c_a * m_int * ((T_a_int_in - T_0) - T_0 * log(T_a_int_in / T_0))', # 실외기 흡기 공기 엑서지
+
+        'Xin_int_A': 'E_f_int + X_r_int_A', # 엑서지 인풋 (팬 투입 전력 + 냉매에서 실내 공기에 전달한 엑서지)
+        'Xout_int_A': 'X_a_int_out_A - X_a_int_in_A', # 엑서지 아웃풋
+        'Xc_int_A': 'Xin_int_A - Xout_int_A', # 엑서지 소비율
+
+        ## Closed refrigerant loop system
+        'X_r_ext_A': 'Q_r_ext_A * (1 - T_0 / T_r_ext_A)', # 냉매에서 실외 공기에 전달한 엑서지
+
+        'Xin_r_A': 'E_cmp_A', # 엑서지 인풋 (컴프레서 투입 전력)
+        'Xout_r_A': 'X_r_ext_A + X_r_int_A', # 엑서지 아웃풋
+        'Xc_r_A': 'Xin_r_A - Xout_r_A', # 엑서지 소비율
+
+        ## External unit with condenser
+        'X_a_ext_out_A': 'c_a * m_ext * ((T_a_ext_out - T_0) - T_0 * log(T_a_ext_out / T_0))', # 실외기 취출 공기 엑서지
+        'X_a_ext_in_A': 'c_a * m_ext * ((T_a_ext_in - T_0) - T_0 * log(T_a_ext_in / T_0))', # 실외기 흡기 공기 엑서지 (외기)
+
+        'Xin_ext_A': 'E_f_ext + X_r_ext_A', # 엑서지 인풋 (팬 투입 전력 + 냉매에서 실외 공기에 전달한 엑서지)
+        'Xout_ext_A': 'X_a_ext_out_A - X_a_ext_in_A', # 엑서지 아웃풋
+        'Xc_ext_A': 'Xin_ext_A - Xout_ext_A', # 엑서지 소비율
+
+        ## Total
+        'Xin_A': 'E_cmp_A + E_f_int + E_f_ext', # 총 엑서지 인풋 (컴프레서 + 실내팬 + 실외팬 전력)
+        'Xout_A': 'X_a_int_out_A - X_a_int_in_A', # 총 엑서지 아웃풋
+        'Xc_A': 'Xin_A - Xout_A', # 총 엑서지 소비율
+        'eff_A': 'Xout_A / Xin_A * 100', # 엑서지 효율 [%]
+    },
 }
 
 
@@ -166,11 +224,77 @@ COOLING_GSHP = {
             'unit': 'kW',
             'step': 0.1,
         },
-    }
+    },
+    'equations': {
+        # System COP
+        'cop_G': 'k * T_r_int_G / (T_r_ext_G - T_r_int_G)',
+
+        # System capacity - GSHP
+        'E_cmp_G': 'Q_r_int_G / cop_G', # kW, 압축기 전력
+        'Q_r_ext_G': 'Q_r_int_G + E_cmp_G', # kW, 실외기 배출열량
+        'Q_g': 'Q_r_ext_G + E_pmp_G', # kW, 토양 열교환량
+
+        # Air parameters
+        'V_int': 'Q_r_int_G / (c_a * rho_a * (T_a_int_in - T_a_int_out))',
+        'm_int': 'V_int * rho_a',
+
+        ## Internal unit with evaporator
+        'X_r_int_G': '- Q_r_int_G * (1 - T_0 / T_r_int_G)', # 냉매에서 실내 공기에 전달한 엑서지
+        'X_a_int_out_G': 'c_a * m_int * ((T_a_int_out - T_0) - T_0 * log(T_a_int_out / T_0))', # 실외기 취출 공기 엑서지
+        'X_a_int_in_G': 'c_a * m_int * ((T_a_int_in - T_0) - T_0 * log(T_a_int_in / T_0))', # 실외기 흡기 공기 엑서지
+
+        'Xin_int_G': 'E_f_int + X_r_int_G', # 엑서지 인풋 (팬 투입 전력 + 냉매에서 실내 공기에 전달한 엑서지)
+        'Xout_int_G': 'X_a_int_out_G - X_a_int_in_G', # 엑서지 아웃풋
+        'Xc_int_G': 'Xin_int_G - Xout_int_G', # 엑서지 소비율
+
+        ## Closed refrigerant loop system
+        'X_r_ext_G': '- Q_r_ext_G * (1 - T_0 / T_r_ext_G)', # 냉매에서 실외기측에 전달한 엑서지
+
+        'Xin_r_G': 'E_cmp_G + X_r_ext_G', # 엑서지 인풋 (컴프레서 투입 전력 + 냉매에서 실외기측에 전달한 엑서지)
+        'Xout_r_G': 'X_r_int_G', # 엑서지 아웃풋
+        'Xc_r_G': 'Xin_r_G - Xout_r_G', # 엑서지 소비율
+
+        ## Circulating water in GHE
+        'X_g': '- Q_g * (1 - T_0 / T_g)', # 땅에서 추출한 엑서지
+
+        'Xin_ext_G': 'E_pmp_G + X_g', # 엑서지 인풋 (펌프 투입 전력 + 땅에서 추출한 엑서지)
+        'Xout_ext_G': 'X_r_ext_G', # 엑서지 아웃풋
+        'Xc_GHE': 'Xin_ext_G - Xout_ext_G', # 엑서지 소비율
+
+        ## Total
+        'Xin_G': 'E_cmp_G + E_f_int + E_pmp_G + X_g', # 총 엑서지 인풋 (컴프레서 + 실내팬 + 펌프 전력 + 땅에서 추출한 엑서지)
+        'Xout_G': 'X_a_int_out_G - X_a_int_in_G', # 총 엑서지 아웃풋
+        'Xc_G': 'Xin_G - Xout_G', # 총 엑서지 소비율
+        'eff_G': 'Xout_G / Xin_G * 100', # 엑서지 효율 [%]
+    },
 }
 
 
-SYSTEM_CASE = {
+COOLING_ASGP['model'] = EquationGraph(
+    COOLING_ASGP['parameters'], COOLING_ASGP['equations'], CONSTANTS,
+)
+COOLING_GSHP['model'] = EquationGraph(
+    COOLING_GSHP['parameters'], COOLING_GSHP['equations'], CONSTANTS,
+)
+
+# range의 문자열 경계(다른 파라미터 참조)를 컴파일한 제약 조건
+COOLING_ASGP['constraints'] = Constraints(COOLING_ASGP['parameters'])
+COOLING_GSHP['constraints'] = Constraints(COOLING_GSHP['parameters'])
+
+
+def _freeze(value):
+    """
+    dict/list를 읽기 전용 mapping/tuple로 변환. 파라미터 정의는 모든 시스템과
+    세션이 공유하므로 변경할 수 없게 한다.
+    """
+    if isinstance(value, dict):
+        return types.MappingProxyType({k: _freeze(v) for k, v in value.items()})
+    if isinstance(value, list):
+        return tuple(_freeze(v) for v in value)
+    return value
+
+
+SYSTEM_CASE = _freeze({
     'COOLING': {
         'ASHP': COOLING_ASGP,
         'GSHP': COOLING_GSHP,
@@ -180,4 +304,7 @@ SYSTEM_CASE = {
     'HOT WATER': {
       
     },
-}
+})
+
+COOLING_ASGP = SYSTEM_CASE['COOLING']['ASHP']
+COOLING_GSHP = SYSTEM_CASE['COOLING']['GSHP']
@@ -0,0 +1,121 @@
+import numpy as np
+
+from exergy_dashboard.system import SYSTEM_CASE
+from exergy_dashboard.evaluation import COOLING_TERMS, evaluate_cooling_feasible
+
+
+# 분포 이름 -> 표본 생성 함수 (rng, 중심값, scale, n).
+# 분포는 현재 입력값을 중심으로 한다.
+# - normal: 표준편차 scale
+# - uniform: [center - scale, center + scale]
+# - triangular: [center - scale, center + scale], 최빈값 center
+DISTRIBUTIONS = {
+    'normal': lambda rng, center, scale, n: rng.normal(center, scale, n),
+    'uniform': lambda rng, center, scale, n: rng.uniform(center - scale, center + scale, n),
+    'triangular': lambda rng, center, scale, n: rng.triangular(
+        center - scale, center, center + scale, n,
+    ),
+}
+
+# 현장에서 불확실한 입력의 기본 분포. 나머지 파라미터는 현재 값으로 고정한다.
+DEFAULT_UNCERTAINTY = {
+    'ASHP': {
+        'k': {'distribution': 'normal', 'scale': 0.05},
+        'E_f_int': {'distribution': 'uniform', 'scale': 0.03},
+        'E_f_ext': {'distribution': 'uniform', 'scale': 0.04},
+    },
+    'GSHP': {
+        'k': {'distribution': 'normal', 'scale': 0.05},
+        'E_f_int': {'distribution': 'uniform', 'scale': 0.03},
+        'E_pmp_G': {'distribution': 'uniform', 'scale': 0.05},
+        'T_g': {'distribution': 'normal', 'scale': 1.0},
+    },
+}
+
+DEFAULT_SAMPLES = 100_000
+DEFAULT_PERCENTILES = (5, 25, 50, 75, 95)
+
+
+def sample_parameters(system_type, params, distributions, n=DEFAULT_SAMPLES, seed=None):
+    """
+    params(현재 입력값)를 중심으로 distributions에 따라 n개의 표본 컬럼을 생성.
+
+    Parameters:
+    - params: 파라미터 이름 -> 현재 값 (스칼라)
+    - distributions: 파라미터 이름 -> {'distribution': DISTRIBUTIONS의 이름, 'scale': 값}.
+      scale이 0이거나 목록에 없는 파라미터는 현재 값으로 고정한다.
+    - seed: numpy Generator seed
+
+    Returns:
+    - 파라미터 이름 -> 길이 n의 배열 dict. 고정된 파라미터는 복사하지 않는 broadcast view.
+    """
+    parameters = SYSTEM_CASE['COOLING'][system_type]['parameters']
+    unknown = [name for name in distributions if name not in parameters]
+    if unknown:
+        raise KeyError(f'{system_type} has no parameters {unknown}.')
+
+    rng = np.random.default_rng(seed)
+    columns = {
+        name: np.broadcast_to(float(params[name]), n) for name in parameters
+    }
+    for name, spec in distributions.items():
+        if not spec['scale']:
+            continue
+        try:
+            sample = DISTRIBUTIONS[spec['distribution']]
+        except KeyError:
+            raise ValueError(
+                f"Unknown distribution {spec['distribution']!r} for {name!r}."
+            ) from None
+        columns[name] = sample(rng, float(params[name]), spec['scale'], n)
+
+    return columns
+
+
+def propagate_cooling(
+    system_type,
+    params,
+    distributions,
+    n=DEFAULT_SAMPLES,
+    seed=None,
+    percentiles=DEFAULT_PERCENTILES,
+):
+    """
+    입력 분포를 냉방 모델에 한 번의 벡터화된 평가로 전파.
+
+    범위 제약을 벗어난 표본은 평가하지 않고 통계에서 제외한다.
+
+    Returns:
+    - dict:
+      - 'samples': 주요 항 이름(COOLING_TERMS의 입력/출력/효율/소비 항) -> 표본 배열.
+        제약을 벗어난 표본은 NaN.
+      - 'feasible': 제약을 만족한 표본의 비율
+      - 'summary': 항 이름 -> {'mean', 'std', 'p5', ...} (percentiles 순서)
+    """
+    columns = sample_parameters(system_type, params, distributions, n, seed)
+    result = evaluate_cooling_feasible(system_type, columns)
+    terms = COOLING_TERMS[system_type]
+    names = (terms['efficiency'], terms['input'], terms['output'], *terms['destruction'])
+    samples = {name: result[name] for name in names}
+
+    summary = {}
+    feasible = result['feasible']
+    for name, values in samples.items():
+        values = values[feasible]
+        if not len(values):
+            summary[name] = None
+            continue
+        summary[name] = {
+            'mean': float(values.mean()),
+            'std': float(values.std()),
+            **{
+                f'p{p:g}': float(value)
+                for p, value in zip(percentiles, np.percentile(values, percentiles))
+            },
+        }
+
+    return {
+        'samples': samples,
+        'feasible': float(feasible.mean()),
+        'summary': summary,
+    }
@@ -0,0 +1,186 @@
+import ast
+import types
+
+import numpy as np
+
+from exergy_dashboard.model import Equation
+from exergy_dashboard.system import SYSTEM_CASE
+from exergy_dashboard.evaluation import evaluate_cooling
+
+
+# Vega 표현식에서 쓸 수 있는 함수 (이름이 Python 쪽 FUNCTIONS와 같다)
+VEGA_FUNCTIONS = ('log', 'exp', 'sqrt')
+
+_BINARY_OPERATORS = {
+    ast.Add: '+',
+    ast.Sub: '-',
+    ast.Mult: '*',
+    ast.Div: '/',
+}
+
+_UNARY_OPERATORS = {
+    ast.UAdd: '+',
+    ast.USub: '-',
+}
+
+
+def parameter_name(name):
+    """
+    입력 파라미터에 대응하는 Vega parameter 이름.
+
+    Vega 내장 상수(E, PI 등)와 겹치지 않도록 접두사를 붙인다.
+    """
+    return f'p_{name}'
+
+
+def vega_expression(node, names, constants):
+    """
+    수식 AST를 Vega 표현식 문자열로 변환.
+
+    Parameters:
+    - node: ast 노드 (Equation.tree 또는 그 body)
+    - names: 변수 이름 -> Vega 표현식 (예: 'datum.cop_A')
+    - constants: 상수 이름 -> 값. 리터럴로 치환한다.
+    """
+    if isinstance(node, ast.Expression):
+        return vega_expression(node.body, names, constants)
+
+    if isinstance(node, ast.Constant) and isinstance(node.value, (int, float)):
+        return repr(float(node.value))
+
+    if isinstance(node, ast.Name):
+        if node.id in constants:
+            return repr(float(constants[node.id]))
+        return names[node.id]
+
+    if isinstance(node, ast.BinOp):
+        left = vega_expression(node.left, names, constants)
+        right = vega_expression(node.right, names, constants)
+        if isinstance(node.op, ast.Pow):
+            return f'pow({left}, {right})'
+        if type(node.op) in _BINARY_OPERATORS:
+            return f'({left} {_BINARY_OPERATORS[type(node.op)]} {right})'
+
+    if isinstance(node, ast.UnaryOp) and type(node.op) in _UNARY_OPERATORS:
+        operand = vega_expression(node.operand, names, constants)
+        return f'({_UNARY_OPERATORS[type(node.op)]}{operand})'
+
+    if (
+        isinstance(node, ast.Call)
+        and isinstance(node.func, ast.Name)
+        and node.func.id in VEGA_FUNCTIONS
+        and not node.keywords
+    ):
+        args = ', '.join(vega_expression(arg, names, constants) for arg in node.args)
+        return f'{node.func.id}({args})'
+
+    raise ValueError(f'Cannot translate {ast.unparse(node)!r} to a Vega expression.')
+
+
+def compile_cooling(system_type):
+    """
+    냉방 모델을 Vega-Lite calculate 변환 목록으로 컴파일.
+
+    Returns:
+    - (필드 이름, Vega 표현식) 리스트. 입력 파라미터 필드가 먼저 오고
+      (온도는 _prepare_inputs와 같이 ℃ -> K 변환), 이어서 노드가 의존성 순서로 온다.
+      각 표현식은 앞선 필드를 datum.<이름>으로 참조한다.
+    """
+    model = SYSTEM_CASE['COOLING'][system_type]['model']
+
+    transforms = []
+    for name in model.parameters:
+        expression = parameter_name(name)
+        if name.startswith('T_'):
+            expression = f'({expression} + 273.15)'
+        transforms.append((name, expression))
+
+    names = {name: f'datum.{name}' for name in (*model.parameters, *model.order)}
+    for name in model.order:
+        transforms.append((
+            name,
+            vega_expression(model.equations[name].tree, names, model.constants),
+        ))
+
+    return transforms
+
+
+def compile_constraints(system_type):
+    """
+    파라미터 범위 제약(Constraints)을 Vega parameter에 대한 bool 표현식으로 컴파일.
+    """
+    constraints = SYSTEM_CASE['COOLING'][system_type]['constraints']
+    names = {name: parameter_name(name) for name in constraints.parameters}
+
+    terms = []
+    for name, (low, high) in constraints.bounds.items():
+        for bound, operator in ((low, '>='), (high, '<=')):
+            if isinstance(bound, Equation):
+                bound = vega_expression(bound.tree, names, {})
+            else:
+                bound = repr(float(bound))
+            terms.append(f'({names[name]} {operator} {bound})')
+
+    return ' && '.join(terms)
+
+
+def evaluate_vega_cooling(system_type, params):
+    """
+    컴파일된 Vega 표현식을 Python에서 그대로 평가한다.
+
+    사용하는 Vega 표현식(산술, pow, log, exp, sqrt, datum.<이름>)은 Python 문법과
+    같으므로, 브라우저에서 계산될 값을 서버에서 재현하여 검증할 수 있다.
+    JavaScript처럼 0으로 나누거나 정의역을 벗어나도 예외 없이 inf/NaN이 되도록
+    numpy float로 계산한다. params는 스칼라 또는 배열이다.
+    """
+    datum = types.SimpleNamespace()
+    namespace = {
+        '__builtins__': {},
+        'datum': datum,
+        'pow': np.power,
+        **{name: getattr(np, name) for name in VEGA_FUNCTIONS},
+        **{
+            parameter_name(name): np.asarray(value, dtype=float)[()]
+            for name, value in params.items()
+        },
+    }
+    with np.errstate(all='ignore'):
+        for name, expression in compile_cooling(system_type):
+            setattr(datum, name, eval(expression, namespace))
+
+    return vars(datum)
+
+
+def verify_cooling(system_type, params, rtol=1e-9):
+    """
+    Vega 표현식의 결과가 evaluate_cooling과 rtol 이내로 같은지 확인.
+
+    양쪽이 같은 위치에서 NaN이거나 같은 부호의 inf이면 같은 값으로 본다.
+
+    Returns:
+    - 양쪽이 유한한 값 중 노드별 최대 상대 오차의 가장 큰 값
+
+    Raises:
+    - ValueError: 상대 오차가 rtol을 넘거나 NaN/inf 위치가 다른 노드가 있을 때
+    """
+    expected = evaluate_cooling(system_type, params)
+    actual = evaluate_vega_cooling(system_type, params)
+
+    errors = {}
+    mismatched = []
+    with np.errstate(all='ignore'):
+        for name, value in expected.items():
+            value = np.asarray(value, dtype=float)
+            other = np.asarray(actual[name], dtype=float)
+            if not np.allclose(other, value, rtol=rtol, atol=rtol * 1e-12, equal_nan=True):
+                mismatched.append(name)
+            finite = np.isfinite(value) & np.isfinite(other)
+            error = np.abs(other - value) / np.maximum(np.abs(value), 1e-12)
+            errors[name] = float(error[finite].max()) if finite.any() else 0.0
+
+    if mismatched:
+        raise ValueError(
+            f'Vega expressions for {system_type} differ from the model: {sorted(mismatched)}'
+        )
+
+    return max(errors.values())
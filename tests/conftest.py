@@ -0,0 +1,35 @@
+import numpy as np
+import pytest
+
+from exergy_dashboard.system import SYSTEM_CASE
+
+
+@pytest.fixture
+def defaults():
+    """
+    시스템 종류 -> 파라미터 기본값 dict를 만드는 함수.
+    """
+    def make(system_type):
+        parameters = SYSTEM_CASE['COOLING'][system_type]['parameters']
+        return {name: spec['default'] for name, spec in parameters.items()}
+
+    return make
+
+
+@pytest.fixture
+def in_range_samples():
+    """
+    기본값 ± steps * step 범위의 무작위 표본 중 범위 제약을 만족하는 행만 돌려주는 함수.
+    """
+    def make(system_type, n, seed=0, steps=2):
+        case = SYSTEM_CASE['COOLING'][system_type]
+        rng = np.random.default_rng(seed)
+        params = {
+            name: spec['default'] + spec['step'] * rng.uniform(-steps, steps, n)
+            for name, spec in case['parameters'].items()
+        }
+        feasible = case['constraints'].feasible(params)
+        assert feasible.any()
+        return {name: value[feasible] for name, value in params.items()}
+
+    return make
@@ -0,0 +1,59 @@
+import pytest
+
+from exergy_dashboard.cache import CacheInfo, LRUCache
+
+
+def test_hits_and_misses():
+    cache = LRUCache(maxsize=2)
+    calls = []
+
+    def compute():
+        calls.append(1)
+        return 'value'
+
+    assert cache.get_or_compute('a', compute) == 'value'
+    assert cache.get_or_compute('a', compute) == 'value'
+    assert cache.get('b') is None
+
+    assert len(calls) == 1
+    assert cache.info() == CacheInfo(hits=1, misses=2, maxsize=2, currsize=1)
+
+    cache.clear()
+    assert cache.info() == CacheInfo(hits=0, misses=0, maxsize=2, currsize=0)
+
+
+def test_evicts_least_recently_used():
+    cache = LRUCache(maxsize=2)
+    cache.put('a', 1)
+    cache.put('b', 2)
+    cache.get('a')
+    cache.put('c', 3)
+
+    assert 'a' in cache
+    assert 'b' not in cache
+    assert 'c' in cache
+
+
+def test_byte_budget():
+    cache = LRUCache(maxsize=10, maxbytes=5)
+    cache.put('a', 'xx')
+    cache.put('b', 'yy')
+    cache.put('c', 'zz')
+
+    assert 'a' not in cache
+    assert cache.nbytes == 4
+
+    # 덮어쓰면 이전 값의 크기를 뺀다.
+    cache.put('c', 'z')
+    assert cache.nbytes == 3
+
+    # 예산보다 큰 값도 가장 최근 항목이면 유지한다.
+    cache.put('d', 'wwwwww')
+    assert len(cache) == 1
+    assert 'd' in cache
+    assert cache.nbytes == 6
+
+
+def test_invalid_maxsize():
+    with pytest.raises(ValueError, match='maxsize'):
+        LRUCache(maxsize=0)
@@ -0,0 +1,23 @@
+import numpy as np
+
+from exergy_dashboard.chart import plot_efficiency_uncertainty
+from exergy_dashboard.uncertainty import DEFAULT_UNCERTAINTY, propagate_cooling
+
+
+def test_uncertainty_chart(defaults):
+    result = propagate_cooling('ASHP', defaults('ASHP'), DEFAULT_UNCERTAINTY['ASHP'], n=1000, seed=0)
+    chart = plot_efficiency_uncertainty([('ASHP 1', 'eff_A', result)])
+
+    assert chart is not None
+    chart.to_dict()
+
+
+def test_uncertainty_chart_without_feasible_samples(defaults):
+    # T_r_ext_G(29 ℃)가 T_0(25 ℃)보다 높아 모든 표본이 범위를 벗어난다.
+    params = {**defaults('GSHP'), 'T_0': 25.0}
+    result = propagate_cooling('GSHP', params, DEFAULT_UNCERTAINTY['GSHP'], n=1000, seed=0)
+
+    assert result['feasible'] == 0
+    assert np.isnan(result['samples']['eff_G']).all()
+    assert plot_efficiency_uncertainty([('GSHP 1', 'eff_G', result)]) is None
+    assert plot_efficiency_uncertainty([]) is None
@@ -0,0 +1,72 @@
+import numpy as np
+import pandas as pd
+import pytest
+
+from exergy_dashboard.cli import main
+from exergy_dashboard.system import SYSTEM_CASE
+from exergy_dashboard.evaluation import evaluate_cooling_feasible
+
+
+SCENARIOS = """type,T_0,k
+ASHP,32,0.4
+ASHP,32,0.45
+GSHP,32.5,0.4
+ASHP,33,0.5
+GSHP,25,0.4
+"""
+
+
+def scenarios(tmp_path, text=SCENARIOS):
+    # 첫 chunk의 T_0는 정수로 읽히고, 다음 chunk에서 소수가 나온다.
+    path = tmp_path / 'scenarios.csv'
+    path.write_text(text)
+    return path
+
+
+@pytest.mark.parametrize('suffix', ['.csv', '.parquet'])
+def test_round_trip_multiple_chunks(tmp_path, suffix):
+    source = scenarios(tmp_path)
+    output = tmp_path / f'results{suffix}'
+
+    main(['eval', str(source), '-o', str(output), '--chunk-size', '2', '-q'])
+
+    if suffix == '.csv':
+        result = pd.read_csv(output)
+    else:
+        result = pd.read_parquet(output)
+    assert len(result) == 5
+    np.testing.assert_array_equal(result['T_0'], [32.0, 32.0, 32.5, 33.0, 25.0])
+    np.testing.assert_array_equal(result['feasible'], [True, True, True, True, False])
+
+    df = pd.read_csv(source)
+    for system_type, efficiency in (('ASHP', 'eff_A'), ('GSHP', 'eff_G')):
+        rows = df['type'] == system_type
+        expected = evaluate_cooling_feasible(system_type, {
+            name: df.loc[rows, name].to_numpy(dtype=float) if name in df else spec['default']
+            for name, spec in SYSTEM_CASE['COOLING'][system_type]['parameters'].items()
+        })
+        np.testing.assert_allclose(result.loc[rows, efficiency], expected[efficiency])
+    assert set(tmp_path.iterdir()) == {source, output}
+
+
+def test_missing_type_column(tmp_path, capsys):
+    text = '\n'.join(line.split(',', 1)[1] for line in SCENARIOS.splitlines())
+    source = scenarios(tmp_path, text)
+
+    with pytest.raises(SystemExit):
+        main(['eval', str(source), '-o', str(tmp_path / 'results.csv'), '-q'])
+    error = capsys.readouterr().err
+    assert "'type'" in error and '--type' in error
+
+    main(['eval', str(source), '-o', str(tmp_path / 'results.csv'), '--type', 'ASHP', '-q'])
+    assert len(pd.read_csv(tmp_path / 'results.csv')) == 5
+
+
+def test_failed_run_leaves_no_output(tmp_path):
+    source = scenarios(tmp_path, SCENARIOS.replace('GSHP,25', 'Boiler,25'))
+    output = tmp_path / 'results.parquet'
+
+    with pytest.raises(SystemExit):
+        main(['eval', str(source), '-o', str(output), '--chunk-size', '2', '-q'])
+    assert set(tmp_path.iterdir()) == {source}
+
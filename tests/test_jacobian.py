@@ -0,0 +1,46 @@
+import numpy as np
+import pytest
+
+from exergy_dashboard.evaluation import evaluate_cooling, evaluate_cooling_jacobian
+
+
+@pytest.mark.parametrize('system_type', ['ASHP', 'GSHP'])
+def test_matches_central_differences(system_type, in_range_samples):
+    params = in_range_samples(system_type, 50)
+    result, jacobian = evaluate_cooling_jacobian(system_type, params)
+
+    for name, value in params.items():
+        h = 1e-6 * max(np.abs(value).max(), 1.0)
+        plus = evaluate_cooling(system_type, {**params, name: value + h})
+        minus = evaluate_cooling(system_type, {**params, name: value - h})
+        for output, gradients in jacobian.items():
+            expected = (plus[output] - minus[output]) / (2 * h)
+            scale = np.abs(result[output]).max() / h
+            np.testing.assert_allclose(
+                gradients[name], expected, rtol=1e-5, atol=1e-10 * scale,
+                err_msg=f'd{output}/d{name}',
+            )
+
+
+@pytest.mark.parametrize('system_type', ['ASHP', 'GSHP'])
+def test_chunks_match_single_pass(system_type, in_range_samples):
+    params = in_range_samples(system_type, 500)
+    result, jacobian = evaluate_cooling_jacobian(system_type, params, chunk_size=len(params['k']))
+    chunked, chunked_jacobian = evaluate_cooling_jacobian(system_type, params, chunk_size=7)
+
+    for name in result:
+        np.testing.assert_array_equal(chunked[name], result[name])
+    for output, gradients in jacobian.items():
+        for name in gradients:
+            np.testing.assert_array_equal(chunked_jacobian[output][name], gradients[name])
+
+
+def test_scalar_and_empty_inputs(defaults):
+    parameters = defaults('ASHP')
+    result, jacobian = evaluate_cooling_jacobian('ASHP', parameters)
+    assert np.shape(result['eff_A']) == ()
+    assert np.shape(jacobian['eff_A']['k']) == ()
+
+    result, jacobian = evaluate_cooling_jacobian('ASHP', {name: [] for name in parameters})
+    assert result['eff_A'].shape == (0,)
+    assert jacobian['eff_A']['k'].shape == (0,)
@@ -0,0 +1,145 @@
+import numpy as np
+import pytest
+
+from exergy_dashboard.system import SYSTEM_CASE
+from exergy_dashboard.model import Constraints
+from exergy_dashboard.evaluation import _prepare_inputs
+
+
+c_a = 1.005
+rho_a = 1.2
+
+
+def reference_ashp(T_0, k, T_r_int_A, T_r_ext_A, Q_r_int_A, T_a_int_in, T_a_int_out,
+                   T_a_ext_out, E_f_int, E_f_ext):
+    # EquationGraph 이전에 손으로 쓴 ASHP 수식 (온도는 K)
+    T_a_ext_in = T_0
+    cop_A = k * T_r_int_A / (T_r_ext_A - T_r_int_A)
+    E_cmp_A = Q_r_int_A / cop_A
+    Q_r_ext_A = Q_r_int_A + E_cmp_A
+    V_int = Q_r_int_A / (c_a * rho_a * (T_a_int_in - T_a_int_out))
+    V_ext = Q_r_ext_A / (c_a * rho_a * (T_a_ext_out - T_a_ext_in))
+    m_int = V_int * rho_a
+    m_ext = V_ext * rho_a
+
+    X_r_int_A = - Q_r_int_A * (1 - T_0 / T_r_int_A)
+    X_a_int_out_A = c_a * m_int * ((T_a_int_out - T_0) - T_0 * np.log(T_a_int_out / T_0))
+    X_a_int_in_A = c_a * m_int * ((T_a_int_in - T_0) - T_0 * np.log(T_a_int_in / T_0))
+    Xin_int_A = E_f_int + X_r_int_A
+    Xout_int_A = X_a_int_out_A - X_a_int_in_A
+    Xc_int_A = Xin_int_A - Xout_int_A
+
+    X_r_ext_A = Q_r_ext_A * (1 - T_0 / T_r_ext_A)
+    Xin_r_A = E_cmp_A
+    Xout_r_A = X_r_ext_A + X_r_int_A
+    Xc_r_A = Xin_r_A - Xout_r_A
+
+    X_a_ext_out_A = c_a * m_ext * ((T_a_ext_out - T_0) - T_0 * np.log(T_a_ext_out / T_0))
+    X_a_ext_in_A = c_a * m_ext * ((T_a_ext_in - T_0) - T_0 * np.log(T_a_ext_in / T_0))
+    Xin_ext_A = E_f_ext + X_r_ext_A
+    Xout_ext_A = X_a_ext_out_A - X_a_ext_in_A
+    Xc_ext_A = Xin_ext_A - Xout_ext_A
+
+    Xin_A = E_cmp_A + E_f_int + E_f_ext
+    Xout_A = X_a_int_out_A - X_a_int_in_A
+    Xc_A = Xin_A - Xout_A
+    eff_A = Xout_A / Xin_A * 100
+
+    return {
+        name: value for name, value in locals().items()
+        if name not in SYSTEM_CASE['COOLING']['ASHP']['parameters']
+    }
+
+
+def reference_gshp(T_0, T_g, T_a_int_in, T_a_int_out, T_r_int_G, T_r_ext_G, k, E_f_int,
+                   E_pmp_G, Q_r_int_G):
+    # EquationGraph 이전에 손으로 쓴 GSHP 수식 (온도는 K)
+    cop_G = k * T_r_int_G / (T_r_ext_G - T_r_int_G)
+    E_cmp_G = Q_r_int_G / cop_G
+    Q_r_ext_G = Q_r_int_G + E_cmp_G
+    Q_g = Q_r_ext_G + E_pmp_G
+    V_int = Q_r_int_G / (c_a * rho_a * (T_a_int_in - T_a_int_out))
+    m_int = V_int * rho_a
+
+    X_r_int_G = - Q_r_int_G * (1 - T_0 / T_r_int_G)
+    X_a_int_out_G = c_a * m_int * ((T_a_int_out - T_0) - T_0 * np.log(T_a_int_out / T_0))
+    X_a_int_in_G = c_a * m_int * ((T_a_int_in - T_0) - T_0 * np.log(T_a_int_in / T_0))
+    Xin_int_G = E_f_int + X_r_int_G
+    Xout_int_G = X_a_int_out_G - X_a_int_in_G
+    Xc_int_G = Xin_int_G - Xout_int_G
+
+    X_r_ext_G = - Q_r_ext_G * (1 - T_0 / T_r_ext_G)
+    Xin_r_G = E_cmp_G + X_r_ext_G
+    Xout_r_G = X_r_int_G
+    Xc_r_G = Xin_r_G - Xout_r_G
+
+    X_g = - Q_g * (1 - T_0 / T_g)
+    Xin_ext_G = E_pmp_G + X_g
+    Xout_ext_G = X_r_ext_G
+    Xc_GHE = Xin_ext_G - Xout_ext_G
+
+    Xin_G = E_cmp_G + E_f_int + E_pmp_G + X_g
+    Xout_G = X_a_int_out_G - X_a_int_in_G
+    Xc_G = Xin_G - Xout_G
+    eff_G = Xout_G / Xin_G * 100
+
+    return {
+        name: value for name, value in locals().items()
+        if name not in SYSTEM_CASE['COOLING']['GSHP']['parameters']
+    }
+
+
+REFERENCES = {'ASHP': reference_ashp, 'GSHP': reference_gshp}
+
+
+@pytest.mark.parametrize('system_type', ['ASHP', 'GSHP'])
+def test_graph_matches_reference(system_type, in_range_samples):
+    model = SYSTEM_CASE['COOLING'][system_type]['model']
+    params = in_range_samples(system_type, 200)
+
+    inputs = _prepare_inputs(system_type, params)
+    values = model.evaluate(inputs)
+    expected = REFERENCES[system_type](**inputs)
+
+    assert set(expected) == set(model.order)
+    for name in model.order:
+        np.testing.assert_allclose(values[name], expected[name], rtol=1e-12, err_msg=name)
+
+
+def test_constraints_expression_bounds():
+    constraints = Constraints({
+        'a': {'range': [0.0, 10.0]},
+        'b': {'range': ['a+1', 20.0]},
+        'c': {'range': [0.0, 'b-0.5']},
+    })
+
+    # 수식 경계는 참조하는 파라미터의 정적 범위로 풀린다.
+    assert constraints.static == {'a': (0.0, 10.0), 'b': (1.0, 20.0), 'c': (0.0, 19.5)}
+
+    values = {
+        'a': np.array([5.0, 5.0, 5.0, np.nan]),
+        'b': np.array([6.0, 5.5, 7.0, 6.0]),
+        'c': np.array([5.5, 1.0, 7.0, 1.0]),
+    }
+    np.testing.assert_array_equal(constraints.feasible(values), [True, False, False, False])
+
+    violations = constraints.violations(values)
+    np.testing.assert_array_equal(violations['b'], [False, True, False, True])
+    np.testing.assert_array_equal(violations['c'], [False, False, True, False])
+
+    # 스칼라 입력
+    assert constraints.feasible({'a': 1.0, 'b': 2.0, 'c': 1.5})
+    assert constraints.limits({'a': 1.0, 'b': 2.0, 'c': 1.5})['c'] == (0.0, 1.5)
+
+
+def test_constraints_unknown_reference():
+    with pytest.raises(ValueError, match='unknown parameters'):
+        Constraints({'a': {'range': [0.0, 'x']}})
+
+
+def test_system_static_bounds():
+    for system_type, case in SYSTEM_CASE['COOLING'].items():
+        static = case['constraints'].static
+        for name, (low, high) in static.items():
+            assert np.isfinite(low) and np.isfinite(high), (system_type, name)
+            assert low <= case['parameters'][name]['default'] <= high, (system_type, name)
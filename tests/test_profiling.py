@@ -0,0 +1,24 @@
+from exergy_dashboard.profiling import PhaseTimer
+
+
+def test_fragment_rerun_gets_own_id():
+    timer = PhaseTimer()
+    timer.begin_rerun()
+    with timer.phase('evaluation'):
+        pass
+    timer.end_rerun()
+
+    # fragment만 다시 실행: 직전 전체 rerun의 번호를 이어 쓰지 않는다.
+    timer.begin_rerun(fragment='outputs')
+    with timer.phase('what-if'):
+        pass
+    timer.end_rerun()
+
+    events = {name: (rerun, fragment) for name, _, _, rerun, fragment in timer.events}
+    assert events['evaluation'] == (1, None)
+    assert events['rerun'] == (1, None)
+    assert events['what-if'] == (2, 'outputs')
+    assert events['fragment outputs'] == (2, 'outputs')
+
+    trace = timer.chrome_trace()['traceEvents']
+    assert trace[-1]['args'] == {'rerun': 2, 'fragment': 'outputs'}
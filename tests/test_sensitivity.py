@@ -0,0 +1,16 @@
+import numpy as np
+
+from exergy_dashboard.sensitivity import sobol_indices
+
+
+def test_counts_only_feasible_rows(defaults):
+    params = defaults('GSHP')
+    # 범위 제약(T_r_ext_G <= T_0 등)을 일부러 벗어나는 표본 범위
+    bounds = {name: (value, value) for name, value in params.items()}
+    bounds['T_0'] = (27.0, 35.0)
+    result = sobol_indices('GSHP', params, bounds=bounds, n=256, seed=0)
+
+    assert result['rows'] == 256 * (len(params) + 2)
+    assert 0 < result['evaluated'] < result['rows']
+    assert result['evaluated'] == round(result['feasible'] * result['rows'])
+    assert np.isfinite(result['indices']['eff_G']['total'][0])
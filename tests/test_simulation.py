@@ -0,0 +1,41 @@
+import numpy as np
+import pytest
+
+from exergy_dashboard.simulation import simulate_cooling, summarize_cooling
+
+
+def test_length_from_any_series_column():
+    # 냉방부하 컬럼이 없어도 외기온도 컬럼의 길이를 따른다.
+    series = {'T_0': np.linspace(30.0, 35.0, 24)}
+    result = simulate_cooling('ASHP', series, dt=1.0)
+
+    assert result['dt'].shape == (24,)
+    assert result['Xin_A'].shape == (24,)
+    assert result['running'].all()
+
+
+def test_missing_time_and_dt():
+    with pytest.raises(ValueError, match='dt'):
+        simulate_cooling('ASHP', {'T_0': np.full(3, 32.0)})
+
+
+def test_infeasible_steps_excluded_from_totals():
+    # GSHP는 T_r_ext_G(기본값 29 ℃)가 T_0 이하여야 한다.
+    T_0 = np.array([32.0, 25.0, 33.0, 24.0])
+    result = simulate_cooling('GSHP', {'T_0': T_0}, dt=0.5)
+    summary = summarize_cooling('GSHP', result)
+
+    np.testing.assert_array_equal(result['feasible'], [True, False, True, False])
+    assert np.isnan(result['Xin_G'][~result['feasible']]).all()
+    assert summary['infeasible_steps'] == 2
+    assert summary['infeasible_hours'] == pytest.approx(1.0)
+    assert summary['running_hours'] == pytest.approx(1.0)
+    assert summary['Xin'] == pytest.approx(0.5 * np.sum(result['Xin_G'][[0, 2]]))
+
+
+def test_stopped_steps_are_feasible():
+    series = {'T_0': np.array([25.0, 32.0]), 'Q_r_int_G': np.array([0.0, 15.3])}
+    result = simulate_cooling('GSHP', series, dt=1.0)
+
+    np.testing.assert_array_equal(result['feasible'], [True, True])
+    assert result['Xin_G'][0] == 0.0
@@ -0,0 +1,55 @@
+from exergy_dashboard.store import ParameterStore
+
+
+def test_add_get_set(defaults):
+    store = ParameterStore()
+    store.add('ASHP-1', 'ASHP')
+
+    assert 'ASHP-1' in store
+    assert store.as_dict('ASHP-1') == defaults('ASHP')
+
+    store.set('ASHP-1', 'T_0', 34.5)
+    assert store.get('ASHP-1', 'T_0') == 34.5
+    assert store.record('ASHP-1').values.dtype == float
+
+    store.remove('ASHP-1')
+    assert 'ASHP-1' not in store
+    assert len(store) == 0
+
+
+def test_sync_keeps_values_without_widget():
+    store = ParameterStore()
+    store.add('GSHP-1', 'GSHP')
+    before = store.as_dict('GSHP-1')
+
+    # 화면에 T_0 widget만 있는 경우
+    sss = {store.widget_key('GSHP-1', 'T_0'): 30.0}
+    store.sync(sss, 'GSHP-1')
+
+    after = store.as_dict('GSHP-1')
+    assert after['T_0'] == 30.0
+    assert {k: v for k, v in after.items() if k != 'T_0'} == {
+        k: v for k, v in before.items() if k != 'T_0'
+    }
+
+
+def test_widget_keys_seed_from_store(defaults):
+    # 앱은 widget을 그리기 전에 session state에 없는 widget 키를 저장소 값으로 채운다.
+    store = ParameterStore()
+    store.add('ASHP-1', 'ASHP')
+    store.add('ASHP-2', 'ASHP')
+    store.set('ASHP-2', 'k', 0.5)
+
+    sss = {}
+    for name in store.names('ASHP-2'):
+        key = store.widget_key('ASHP-2', name)
+        sss[key] = sss[key] if key in sss else store.get('ASHP-2', name)
+
+    assert list(sss) == store.widget_keys('ASHP-2')
+    assert sss[store.widget_key('ASHP-2', 'k')] == 0.5
+
+    sss[store.widget_key('ASHP-2', 'k')] = 0.6
+    store.sync(sss, 'ASHP-2')
+    assert store.get('ASHP-2', 'k') == 0.6
+    # 같은 종류의 다른 시스템 값은 바뀌지 않는다.
+    assert store.as_dict('ASHP-1') == defaults('ASHP')
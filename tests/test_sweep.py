@@ -0,0 +1,70 @@
+import numpy as np
+import pytest
+
+from exergy_dashboard.evaluation import evaluate_cooling_feasible
+from exergy_dashboard.parallel import (
+    default_outputs,
+    evaluate_cooling_parallel,
+    sweep_cooling_parallel,
+)
+from exergy_dashboard.sweep import local_values, parameter_values, sweep_cooling
+
+
+def test_parameter_values():
+    values = parameter_values({'range': [20.0, 21.0], 'step': 0.25})
+    np.testing.assert_allclose(values, [20.0, 20.25, 20.5, 20.75, 21.0])
+
+    with pytest.raises(ValueError, match='Dependent range'):
+        parameter_values({'range': ['T_0', 40.0], 'step': 0.5})
+
+    # 정적 범위를 주면 수식 경계 대신 사용한다.
+    values = parameter_values({'range': ['T_0', 40.0], 'step': 0.5}, bounds=(39.0, 40.0))
+    np.testing.assert_allclose(values, [39.0, 39.5, 40.0])
+
+
+def test_local_values_clipped():
+    spec = {'range': [0.0, 'T_0'], 'step': 1.0}
+    np.testing.assert_allclose(local_values(spec, 1.0, steps=2), [0.0, 1.0, 2.0, 3.0])
+    np.testing.assert_allclose(
+        local_values(spec, 1.0, steps=2, bounds=(0.0, 2.0)), [0.0, 1.0, 2.0],
+    )
+
+
+@pytest.mark.parametrize('system_type', ['ASHP', 'GSHP'])
+def test_parallel_sweep_matches_serial(system_type):
+    axes = {'T_0': np.linspace(25.0, 45.0, 11), 'k': [0.3, 0.4, 0.5]}
+    outputs = default_outputs(system_type)
+
+    serial = list(sweep_cooling(system_type, axes, chunk_size=7))
+    parallel = list(sweep_cooling_parallel(system_type, axes, workers=2, chunk_size=7))
+
+    assert [len(chunk['T_0']) for chunk in parallel] == [len(chunk['T_0']) for chunk in serial]
+    for expected, chunk in zip(serial, parallel):
+        assert set(chunk) == {*axes, *outputs, 'feasible'}
+        for name in chunk:
+            np.testing.assert_array_equal(chunk[name], expected[name], err_msg=name)
+
+    # 격자에 범위 밖 점이 섞여 있어야 의미 있는 비교가 된다.
+    feasible = np.concatenate([chunk['feasible'] for chunk in serial])
+    assert feasible.any() and not feasible.all()
+
+
+def test_parallel_evaluation_matches_serial(in_range_samples):
+    params = in_range_samples('ASHP', 100)
+    expected = evaluate_cooling_feasible('ASHP', params)
+    result = evaluate_cooling_parallel('ASHP', params, workers=2, chunk_size=16)
+
+    assert set(result) == set(default_outputs('ASHP'))
+    for name in result:
+        np.testing.assert_array_equal(result[name], expected[name], err_msg=name)
+
+
+def test_parallel_evaluation_scalar_and_empty(defaults):
+    params = defaults('GSHP')
+    expected = evaluate_cooling_feasible('GSHP', params)
+    result = evaluate_cooling_parallel('GSHP', params)
+    assert np.shape(result['eff_G']) == ()
+    assert result['eff_G'] == expected['eff_G']
+
+    result = evaluate_cooling_parallel('GSHP', {name: [] for name in params})
+    assert result['eff_G'].shape == (0,)
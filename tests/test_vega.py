@@ -0,0 +1,38 @@
+import numpy as np
+import pytest
+
+from exergy_dashboard.system import SYSTEM_CASE
+from exergy_dashboard.vega import evaluate_vega_cooling, verify_cooling
+
+
+@pytest.mark.parametrize('system_type', ['ASHP', 'GSHP'])
+def test_defaults_match_model(system_type, defaults):
+    assert verify_cooling(system_type, defaults(system_type)) <= 1e-9
+
+
+@pytest.mark.parametrize('system_type', ['ASHP', 'GSHP'])
+def test_zero_cop_factor(system_type, defaults):
+    # k = 0이면 COP가 0이 되어 0으로 나눈다. 브라우저처럼 inf/NaN이 되어야 한다.
+    params = {**defaults(system_type), 'k': 0.0}
+    values = evaluate_vega_cooling(system_type, params)
+
+    assert not np.isfinite(values[f'E_cmp_{system_type[0]}'])
+    verify_cooling(system_type, params)
+
+
+@pytest.mark.parametrize('system_type', ['ASHP', 'GSHP'])
+def test_slider_endpoints_match_model(system_type, defaults):
+    # what-if slider의 범위(정적 범위) 양 끝에서 파라미터 하나씩 바꾼다.
+    constraints = SYSTEM_CASE['COOLING'][system_type]['constraints']
+    for name, (low, high) in constraints.static.items():
+        for value in (low, high):
+            verify_cooling(system_type, {**defaults(system_type), name: value})
+
+
+def test_array_inputs(defaults):
+    params = {**defaults('ASHP'), 'k': np.array([0.0, 0.4, 1.0])}
+    values = evaluate_vega_cooling('ASHP', params)
+
+    assert values['eff_A'].shape == (3,)
+    verify_cooling('ASHP', params)
+